@@ -6,12 +6,20 @@ Script principal para treinar um agente Q-Learning no ambiente do Robô de
 Reciclagem e visualizar os resultados.
 """
 
-from tqdm import tqdm
+import os
+import sys
 from robot_mdp_env import RecyclingRobotMDP
 from q_learning_agent import QLearningAgent
-from plotting_utils import plot_learning_curve, plot_q_table_heatmap
+from prioritized_sweeping_agent import PrioritizedSweepingAgent
+from plotting_utils import plot_learning_curve, plot_q_table_heatmap, plot_q_value_evolution
 import numpy as np
 
+# Motor de treinamento compartilhado, na raiz do repositório
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from trainer import Trainer, TqdmProgress
+from trajectory_recorder import TrajectoryRecorder
+from q_history import QTableHistory, QTableHistoryReader
+
 if __name__ == "__main__":
     # --- Parâmetros do Ambiente ---
     ALPHA = 0.8
@@ -26,39 +34,34 @@ if __name__ == "__main__":
     EPSILON = 0.1
     NUM_EPISODES = 10000
     MAX_STEPS_PER_EPISODE = 50
+    USE_PRIORITIZED_SWEEPING = False # Planejamento com modelo aprendido
+    PLANNING_STEPS = 5
+    GRAVAR_TRAJETORIAS = False # Grava as transições em disco (diretório "trajetorias")
+    HISTORICO_Q_INTERVALO = 1 # Grava a Tabela Q a cada N episódios (diretório "historico_q")
+    HISTORICO_Q_COMPRESSAO = "delta" # None (float32) ou "delta" (float16 + quadros-chave)
 
     # --- Inicialização ---
     env = RecyclingRobotMDP(ALPHA, BETA, R_SEARCH, R_WAIT, R_RESCUE)
-    agent = QLearningAgent(num_states=2, num_actions=3, alpha=LEARNING_RATE, gamma=DISCOUNT_FACTOR, epsilon=EPSILON)
+    if USE_PRIORITIZED_SWEEPING:
+        agent = PrioritizedSweepingAgent(num_states=2, num_actions=3, alpha=LEARNING_RATE, gamma=DISCOUNT_FACTOR,
+                                         epsilon=EPSILON, planning_steps=PLANNING_STEPS)
+    else:
+        agent = QLearningAgent(num_states=2, num_actions=3, alpha=LEARNING_RATE, gamma=DISCOUNT_FACTOR, epsilon=EPSILON)
 
     # --- Coleta de Dados para Plotagem ---
-    rewards_history = []
-    q_table_history = {0: agent.q_table.copy()} # Snapshot inicial
-    snapshot_interval = NUM_EPISODES // 4 # Tira 4 snapshots durante o treino
+    # Histórico completo da Tabela Q no disco, com uso de memória constante
+    q_history = QTableHistory("historico_q", every=HISTORICO_Q_INTERVALO, compression=HISTORICO_Q_COMPRESSAO)
 
     print("Iniciando treinamento do Agente Robô de Reciclagem...")
     
     # --- Loop de Treinamento ---
-    for episode in tqdm(range(NUM_EPISODES)):
-        state = env.reset()
-        episode_reward = 0
-        
-        for step in range(MAX_STEPS_PER_EPISODE):
-            action = agent.choose_action(state)
-            next_state, reward, done = env.step(action)
-            agent.update(state, action, reward, next_state)
-            
-            state = next_state
-            episode_reward += reward
-            
-            if done:
-                break
-        
-        rewards_history.append(episode_reward)
-
-        # Salva um snapshot da Tabela Q em intervalos definidos
-        if (episode + 1) % snapshot_interval == 0:
-            q_table_history[episode + 1] = agent.q_table.copy()
+    recorder = TrajectoryRecorder("trajetorias") if GRAVAR_TRAJETORIAS else None
+    trainer = Trainer(agent, env, max_steps_per_episode=MAX_STEPS_PER_EPISODE,
+                      callbacks=[TqdmProgress(), q_history], recorder=recorder)
+    rewards_history = trainer.run(NUM_EPISODES).episode_returns
+    if recorder is not None:
+        recorder.close()
+    q_table_history = QTableHistoryReader("historico_q")
 
     print("Treinamento concluído.\n")
 
@@ -72,4 +75,7 @@ if __name__ == "__main__":
 
     # Gerar e exibir os gráficos
     plot_learning_curve(rewards_history)
-    plot_q_table_heatmap(q_table_history, (env.states_map, env.actions_map))
\ No newline at end of file
+    # 4 snapshots ao longo do treino (mais o inicial), lidos do histórico sob demanda
+    snapshot_episodes = range(0, NUM_EPISODES + 1, NUM_EPISODES // 4)
+    plot_q_table_heatmap(q_table_history.snapshots(snapshot_episodes), (env.states_map, env.actions_map))
+    plot_q_value_evolution(q_table_history, (env.states_map, env.actions_map))
\ No newline at end of file
@@ -25,10 +25,16 @@ def plot_learning_curve(rewards_per_episode: list, window_size: int = 100):
     plt.savefig('learning_curve.png')
     plt.show()
 
-def plot_q_table_heatmap(q_table_history: dict, env_maps: tuple):
+def plot_q_table_heatmap(q_table_history, env_maps: tuple, num_snapshots: int = 5):
     """
     Plota a evolução da Tabela Q usando heatmaps.
+
+    q_table_history pode ser um dicionário {episódio: Tabela Q} ou um
+    QTableHistoryReader (q_history.py); neste caso, apenas num_snapshots
+    tabelas igualmente espaçadas são lidas do disco.
     """
+    if not isinstance(q_table_history, dict):
+        q_table_history = q_table_history.snapshots(num=num_snapshots)
     states_map, actions_map = env_maps
     num_snapshots = len(q_table_history)
     
@@ -44,4 +50,31 @@ def plot_q_table_heatmap(q_table_history: dict, env_maps: tuple):
     axes[0].set_yticklabels(states_map.values(), rotation=0)
     plt.tight_layout(rect=[0, 0, 1, 0.96])
     plt.savefig('q_table_evolution.png')
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+def plot_q_value_evolution(q_history, env_maps: tuple, start: int = 0, stop: int = None, max_points: int = 2000):
+    """
+    Plota a trajetória de cada valor Q(s, a) ao longo do treinamento a partir
+    de um QTableHistoryReader. Só o intervalo [start, stop) de entradas é lido,
+    com no máximo max_points pontos por curva.
+    """
+    states_map, actions_map = env_maps
+    stop = len(q_history) if stop is None else stop
+    step = max(1, (stop - start) // max_points)
+    tables = q_history[start:stop:step]
+    episodes = q_history.episodes[start:stop:step]
+
+    fig, axes = plt.subplots(1, len(states_map), figsize=(7 * len(states_map), 5), sharey=True)
+    fig.suptitle('Valores Q ao Longo do Treinamento', fontsize=18)
+    for state, state_name in states_map.items():
+        ax = axes[state]
+        for action, action_name in actions_map.items():
+            ax.plot(episodes, tables[:, state, action], label=action_name)
+        ax.set_title(f'Estado {state_name}')
+        ax.set_xlabel('Episódios', fontsize=12)
+        ax.grid(True)
+        ax.legend()
+    axes[0].set_ylabel('Valor Q', fontsize=12)
+    plt.tight_layout(rect=[0, 0, 1, 0.95])
+    plt.savefig('q_value_evolution.png')
+    plt.show()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# population_trainer.py
+
+"""
+Treina uma população de agentes Q-Learning independentes no Robô de
+Reciclagem, todos de uma vez.
+
+Cada robô tem a sua Tabela Q, guardadas juntas em um tensor (N, 2, 3). A
+escolha epsilon-greedy (com Recharge proibido em High, como no
+QLearningAgent) e as atualizações são vetorizadas sobre todos os robôs, de
+modo que milhares de sementes ou configurações treinam no tempo de uma. O
+resultado de interesse é a distribuição das políticas aprendidas.
+"""
+
+from collections import Counter
+import numpy as np
+from robot_mdp_env import RecyclingRobotMDP
+from vector_robot_env import VectorRecyclingRobotMDP
+
+# Ações válidas em cada estado: em High, Recharge não é permitido
+VALID_ACTIONS = np.array([[True, True, False],
+                          [True, True, True]])
+
+class PopulationQLearning:
+    """
+    N agentes Q-Learning treinados em paralelo, com as mesmas regras do QLearningAgent.
+
+    Atributos:
+        q_tables (np.array): Tensor (N, estados, ações) com a Tabela Q de cada robô.
+        alpha, gamma, epsilon (np.array): Hiperparâmetros por robô (escalares são replicados).
+    """
+    def __init__(self, num_robots: int, alpha=0.1, gamma=0.9, epsilon=0.1, num_states: int = 2,
+                 num_actions: int = 3, seed: int = None):
+        self.num_robots = num_robots
+        self.q_tables = np.zeros((num_robots, num_states, num_actions))
+        self.alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (num_robots,))
+        self.gamma = np.broadcast_to(np.asarray(gamma, dtype=float), (num_robots,))
+        self.epsilon = np.broadcast_to(np.asarray(epsilon, dtype=float), (num_robots,))
+        self.rng = np.random.default_rng(seed)
+
+    def choose_actions(self, states: np.ndarray, robots: np.ndarray) -> np.ndarray:
+        """Epsilon-greedy mascarado: explora e explota apenas entre as ações válidas do estado."""
+        valid = VALID_ACTIONS[states]
+        q_values = np.where(valid, self.q_tables[robots, states], -np.inf)
+        greedy = q_values.argmax(axis=1)
+
+        # Exploração uniforme entre as ações válidas: sorteia a k-ésima ação válida
+        num_valid = valid.sum(axis=1)
+        k = (self.rng.random(len(robots)) * num_valid).astype(np.intp)
+        random_actions = (np.cumsum(valid, axis=1) <= k[:, None]).sum(axis=1)
+        explore = self.rng.random(len(robots)) < self.epsilon[robots]
+        return np.where(explore, random_actions, greedy)
+
+    def update(self, robots, states, actions, rewards, next_states):
+        """Atualização Q-Learning de todos os robôs indicados (mesmo alvo do QLearningAgent)."""
+        q = self.q_tables
+        next_max = q[robots, next_states].max(axis=1)
+        old_values = q[robots, states, actions]
+        target = rewards + self.gamma[robots] * next_max
+        q[robots, states, actions] = old_values + self.alpha[robots] * (target - old_values)
+
+    def train(self, env: VectorRecyclingRobotMDP, num_episodes: int, max_steps_per_episode: int) -> np.ndarray:
+        """
+        Treina todos os robôs. Em cada episódio, todos partem de High e cada um
+        age até terminar (resgate) ou atingir max_steps_per_episode.
+
+        Returns:
+            Matriz (num_episodes, N) com a recompensa total de cada episódio de cada robô.
+        """
+        if env.num_robots != self.num_robots:
+            raise ValueError("O ambiente e a população devem ter o mesmo número de robôs.")
+        episode_returns = np.zeros((num_episodes, self.num_robots))
+        for episode in range(num_episodes):
+            states = env.reset()
+            robots = np.arange(self.num_robots)
+            for _ in range(max_steps_per_episode):
+                actions = self.choose_actions(states, robots)
+                next_states, rewards, dones = env.step(actions, robots)
+                self.update(robots, states, actions, rewards, next_states)
+                episode_returns[episode, robots] += rewards
+
+                # Robôs que terminaram saem do lote até o próximo episódio
+                robots, states = robots[~dones], next_states[~dones]
+                if robots.size == 0:
+                    break
+        return episode_returns
+
+    def greedy_policies(self) -> np.ndarray:
+        """Matriz (N, estados) com a ação gulosa (entre as válidas) de cada robô em cada estado."""
+        return np.where(VALID_ACTIONS, self.q_tables, -np.inf).argmax(axis=2)
+
+    def policy_distribution(self, actions_map: dict = None) -> dict:
+        """Fração da população que aprendeu cada política (ações em High e em Low)."""
+        actions_map = actions_map or {0: "Search", 1: "Wait", 2: "Recharge"}
+        counts = Counter(map(tuple, self.greedy_policies().tolist()))
+        return {tuple(actions_map[a] for a in policy): count / self.num_robots
+                for policy, count in counts.most_common()}
+
+if __name__ == "__main__":
+    # --- Parâmetros do Ambiente ---
+    ALPHA = 0.8
+    R_SEARCH = 10
+    R_WAIT = 1
+    R_RESCUE = -20
+
+    # --- Parâmetros do Treinamento (os mesmos de main_train.py) ---
+    NUM_ROBOTS = 2000
+    NUM_EPISODES = 2000
+    MAX_STEPS_PER_EPISODE = 50
+
+    # Cada robô recebe um beta diferente: a população é também uma varredura de configurações
+    betas = np.linspace(0.1, 0.9, NUM_ROBOTS)
+    env = VectorRecyclingRobotMDP(NUM_ROBOTS, ALPHA, betas, R_SEARCH, R_WAIT, R_RESCUE, seed=0)
+    population = PopulationQLearning(NUM_ROBOTS, alpha=0.1, gamma=0.9, epsilon=0.1, seed=1)
+
+    print(f"Treinando {NUM_ROBOTS} robôs por {NUM_EPISODES} episódios...")
+    returns = population.train(env, NUM_EPISODES, MAX_STEPS_PER_EPISODE)
+    print(f"Recompensa média nos últimos 100 episódios: {returns[-100:].mean():.2f}\n")
+
+    print("--- Distribuição das Políticas Aprendidas (High, Low) ---")
+    for policy, fraction in population.policy_distribution().items():
+        print(f"  {policy}: {100 * fraction:.1f}%")
+
+    print("\n--- Ação em Low por faixa de beta ---")
+    low_actions = population.greedy_policies()[:, RecyclingRobotMDP.STATE_LOW]
+    for lo, hi in zip(np.linspace(0.1, 0.9, 5)[:-1], np.linspace(0.1, 0.9, 5)[1:]):
+        in_range = (betas >= lo) & (betas < hi)
+        counts = np.bincount(low_actions[in_range], minlength=3) / in_range.sum()
+        print(f"  beta em [{lo:.1f}, {hi:.1f}): Search {100 * counts[0]:.0f}%, "
+              f"Wait {100 * counts[1]:.0f}%, Recharge {100 * counts[2]:.0f}%")
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# prioritized_sweeping_agent.py
+
+"""
+Define um Agente Q-Learning com planejamento por varredura priorizada
+(Prioritized Sweeping) e modelo aprendido para o Robô de Reciclagem.
+"""
+
+import heapq
+import itertools
+import numpy as np
+from q_learning_agent import QLearningAgent
+
+class PrioritizedSweepingAgent(QLearningAgent):
+    """
+    Agente que aprende um modelo estocástico das transições e o usa para
+    planejar, atualizando primeiro os pares (estado, ação) com maior erro TD.
+
+    A escolha de ação (incluindo a restrição de Recharge no estado High) é
+    herdada do QLearningAgent.
+    """
+    def __init__(self, num_states: int, num_actions: int, alpha: float, gamma: float, epsilon: float,
+                 planning_steps: int = 5, theta: float = 1e-4):
+        super().__init__(num_states, num_actions, alpha, gamma, epsilon)
+        self.planning_steps = planning_steps
+        self.theta = theta
+
+        # (estado, ação) -> {próximo_estado: [contagem, soma_recompensas]}
+        self.model = {}
+        self.model_counts = {}
+        # estado -> conjunto de pares (estado, ação) que levam a ele
+        self.predecessors = {}
+
+        # Heap com remoção preguiçosa das entradas obsoletas
+        self._queue = []
+        self._priorities = {}
+        self._tie_breaker = itertools.count()
+
+    def _expected_target(self, state: int, action: int) -> float:
+        """Alvo de Bellman esperado segundo o modelo empírico."""
+        total = self.model_counts[(state, action)]
+        target = 0.0
+        for next_state, (count, reward_sum) in self.model[(state, action)].items():
+            target += (reward_sum + count * self.gamma * np.max(self.q_table[next_state])) / total
+        return target
+
+    def _push(self, state: int, action: int, priority: float):
+        """Insere (estado, ação) na fila se a prioridade superar a atual."""
+        if priority <= self.theta or priority <= self._priorities.get((state, action), 0.0):
+            return
+        self._priorities[(state, action)] = priority
+        heapq.heappush(self._queue, (-priority, next(self._tie_breaker), state, action))
+
+    def _pop(self):
+        """Retira o par de maior prioridade válida, ou None se a fila estiver vazia."""
+        while self._queue:
+            neg_priority, _, state, action = heapq.heappop(self._queue)
+            if self._priorities.get((state, action)) == -neg_priority:
+                del self._priorities[(state, action)]
+                return state, action
+        return None
+
+    def update(self, state: int, action: int, reward: float, next_state: int):
+        """Atualiza o modelo com a experiência e executa a varredura priorizada."""
+        successors = self.model.setdefault((state, action), {})
+        stats = successors.setdefault(next_state, [0, 0.0])
+        stats[0] += 1
+        stats[1] += reward
+        self.model_counts[(state, action)] = self.model_counts.get((state, action), 0) + 1
+        self.predecessors.setdefault(next_state, set()).add((state, action))
+
+        td_error = reward + self.gamma * np.max(self.q_table[next_state]) - self.q_table[state, action]
+        self._push(state, action, abs(td_error))
+
+        for _ in range(self.planning_steps):
+            item = self._pop()
+            if item is None:
+                break
+            s, a = item
+            self.q_table[s, a] += self.alpha * (self._expected_target(s, a) - self.q_table[s, a])
+
+            for pred_state, pred_action in self.predecessors.get(s, ()):
+                priority = abs(self._expected_target(pred_state, pred_action) - self.q_table[pred_state, pred_action])
+                self._push(pred_state, pred_action, priority)
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+# q_history.py
+
+"""
+Histórico completo da Tabela Q gravado em disco (np.memmap).
+
+Em vez de guardar algumas cópias da Tabela Q em um dicionário, QTableHistory
+acrescenta uma tabela a cada `every` episódios em um arquivo (T, estados,
+ações) float32 pré-alocado e mapeado em memória. O uso de RAM não cresce com
+o número de episódios: 10⁷ episódios de uma tabela 2x3 ocupam 240 MB no
+disco e nada além de algumas páginas na memória.
+
+Com compression="delta", cada entrada guarda apenas a diferença para a
+entrada anterior em float16 (metade do espaço), com quadros-chave completos
+em float32 a cada keyframe_every entradas. A diferença é calculada em malha
+fechada, contra a tabela já reconstruída e não contra a tabela original, então
+o erro de arredondamento não se acumula ao longo do histórico: cada entrada
+erra no máximo o arredondamento do seu próprio delta.
+
+QTableHistoryReader lê qualquer intervalo do histórico sob demanda,
+reconstruindo apenas os segmentos entre quadros-chave que o intervalo toca.
+
+Usa trainer.py e trajectory_recorder.py, na raiz do repositório: o script que
+importa este módulo deve pôr a raiz no sys.path (como faz main_train.py).
+"""
+
+import json
+import os
+import numpy as np
+from trainer import Callback
+from trajectory_recorder import MemmapColumn
+
+META_FILE = "meta.json"
+COLUMN_NAMES = ("episodes", "tables", "deltas", "keyframes", "keyframe_entries")
+FLOAT16_MAX = float(np.finfo(np.float16).max)
+
+class QTableHistory(Callback):
+    """
+    Callback do Trainer que grava a Tabela Q do agente a cada `every` episódios.
+
+    Também pode ser usado fora do Trainer: open(forma, capacidade), depois
+    append(episódio, tabela) e, por fim, close(). Uma gravação existente no
+    diretório é substituída.
+
+    Atributos:
+        directory (str): Diretório do histórico.
+        compression (str | None): None (float32 completo) ou "delta".
+        keyframe_every (int): Distância máxima entre quadros-chave (só com "delta").
+        num_entries (int): Tabelas gravadas.
+    """
+    def __init__(self, directory: str, every: int = 1, compression: str = None, keyframe_every: int = 1000,
+                 attribute: str = "q_table", include_initial: bool = True):
+        super().__init__(every)
+        if compression not in (None, "delta"):
+            raise ValueError(f"Compressão desconhecida: {compression!r} (use None ou 'delta').")
+        if keyframe_every < 1:
+            raise ValueError("keyframe_every deve ser positivo.")
+        self.directory = directory
+        self.compression = compression
+        self.keyframe_every = keyframe_every
+        self.attribute = attribute
+        self.include_initial = include_initial
+        self._columns = None
+        self._table_shape = None
+
+    @property
+    def num_entries(self) -> int:
+        return self._columns["episodes"].length if self._columns else 0
+
+    def open(self, table_shape: tuple, capacity: int):
+        """Cria os arquivos do histórico já com espaço para `capacity` tabelas."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._table_shape = tuple(table_shape)
+        capacity = max(1, capacity)
+        if self.compression is None:
+            specs = {"episodes": (np.int64, ()), "tables": (np.float32, self._table_shape)}
+        else:
+            num_keyframes = -(-capacity // self.keyframe_every)
+            specs = {"episodes": (np.int64, ()), "deltas": (np.float16, self._table_shape),
+                     "keyframes": (np.float32, self._table_shape), "keyframe_entries": (np.int64, ())}
+        # Substitui qualquer gravação anterior, inclusive de outro modo de compressão
+        for name in COLUMN_NAMES:
+            path = os.path.join(self.directory, f"{name}.bin")
+            if os.path.exists(path):
+                os.remove(path)
+        self._columns = {}
+        for name, (dtype, shape) in specs.items():
+            path = os.path.join(self.directory, f"{name}.bin")
+            size = num_keyframes if name.startswith("keyframe") else capacity
+            self._columns[name] = MemmapColumn(path, dtype, shape, 0, size)
+            self._columns[name].reserve(size)
+        self._reconstructed = None
+        self._last_keyframe = 0
+        self._write_meta()
+
+    def append(self, episode: int, q_table: np.ndarray):
+        """Acrescenta a tabela do episódio `episode` ao histórico."""
+        q_table = np.asarray(q_table, dtype=np.float32)
+        if q_table.shape != self._table_shape:
+            raise ValueError(f"Tabela de forma {q_table.shape}; o histórico espera {self._table_shape}.")
+        columns = self._columns
+        entry = self.num_entries
+        columns["episodes"].append(episode)
+        if self.compression is None:
+            columns["tables"].append(q_table)
+            return
+
+        delta = q_table - self._reconstructed if self._reconstructed is not None else None
+        # Quadro-chave periódico, ou forçado se o delta não cabe em float16
+        if (delta is None or entry - self._last_keyframe >= self.keyframe_every
+                or not np.all(np.abs(delta) <= FLOAT16_MAX)):
+            columns["deltas"].append(np.zeros(self._table_shape, dtype=np.float16))
+            columns["keyframes"].append(q_table)
+            columns["keyframe_entries"].append(entry)
+            self._reconstructed = q_table.copy()
+            self._last_keyframe = entry
+        else:
+            delta = delta.astype(np.float16)
+            columns["deltas"].append(delta)
+            # Malha fechada: o próximo delta parte da tabela que o leitor vai reconstruir
+            self._reconstructed += delta.astype(np.float32)
+
+    def _write_meta(self):
+        meta = {
+            "num_entries": self.num_entries,
+            "num_keyframes": self._columns["keyframes"].length if self.compression else 0,
+            "table_shape": list(self._table_shape),
+            "compression": self.compression,
+            "keyframe_every": self.keyframe_every,
+            "every": self.every,
+        }
+        # Escrita atômica, como no TrajectoryRecorder
+        tmp_path = os.path.join(self.directory, META_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(self.directory, META_FILE))
+
+    def flush(self):
+        """Descarrega os arquivos no disco e publica o tamanho atual no meta.json."""
+        for column in self._columns.values():
+            column.flush()
+        self._write_meta()
+
+    def close(self):
+        """Grava tudo e ajusta os arquivos ao tamanho usado."""
+        if self._columns is None:
+            return
+        self.flush()
+        for column in self._columns.values():
+            column.close()
+        self._columns = None
+
+    def on_train_begin(self, trainer, num_episodes: int):
+        q_table = getattr(trainer.agent, self.attribute)
+        self.open(q_table.shape, num_episodes // self.every + int(self.include_initial))
+        if self.include_initial:
+            self.append(0, q_table)
+
+    def on_episode_end(self, trainer, episode: int, history):
+        self.append(episode + 1, getattr(trainer.agent, self.attribute))
+
+    def on_train_end(self, trainer, history):
+        self.close()
+
+class QTableHistoryReader:
+    """
+    Leitura sob demanda de um histórico gravado por QTableHistory.
+
+    history[i] devolve a i-ésima tabela gravada e history[a:b:c] um array
+    (n, estados, ações) float32. Sem compressão, o resultado é uma visão do
+    arquivo mapeado; com "delta", só os segmentos entre quadros-chave que
+    cobrem o intervalo pedido são lidos e reconstruídos.
+
+    Atributos:
+        episodes (np.array): Episódio de cada entrada.
+        table_shape (tuple): Forma de cada Tabela Q.
+        compression (str | None): Modo de gravação.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        self.num_entries = meta["num_entries"]
+        self.table_shape = tuple(meta["table_shape"])
+        self.compression = meta["compression"]
+        self.every = meta["every"]
+        self.episodes = self._open("episodes", np.int64, (), self.num_entries)
+        if self.compression is None:
+            self._tables = self._open("tables", np.float32, self.table_shape, self.num_entries)
+        else:
+            num_keyframes = meta["num_keyframes"]
+            self._deltas = self._open("deltas", np.float16, self.table_shape, self.num_entries)
+            self._keyframes = self._open("keyframes", np.float32, self.table_shape, num_keyframes)
+            self._keyframe_entries = np.array(self._open("keyframe_entries", np.int64, (), num_keyframes))
+
+    def _open(self, name: str, dtype, row_shape: tuple, length: int):
+        shape = (length,) + tuple(row_shape)
+        if length == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(os.path.join(self.directory, f"{name}.bin"), dtype=dtype, mode="r", shape=shape)
+
+    def __len__(self) -> int:
+        return self.num_entries
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if self.compression is None:
+                return self._tables[key]
+            wanted = np.arange(*key.indices(self.num_entries))
+            if len(wanted) > 1 and wanted[1] < wanted[0]:
+                return self._decode(wanted[::-1])[::-1]
+            return self._decode(wanted)
+        index = int(key)
+        if index < 0:
+            index += self.num_entries
+        if not 0 <= index < self.num_entries:
+            raise IndexError(f"Entrada {key} fora do histórico de {self.num_entries} entradas.")
+        if self.compression is None:
+            return self._tables[index]
+        return self._decode(np.array([index]))[0]
+
+    def _decode(self, wanted: np.ndarray) -> np.ndarray:
+        """Reconstrói as entradas `wanted` (em ordem crescente) de um histórico com deltas."""
+        result = np.empty((len(wanted),) + self.table_shape, dtype=np.float32)
+        if len(wanted) == 0:
+            return result
+        keys = self._keyframe_entries
+        bounds = np.append(keys, self.num_entries)
+        k = int(np.searchsorted(keys, wanted[0], side="right")) - 1
+        done = 0
+        while done < len(wanted):
+            segment_start, segment_end = int(bounds[k]), int(bounds[k + 1])
+            count = int(np.searchsorted(wanted, segment_end)) - done
+            if count > 0:
+                # Quadro-chave seguido dos deltas, somados em sequência como na gravação
+                last = int(wanted[done + count - 1]) + 1
+                block = np.empty((last - segment_start,) + self.table_shape, dtype=np.float32)
+                block[0] = self._keyframes[k]
+                block[1:] = self._deltas[segment_start + 1:last]
+                np.cumsum(block, axis=0, out=block)
+                result[done:done + count] = block[wanted[done:done + count] - segment_start]
+                done += count
+            k += 1
+        return result
+
+    def entry_at(self, episode: int) -> int:
+        """Índice da última entrada gravada até o episódio `episode`."""
+        index = int(np.searchsorted(self.episodes, episode, side="right")) - 1
+        if index < 0:
+            raise IndexError(f"Nenhuma tabela gravada até o episódio {episode}.")
+        return index
+
+    def at_episode(self, episode: int) -> np.ndarray:
+        """Tabela Q vigente no episódio `episode`."""
+        return self[self.entry_at(episode)]
+
+    def snapshots(self, episodes=None, num: int = 5) -> dict:
+        """
+        {episódio: Tabela Q} no formato de plot_q_table_heatmap.
+
+        Args:
+            episodes (list): Episódios desejados; se None, `num` episódios
+                             igualmente espaçados do primeiro ao último.
+        """
+        if episodes is None:
+            entries = np.unique(np.linspace(0, self.num_entries - 1, num).round().astype(int))
+            return {int(self.episodes[i]): self[int(i)] for i in entries}
+        return {episode: self.at_episode(episode) for episode in episodes}
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# vector_robot_env.py
+
+"""
+Define a versão vetorizada do ambiente do Robô de Reciclagem: N robôs
+independentes, cada um com o seu nível de bateria (e, opcionalmente, os seus
+próprios alpha e beta), avançam juntos em uma única chamada a step.
+"""
+
+import numpy as np
+from robot_mdp_env import RecyclingRobotMDP
+
+class VectorRecyclingRobotMDP:
+    """
+    N cópias independentes do RecyclingRobotMDP, com as mesmas regras de transição.
+
+    Atributos:
+        num_robots (int): Número de robôs.
+        alpha (np.array): Probabilidade de a bateria continuar alta após Search em High, por robô.
+        beta (np.array): Probabilidade de a bateria continuar baixa após Search em Low, por robô.
+        states (np.array): Estado atual de cada robô.
+    """
+    STATE_HIGH = RecyclingRobotMDP.STATE_HIGH
+    STATE_LOW = RecyclingRobotMDP.STATE_LOW
+
+    ACTION_SEARCH = RecyclingRobotMDP.ACTION_SEARCH
+    ACTION_WAIT = RecyclingRobotMDP.ACTION_WAIT
+    ACTION_RECHARGE = RecyclingRobotMDP.ACTION_RECHARGE
+
+    def __init__(self, num_robots: int, alpha, beta, r_search: float, r_wait: float, r_rescue: float,
+                 rng: np.random.Generator = None, seed: int = None):
+        self.num_robots = num_robots
+        self.alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (num_robots,))
+        self.beta = np.broadcast_to(np.asarray(beta, dtype=float), (num_robots,))
+        self.r_search = r_search
+        self.r_wait = r_wait
+        self.r_rescue = r_rescue
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+
+        # Próximo estado e recompensa dos casos determinísticos, indexados por (estado, ação)
+        self._next_state = np.array([[self.STATE_HIGH, self.STATE_HIGH, self.STATE_HIGH],
+                                     [self.STATE_LOW, self.STATE_LOW, self.STATE_HIGH]])
+        self._reward = np.array([[r_search, r_wait, -1.0],
+                                 [r_search, r_wait, 0.0]])
+        self.states = np.full(num_robots, self.STATE_HIGH)
+
+    def reset(self) -> np.ndarray:
+        """Reseta todos os robôs para o estado inicial."""
+        self.states = np.full(self.num_robots, self.STATE_HIGH)
+        return self.states.copy()
+
+    def step(self, actions: np.ndarray, robots: np.ndarray = None) -> tuple:
+        """
+        Executa uma ação em cada robô (ou apenas nos robôs indicados).
+
+        Args:
+            actions (np.array): Ação de cada robô em `robots`.
+            robots (np.array): Índices dos robôs que agem (padrão: todos).
+
+        Returns:
+            Uma tupla (próximos_estados, recompensas, terminados) para esses robôs.
+        """
+        robots = np.arange(self.num_robots) if robots is None else np.asarray(robots)
+        actions = np.asarray(actions)
+        states = self.states[robots]
+        next_states = self._next_state[states, actions]
+        rewards = self._reward[states, actions].astype(float)
+        dones = np.zeros(len(robots), dtype=bool)
+
+        # Search é o único caso estocástico: um sorteio por robô
+        search = actions == self.ACTION_SEARCH
+        u = self.rng.random(len(robots))
+        high = search & (states == self.STATE_HIGH)
+        next_states[high] = np.where(u[high] < self.alpha[robots[high]], self.STATE_HIGH, self.STATE_LOW)
+        low = search & (states == self.STATE_LOW)
+        depleted = low & (u >= self.beta[robots])
+        next_states[depleted] = self.STATE_HIGH
+        rewards[depleted] = self.r_rescue
+        dones[depleted] = True
+
+        self.states[robots] = next_states
+        return next_states, rewards, dones
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# alias_sampling.py
+
+"""
+Amostragem de distribuições categóricas em O(1) pelo método alias de Walker
+(na construção de Vose).
+
+Cada linha de uma matriz de probabilidades (ex.: uma linha por par estado-ação)
+vira duas tabelas de mesmo tamanho: `prob` e `alias`. Para amostrar, um único
+número uniforme u em [0, k) escolhe a coluna j = floor(u) e a sua parte
+fracionária decide entre j e alias[j]. O custo por amostra é um sorteio e uma
+consulta, independentemente do número de resultados, e um lote de amostras
+(de linhas diferentes) sai com uma única operação vetorizada.
+"""
+
+import numpy as np
+
+def _vose(probabilities: np.ndarray):
+    """Tabelas (prob, alias) de uma distribuição com k resultados."""
+    k = len(probabilities)
+    scaled = probabilities * k
+    prob = np.ones(k)
+    alias = np.arange(k)
+    small = [i for i in range(k) if scaled[i] < 1.0]
+    large = [i for i in range(k) if scaled[i] >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    # O que sobra (por arredondamento) tem probabilidade 1 de ficar na própria coluna
+    return prob, alias
+
+class AliasTable:
+    """
+    Tabelas alias para uma ou várias distribuições categóricas.
+
+    Atributos:
+        prob (np.array): Forma (linhas, k); probabilidade de ficar na coluna sorteada.
+        alias (np.array): Forma (linhas, k); coluna alternativa de cada coluna.
+    """
+    def __init__(self, probabilities: np.ndarray):
+        probabilities = np.atleast_2d(np.asarray(probabilities, dtype=float))
+        if np.any(probabilities < 0):
+            raise ValueError("As probabilidades não podem ser negativas.")
+        totals = probabilities.sum(axis=1, keepdims=True)
+        if np.any(totals <= 0):
+            raise ValueError("Cada distribuição precisa ter massa positiva.")
+        probabilities = probabilities / totals
+
+        self.num_outcomes = probabilities.shape[1]
+        self.prob = np.empty(probabilities.shape)
+        self.alias = np.empty(probabilities.shape, dtype=np.intp)
+        for row, distribution in enumerate(probabilities):
+            self.prob[row], self.alias[row] = _vose(distribution)
+        # Cópias em listas Python para o caminho escalar (sample_one), sem custo de arrays 0-d
+        self._prob_rows = self.prob.tolist()
+        self._alias_rows = self.alias.tolist()
+
+    def sample(self, rows=0, rng=None) -> np.ndarray:
+        """
+        Sorteia um resultado (índice da coluna) para cada linha pedida.
+
+        Args:
+            rows (int | np.array): Linha(s) da distribuição a amostrar; repetições
+                                   geram amostras independentes.
+            rng: np.random.Generator; None usa o gerador global do NumPy (np.random).
+        """
+        rng = np.random if rng is None else rng
+        rows = np.asarray(rows)
+        u = rng.random(rows.shape) * self.num_outcomes
+        columns = np.minimum(u.astype(np.intp), self.num_outcomes - 1)
+        stay = (u - columns) < self.prob[rows, columns]
+        return np.where(stay, columns, self.alias[rows, columns])
+
+    def sample_one(self, row: int = 0, rng=None) -> int:
+        """Sorteia um único resultado da linha `row` (caminho escalar, para step)."""
+        u = (np.random.random() if rng is None else rng.random()) * self.num_outcomes
+        column = min(int(u), self.num_outcomes - 1)
+        return column if u - column < self._prob_rows[row][column] else self._alias_rows[row][column]
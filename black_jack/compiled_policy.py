@@ -0,0 +1,70 @@
+# Autor: Renan Saraiva dos Santos
+
+"""
+Política de Blackjack "compilada" em uma tabela de consulta.
+
+Depois do treino, a política aprendida é congelada em um array int8 contíguo
+que cobre todo o espaço de estados (soma_do_jogador, carta_do_dealer,
+ás_utilizável). A consulta de um lote de estados vira uma única indexação
+NumPy, sem dicionários nem sorteios para estados não vistos, e a tabela pode
+ser salva em disco com np.save.
+"""
+
+import numpy as np
+from vector_blackjack import VectorizedBlackjack, POLICY_SHAPE
+
+class CompiledBlackjackPolicy:
+    """
+    Política determinística em uma tabela int8 com forma POLICY_SHAPE.
+
+    Atributos:
+        table (np.array): Ação (0 = Stick, 1 = Hit) de cada estado.
+    """
+    def __init__(self, table: np.ndarray):
+        table = np.ascontiguousarray(table, dtype=np.int8)
+        if table.shape != POLICY_SHAPE:
+            raise ValueError(f"A tabela da política deve ter forma {POLICY_SHAPE}, não {table.shape}.")
+        self.table = table
+        self._flat = table.reshape(-1)
+
+    @classmethod
+    def from_policy(cls, policy: dict, default_action: int = None) -> "CompiledBlackjackPolicy":
+        """
+        Congela uma política no formato de get_policy() ({(soma, carta, ás): ação}).
+
+        Estados ausentes recebem default_action, e não uma ação aleatória. Com
+        default_action=None, somas até 11 (que os exploring starts nunca visitam e
+        que não podem estourar) recebem Hit e as demais, Stick.
+        """
+        table = np.zeros(POLICY_SHAPE, dtype=np.int8)
+        if default_action is None:
+            table[:12] = 1
+        else:
+            table[:] = default_action
+        for (p_sum, d_card, ace), action in policy.items():
+            table[p_sum, d_card, int(ace)] = action
+        return cls(table)
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledBlackjackPolicy":
+        """Carrega uma tabela salva com save()."""
+        return cls(np.load(path))
+
+    def save(self, path: str):
+        """Salva a tabela em formato .npy."""
+        np.save(path, self.table)
+
+    def act(self, state) -> int:
+        """Ação para um único estado (soma, carta do dealer, ás utilizável)."""
+        return int(self.table[state[0], state[1], int(state[2])])
+
+    def act_batch(self, player_sums, dealer_cards, usable_aces) -> np.ndarray:
+        """Ações para um lote de estados, com uma única consulta à tabela achatada."""
+        flat_index = (np.asarray(player_sums, dtype=np.intp) * POLICY_SHAPE[1]
+                      + np.asarray(dealer_cards, dtype=np.intp)) * POLICY_SHAPE[2]
+        flat_index += np.asarray(usable_aces, dtype=np.intp)
+        return self._flat.take(flat_index)
+
+    def evaluate(self, num_hands: int = 1_000_000, seed: int = None) -> float:
+        """Recompensa média da política em num_hands mãos simuladas (simulador vetorizado)."""
+        return float(VectorizedBlackjack(seed=seed).play(self.table, num_hands).final_rewards.mean())
@@ -0,0 +1,65 @@
+# Autor: Renan Saraiva dos Santos
+
+"""
+Distribuição exata da soma final do dealer no Blackjack-v1.
+
+O dealer segue uma política fixa (compra até 17 ou mais, parando no 17
+"soft") com um baralho infinito, então a distribuição da sua soma final para
+cada carta visível pode ser calculada uma única vez, por recursão, e guardada
+em cache. Com ela, o valor esperado de parar (Stick) com qualquer soma do
+jogador é exato e não precisa ser amostrado.
+"""
+
+from functools import lru_cache
+import numpy as np
+
+# Resultados possíveis do dealer: somas finais 17 a 21 e estouro
+DEALER_OUTCOMES = (17, 18, 19, 20, 21, "bust")
+BUST = len(DEALER_OUTCOMES) - 1
+
+# Probabilidade de cada valor de carta (1 a 10) no baralho infinito
+CARD_PROBABILITIES = {card: (4 if card == 10 else 1) / 13 for card in range(1, 11)}
+
+@lru_cache(maxsize=None)
+def _final_distribution(raw_sum: int, has_ace: bool) -> tuple:
+    """Distribuição da soma final do dealer a partir de uma mão (ases contando 1)."""
+    total = raw_sum + 10 if has_ace and raw_sum + 10 <= 21 else raw_sum
+    if total >= 17:
+        outcome = np.zeros(len(DEALER_OUTCOMES))
+        outcome[BUST if total > 21 else total - 17] = 1.0
+        return tuple(outcome)
+
+    distribution = np.zeros(len(DEALER_OUTCOMES))
+    for card, probability in CARD_PROBABILITIES.items():
+        distribution += probability * np.array(_final_distribution(raw_sum + card, has_ace or card == 1))
+    return tuple(distribution)
+
+@lru_cache(maxsize=None)
+def dealer_outcome_distribution() -> np.ndarray:
+    """
+    Tabela (11, 6): linha d é a distribuição dos resultados do dealer com a
+    carta visível d (1 = ás), na ordem de DEALER_OUTCOMES. A linha 0 não é usada.
+    """
+    table = np.zeros((11, len(DEALER_OUTCOMES)))
+    for shown in range(1, 11):
+        for hidden, probability in CARD_PROBABILITIES.items():
+            table[shown] += probability * np.array(_final_distribution(shown + hidden, shown == 1 or hidden == 1))
+    table.setflags(write=False)
+    return table
+
+@lru_cache(maxsize=None)
+def stick_values() -> np.ndarray:
+    """
+    Tabela (32, 11) com o retorno esperado de parar com soma do jogador p
+    contra a carta visível d do dealer: P(dealer estoura) + P(dealer < p) - P(dealer > p).
+    Somas acima de 21 valem -1.
+    """
+    outcomes = dealer_outcome_distribution()
+    dealer_totals = np.arange(17, 22)
+    values = np.full((32, 11), -1.0)
+    for player_sum in range(0, 22):
+        wins = outcomes[:, BUST] + outcomes[:, :BUST] @ (dealer_totals < player_sum)
+        losses = outcomes[:, :BUST] @ (dealer_totals > player_sum)
+        values[player_sum] = wins - losses
+    values.setflags(write=False)
+    return values
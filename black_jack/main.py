@@ -1,21 +1,52 @@
 # Autor: Renan Saraiva dos Santos
 
+import os
+import sys
 import gymnasium as gym
 import numpy as np
 from collections import defaultdict
 import matplotlib.pyplot as plt
 from tqdm import tqdm
 import pandas as pd
+from vector_blackjack import VectorizedBlackjack, POLICY_SHAPE
+from parallel_mc import ShardedMonteCarlo
+from dealer_outcomes import stick_values
+from compiled_policy import CompiledBlackjackPolicy
+
+# Gravador de trajetórias compartilhado, na raiz do repositório
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from trajectory_recorder import TrajectoryRecorder
 
 # (A classe MonteCarloExploringStartsAgent e as funções de plotagem permanecem as mesmas,
 # apenas o método 'train' e a chamada principal serão ligeiramente modificados)
 
 class MonteCarloExploringStartsAgent:
-    def __init__(self, env, gamma=1.0):
-        # ... (código do __init__ igual ao anterior) ...
-        self.env = env; self.gamma = gamma; self.Q = defaultdict(float)
-        self.returns = defaultdict(list); self.policy = defaultdict(lambda: self.env.action_space.sample())
+    def __init__(self, env, gamma=1.0, storage="dict", analytic_stick=False):
+        """
+        storage="dict" guarda Q, a lista de retornos e a política em dicionários;
+        storage="dense" guarda Q, as contagens de visitas e a política em arrays
+        indexados por (soma, carta do dealer, ás utilizável, ação), com média
+        incremental: memória constante e atualização O(1) por primeira visita.
+
+        analytic_stick=True troca o resultado amostrado de cada episódio que termina
+        em Stick pelo retorno esperado exato (calculado a partir da distribuição
+        da soma final do dealer): só os ramos de Hit continuam sendo amostrados.
+        """
+        if storage not in ("dict", "dense"):
+            raise ValueError("storage deve ser 'dict' ou 'dense'.")
+        self.env = env; self.gamma = gamma; self.storage = storage
+        self.stick_values = stick_values() if analytic_stick else None
         self.learning_progress_rewards = []
+        if storage == "dict":
+            self.Q = defaultdict(float)
+            self.returns = defaultdict(list); self.policy = defaultdict(lambda: self.env.action_space.sample())
+        else:
+            num_actions = self.env.action_space.n
+            self.Q = np.zeros(POLICY_SHAPE + (num_actions,))
+            self.N = np.zeros(POLICY_SHAPE + (num_actions,), dtype=np.int64)
+            # As ações aleatórias dos estados nunca visitados (como no defaultdict) são
+            # sorteadas no início de cada treino, com o gerador do próprio treino
+            self.policy_table = np.zeros(POLICY_SHAPE, dtype=np.int8)
 
     def train(self, num_episodes=500000, monitored_states=None, print_every=50000):
         """
@@ -23,6 +54,7 @@ class MonteCarloExploringStartsAgent:
         """
         if monitored_states is None:
             monitored_states = []
+        self._randomize_unvisited(np.random.default_rng())
 
         for episode_num in tqdm(range(num_episodes)):
             episode = []
@@ -36,41 +68,285 @@ class MonteCarloExploringStartsAgent:
                 episode.append((state, action, reward))
                 state = next_state
                 if not done:
-                    action = self.policy[state]
+                    action = self._act(state)
 
             self.learning_progress_rewards.append(reward)
 
+            # Redução de variância: o Stick final vale o seu retorno esperado exato
+            if self.stick_values is not None and episode[-1][1] == 0:
+                last_state = episode[-1][0]
+                episode[-1] = (last_state, 0, self.stick_values[last_state[0], last_state[1]])
+
             G = 0.0
             visited_pairs = set()
             for t in reversed(range(len(episode))):
                 state, action, reward = episode[t]
                 G = self.gamma * G + reward
                 if (state, action) not in visited_pairs:
-                    self.returns[(state, action)].append(G)
-                    self.Q[(state, action)] = np.mean(self.returns[(state, action)])
-                    q_values_for_state = [self.Q.get((state, a), 0.0) for a in range(self.env.action_space.n)]
-                    self.policy[state] = np.argmax(q_values_for_state)
+                    self._update_first_visit(state, action, G)
                     visited_pairs.add((state, action))
 
             # === BLOCO DE IMPRESSÃO MODIFICADO ===
             if (episode_num + 1) % print_every == 0:
-                avg_reward = np.mean(self.learning_progress_rewards[-print_every:])
-                print(f"\n--- Progresso no Episódio: {episode_num + 1}/{num_episodes} ---")
-                print(f"  Recompensa Média (últimos {print_every} episódios): {avg_reward:.4f}")
-                print(f"  Tamanho da Política (estados conhecidos): {len(self.policy)}")
-                print("-" * 60)
-                print("  Política Aprendida para Cenários Monitorados:")
-
-                # Itera sobre a lista de estados para ver a política de cada um
-                for s_track in monitored_states:
-                    policy_s_int = self.policy.get(s_track, -1)
-                    policy_s_str = "Hit" if policy_s_int == 1 else "Stick" if policy_s_int == 0 else "N/A (nunca visitado)"
-                    print(f"    - Estado {str(s_track):<25}: Ação -> {policy_s_str}")
-                print("-" * 60)
+                self._print_progress(episode_num + 1, num_episodes, print_every, monitored_states)
+
+    def _act(self, state):
+        """Ação da política atual no estado."""
+        if self.storage == "dense":
+            return int(self.policy_table[state[0], state[1], int(state[2])])
+        return self.policy[state]
+
+    def _update_first_visit(self, state, action, G):
+        """Incorpora o retorno G de uma primeira visita a (estado, ação) e melhora a política."""
+        if self.storage == "dense":
+            s = (state[0], state[1], int(state[2]))
+            self.N[s + (action,)] += 1
+            self.Q[s + (action,)] += (G - self.Q[s + (action,)]) / self.N[s + (action,)]
+            self.policy_table[s] = np.argmax(self.Q[s])
+            return
+        self.returns[(state, action)].append(G)
+        self.Q[(state, action)] = np.mean(self.returns[(state, action)])
+        q_values_for_state = [self.Q.get((state, a), 0.0) for a in range(self.env.action_space.n)]
+        self.policy[state] = np.argmax(q_values_for_state)
+
+    def _print_progress(self, episodes_done, num_episodes, print_every, monitored_states):
+        policy = self.get_policy()
+        avg_reward = np.mean(self.learning_progress_rewards[-print_every:])
+        print(f"\n--- Progresso no Episódio: {episodes_done}/{num_episodes} ---")
+        print(f"  Recompensa Média (últimos {print_every} episódios): {avg_reward:.4f}")
+        print(f"  Tamanho da Política (estados conhecidos): {len(policy)}")
+        print("-" * 60)
+        print("  Política Aprendida para Cenários Monitorados:")
+
+        # Itera sobre a lista de estados para ver a política de cada um
+        for s_track in monitored_states:
+            policy_s_int = policy.get(s_track, -1)
+            policy_s_str = "Hit" if policy_s_int == 1 else "Stick" if policy_s_int == 0 else "N/A (nunca visitado)"
+            print(f"    - Estado {str(s_track):<25}: Ação -> {policy_s_str}")
+        print("-" * 60)
+
+    def _randomize_unvisited(self, rng):
+        """Sorteia com rng a ação dos estados ainda não visitados (somente storage="dense")."""
+        if self.storage != "dense":
+            return
+        unvisited = self.N.sum(axis=-1) == 0
+        self.policy_table[unvisited] = rng.integers(0, self.env.action_space.n, int(unvisited.sum()))
+
+    def _policy_table(self, rng):
+        """Tabela densa da política atual; estados ainda não vistos recebem ações aleatórias."""
+        if self.storage == "dense":
+            return self.policy_table
+        table = rng.integers(0, self.env.action_space.n, POLICY_SHAPE)
+        for (p_sum, d_card, ace), action in self.policy.items():
+            table[p_sum, d_card, int(ace)] = action
+        return table
+
+    def train_vectorized(self, num_episodes=500000, batch_size=50000, monitored_states=None,
+                         print_every=50000, seed=None):
+        """
+        Treina com o simulador vetorizado e exploring starts verdadeiros: cada mão
+        começa de (soma, carta do dealer, ás utilizável, ação) sorteados.
+
+        A política fica fixa dentro de cada lote de batch_size mãos; Q e a política
+        gulosa são recalculados ao fim de cada lote. Como no Blackjack um estado
+        nunca se repete dentro de um episódio, todo passo é uma primeira visita.
+        """
+        if monitored_states is None:
+            monitored_states = []
+        rng = np.random.default_rng(seed)
+        self._randomize_unvisited(rng)
+        simulator = VectorizedBlackjack(rng=rng)
+        num_actions = self.env.action_space.n
+
+        episodes_done = 0
+        with tqdm(total=num_episodes) as progress:
+            while episodes_done < num_episodes:
+                n = min(batch_size, num_episodes - episodes_done)
+                batch = simulator.play(self._policy_table(rng), n, exploring_starts=True)
+                self.learning_progress_rewards.extend(batch.final_rewards.tolist())
+                self._record_batch_returns(batch, num_actions)
+
+                previous_done, episodes_done = episodes_done, episodes_done + n
+                progress.update(n)
+                if episodes_done // print_every > previous_done // print_every:
+                    self._print_progress(episodes_done, num_episodes, print_every, monitored_states)
+
+    def train_parallel(self, num_episodes=500000, num_workers=None, sync_interval=50000, batch_size=50000,
+                       seed=0, monitored_states=None, print_every=50000):
+        """
+        Treino paralelo em shards (exige storage="dense"): os trabalhadores geram
+        episódios sob a política atual e acumulam somas e contagens de retornos;
+        a cada sync_interval episódios as estatísticas são fundidas e a política
+        gulosa é recalculada. A política inicial e os geradores dos trabalhadores
+        vêm de seed: com a mesma semente e o mesmo num_workers, Q é idêntica
+        (ver check_parallel_reproducibility).
+        """
+        if monitored_states is None:
+            monitored_states = []
+        last_report = [0]
+
+        def on_sync(episodes_done):
+            if episodes_done // print_every > last_report[0] // print_every:
+                self._print_progress(episodes_done, num_episodes, print_every, monitored_states)
+            last_report[0] = episodes_done
+
+        self._randomize_unvisited(np.random.default_rng(seed))
+        sharded = ShardedMonteCarlo(num_workers=num_workers, sync_interval=sync_interval,
+                                    batch_size=batch_size, seed=seed)
+        sharded.run(self, num_episodes, on_sync=on_sync)
+
+    def _record_batch_returns(self, batch, num_actions):
+        """Agrupa os retornos do lote por (estado, ação) e atualiza Q e a política."""
+        if self.storage == "dense":
+            index = (batch.player_sums, batch.dealer_cards, batch.usable_aces.astype(np.intp), batch.actions)
+            flat_index = np.ravel_multi_index(index, self.Q.shape)
+            sums = np.bincount(flat_index, weights=self._batch_returns(batch), minlength=self.Q.size)
+            counts = np.bincount(flat_index, minlength=self.Q.size)
+            self._merge_returns(sums.reshape(self.Q.shape), counts.reshape(self.Q.shape))
+            return
+        keys = ((batch.player_sums.astype(np.int64) * 11 + batch.dealer_cards) * 2 + batch.usable_aces) * 2 + batch.actions
+        returns = self._batch_returns(batch)
+        order = np.argsort(keys, kind="stable")
+        unique_keys, group_starts = np.unique(keys[order], return_index=True)
+        touched_states = set()
+        for key, group in zip(unique_keys.tolist(), np.split(returns[order], group_starts[1:])):
+            rest, action = divmod(key, 2)
+            rest, ace = divmod(rest, 2)
+            p_sum, d_card = divmod(rest, 11)
+            state = (p_sum, d_card, ace)
+            self.returns[(state, action)].extend(group.tolist())
+            self.Q[(state, action)] = np.mean(self.returns[(state, action)])
+            touched_states.add(state)
+        for state in touched_states:
+            q_values_for_state = [self.Q.get((state, a), 0.0) for a in range(num_actions)]
+            self.policy[state] = np.argmax(q_values_for_state)
+
+    def _batch_returns(self, batch):
+        """Retornos de cada passo do lote, com o Stick analítico se habilitado."""
+        if self.stick_values is None:
+            return batch.returns(self.gamma)
+        return batch.returns(self.gamma, batch.expected_final_rewards(self.stick_values))
+
+    def _merge_returns(self, return_sums, return_counts):
+        """
+        Funde estatísticas suficientes (soma e contagem de retornos por par) nas
+        médias de Q e recalcula a política gulosa dos estados visitados.
+        Somente para storage="dense".
+        """
+        visited = return_counts > 0
+        new_counts = self.N + return_counts
+        self.Q[visited] += (return_sums[visited] - return_counts[visited] * self.Q[visited]) / new_counts[visited]
+        self.N = new_counts
+        visited_states = self.N.sum(axis=-1) > 0
+        self.policy_table[visited_states] = np.argmax(self.Q[visited_states], axis=-1)
 
     def get_policy(self):
+        if self.storage == "dense":
+            # Dicionário com os estados já visitados, no mesmo formato do modo "dict"
+            visited = np.argwhere(self.N.sum(axis=-1) > 0)
+            return {(int(p), int(d), int(a)): int(self.policy_table[p, d, a]) for p, d, a in visited}
         return self.policy
 
+    def export_policy(self, path=None):
+        """
+        Congela a política aprendida em uma CompiledBlackjackPolicy (estados nunca
+        visitados recebem a ação padrão de from_policy) e, se path for dado, salva
+        a tabela com np.save.
+        """
+        compiled = CompiledBlackjackPolicy.from_policy(self.get_policy())
+        if path is not None:
+            compiled.save(path)
+        return compiled
+
+class OffPolicyMonteCarloAgent:
+    """
+    Controle Monte Carlo off-policy com amostragem por importância ponderada
+    incremental (Sutton & Barto, seção 5.7).
+
+    Os episódios vêm de uma política de comportamento b (configurável) e podem ser
+    gerados uma única vez e reaproveitados: a política-alvo é a gulosa em relação
+    a Q. Q e os pesos acumulados C(s, a) ficam em arrays densos indexados por
+    (soma, carta do dealer, ás utilizável, ação).
+    """
+    def __init__(self, env, gamma=1.0, behavior_policy=None):
+        """
+        behavior_policy: tabela com forma POLICY_SHAPE com a probabilidade de Hit
+        em cada estado (padrão: 0.5 em todos, a política aleatória uniforme).
+        Toda ação precisa ter probabilidade positiva sob b.
+        """
+        self.env = env; self.gamma = gamma
+        num_actions = self.env.action_space.n
+        if behavior_policy is None:
+            behavior_policy = np.full(POLICY_SHAPE, 0.5)
+        if np.any((behavior_policy <= 0) | (behavior_policy >= 1)):
+            raise ValueError("A política de comportamento deve dar probabilidade positiva às duas ações.")
+        self.behavior_policy = behavior_policy
+        self.Q = np.zeros(POLICY_SHAPE + (num_actions,))
+        self.C = np.zeros(POLICY_SHAPE + (num_actions,))
+        self.policy_table = np.zeros(POLICY_SHAPE, dtype=np.int8)
+
+    def generate_episodes(self, num_episodes, seed=None):
+        """Joga num_episodes mãos com a política de comportamento (lote colunar reaproveitável)."""
+        return VectorizedBlackjack(seed=seed).play(self.behavior_policy, num_episodes)
+
+    def train_from_episodes(self, batch):
+        """
+        Processa um lote de episódios gerados por self.behavior_policy. Cada
+        episódio é percorrido de trás para frente e o percurso termina assim que a
+        ação tomada difere da política-alvo, pois o peso W se torna zero.
+        """
+        num_actions = self.Q.shape[-1]
+        hit_probs = self.behavior_policy[batch.player_sums, batch.dealer_cards, batch.usable_aces.astype(np.intp)]
+        behavior_probs = np.where(batch.actions == 1, hit_probs, 1.0 - hit_probs).tolist()
+        state_index = np.ravel_multi_index(
+            (batch.player_sums, batch.dealer_cards, batch.usable_aces.astype(np.intp)), POLICY_SHAPE).tolist()
+        actions, rewards = batch.actions.tolist(), batch.rewards.tolist()
+        starts = batch.episode_starts.tolist()
+
+        # O laço de trás para frente é inerentemente sequencial; listas Python por
+        # estado evitam o custo de indexar arrays NumPy escalar a escalar
+        Q = self.Q.reshape(-1, num_actions).tolist()
+        C = self.C.reshape(-1, num_actions).tolist()
+        policy = self.policy_table.reshape(-1).tolist()
+
+        for first, end in zip(starts[:-1], starts[1:]):
+            G = 0.0
+            W = 1.0
+            for t in range(end - 1, first - 1, -1):
+                G = self.gamma * G + rewards[t]
+                q_s, c_s, a = Q[state_index[t]], C[state_index[t]], actions[t]
+                c_s[a] += W
+                q_s[a] += (W / c_s[a]) * (G - q_s[a])
+                greedy = max(range(num_actions), key=q_s.__getitem__)
+                policy[state_index[t]] = greedy
+                if a != greedy:
+                    break
+                W /= behavior_probs[t]
+
+        self.Q[...] = np.reshape(Q, self.Q.shape)
+        self.C[...] = np.reshape(C, self.C.shape)
+        self.policy_table[...] = np.reshape(policy, POLICY_SHAPE)
+
+    def train(self, num_episodes=500000, batch_size=50000, seed=None):
+        """Gera episódios com a política de comportamento, em lotes, e aprende a partir deles."""
+        rng = np.random.default_rng(seed)
+        for start in tqdm(range(0, num_episodes, batch_size)):
+            n = min(batch_size, num_episodes - start)
+            batch = VectorizedBlackjack(rng=rng).play(self.behavior_policy, n)
+            self.train_from_episodes(batch)
+
+    def get_policy(self):
+        """Política-alvo (gulosa) nos estados com algum peso acumulado."""
+        visited = np.argwhere(self.C.sum(axis=-1) > 0)
+        return {(int(p), int(d), int(a)): int(self.policy_table[p, d, a]) for p, d, a in visited}
+
+    def export_policy(self, path=None):
+        """Congela a política-alvo em uma CompiledBlackjackPolicy (ver MonteCarloExploringStartsAgent)."""
+        compiled = CompiledBlackjackPolicy.from_policy(self.get_policy())
+        if path is not None:
+            compiled.save(path)
+        return compiled
+
 # (As funções de plotagem - plot_learning_progress e plot_blackjack_policy - são as mesmas)
 def plot_learning_progress(rewards, window_size=5000):
     plt.figure(figsize=(12, 6)); df = pd.DataFrame(rewards, columns=['reward'])
@@ -80,11 +356,18 @@ def plot_learning_progress(rewards, window_size=5000):
 
 def plot_blackjack_policy(policy):
     player_sums = range(12, 22); dealer_cards = range(1, 11)
+    if isinstance(policy, CompiledBlackjackPolicy):
+        # A tabela compilada já cobre todos os estados: basta recortar a região plotada
+        _plot_policy_grids(policy.table[12:22, 1:11, 0], policy.table[12:22, 1:11, 1])
+        return
     policy_no_ace = np.zeros((len(player_sums), len(dealer_cards))); policy_usable_ace = np.zeros((len(player_sums), len(dealer_cards)))
     for i, p_sum in enumerate(player_sums):
         for j, d_card in enumerate(dealer_cards):
             policy_no_ace[i, j] = policy.get((p_sum, d_card, False), 0)
             policy_usable_ace[i, j] = policy.get((p_sum, d_card, True), 0)
+    _plot_policy_grids(policy_no_ace, policy_usable_ace)
+
+def _plot_policy_grids(policy_no_ace, policy_usable_ace):
     fig, axs = plt.subplots(1, 2, figsize=(15, 6), subplot_kw={'title': 'Política Ótima Aprendida'})
     axs[0].set_title('Sem Ás Utilizável'); axs[1].set_title('Com Ás Utilizável')
     im1 = axs[0].imshow(policy_no_ace, origin='lower', extent=[0.5, 10.5, 11.5, 21.5], cmap='viridis')
@@ -95,12 +378,29 @@ def plot_blackjack_policy(policy):
     fig.colorbar(im1, ax=axs, ticks=[0,1], label="Ação (0=Stick, 1=Hit)")
     plt.show()
 
+def check_parallel_reproducibility(env, num_episodes=100000, num_workers=2, seed=0):
+    """
+    Treina dois agentes com train_parallel e a mesma semente e confere se as
+    Tabelas Q e as contagens são idênticas.
+
+    Returns:
+        bool: True se os dois treinos produziram exatamente o mesmo resultado.
+    """
+    agents = []
+    for _ in range(2):
+        agent = MonteCarloExploringStartsAgent(env, storage="dense")
+        agent.train_parallel(num_episodes=num_episodes, num_workers=num_workers, seed=seed,
+                             print_every=num_episodes + 1)
+        agents.append(agent)
+    first, second = agents
+    return bool(np.array_equal(first.Q, second.Q) and np.array_equal(first.N, second.N))
+
 # ==============================================================================
 # EXECUÇÃO PRINCIPAL
 # ==============================================================================
 if __name__ == "__main__":
     env = gym.make('Blackjack-v1')
-    agent = MonteCarloExploringStartsAgent(env)
+    agent = MonteCarloExploringStartsAgent(env, storage="dense")
 
     # MODIFICADO: Lista de estados que queremos observar
     CENARIOS_PARA_MONITORAR = [
@@ -116,10 +416,43 @@ if __name__ == "__main__":
         (21, 1, False),  # Mão perfeita
     ]
 
-    agent.train(num_episodes=500000, monitored_states=CENARIOS_PARA_MONITORAR)
+    # O simulador vetorizado joga lotes de mãos com arrays e usa exploring starts
+    # verdadeiros; com False, o treino usa env.step do gymnasium, mão a mão
+    USAR_SIMULADOR_VETORIZADO = True
+    # Número de processos do treino paralelo em shards (1 = treino em um único processo)
+    NUM_TRABALHADORES = 1
+
+    if USAR_SIMULADOR_VETORIZADO and NUM_TRABALHADORES > 1:
+        # Dois treinos curtos com a mesma semente devem dar a mesma Tabela Q
+        if not check_parallel_reproducibility(env, num_workers=NUM_TRABALHADORES):
+            raise RuntimeError("train_parallel com a mesma semente produziu Tabelas Q diferentes.")
+        agent.train_parallel(num_episodes=500000, num_workers=NUM_TRABALHADORES,
+                             monitored_states=CENARIOS_PARA_MONITORAR)
+    elif USAR_SIMULADOR_VETORIZADO:
+        agent.train_vectorized(num_episodes=500000, monitored_states=CENARIOS_PARA_MONITORAR)
+    else:
+        agent.train(num_episodes=500000, monitored_states=CENARIOS_PARA_MONITORAR)
 
     print("\n--- Treinamento Concluído. Gerando gráficos finais... ---")
     plot_learning_progress(agent.learning_progress_rewards)
-    final_policy = agent.get_policy()
+    # A política final é congelada em uma tabela int8 (salva em disco) usada
+    # tanto no gráfico quanto na avaliação em lote
+    final_policy = agent.export_policy("final_policy.npy")
+    print(f"Recompensa média da política final (1.000.000 de mãos): {final_policy.evaluate(1_000_000, seed=0):.4f}")
     plot_blackjack_policy(final_policy)
+
+    # Controle off-policy: aprende a política gulosa a partir de mãos jogadas
+    # uma única vez pela política aleatória uniforme
+    USAR_CONTROLE_OFF_POLICY = False
+    if USAR_CONTROLE_OFF_POLICY:
+        off_policy_agent = OffPolicyMonteCarloAgent(env)
+        logged_hands = off_policy_agent.generate_episodes(500000, seed=0)
+        # Guarda as mãos em disco (colunas mapeadas em memória) para replay e auditoria
+        GRAVAR_MAOS = False
+        if GRAVAR_MAOS:
+            with TrajectoryRecorder("logged_hands", state_shape=(3,), state_dtype=np.int8,
+                                    action_dtype=np.int8) as recorder:
+                logged_hands.record(recorder)
+        off_policy_agent.train_from_episodes(logged_hands)
+        plot_blackjack_policy(off_policy_agent.export_policy())
     env.close()
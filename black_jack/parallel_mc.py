@@ -0,0 +1,118 @@
+# Autor: Renan Saraiva dos Santos
+
+"""
+Treinamento Monte Carlo paralelo (em shards) para o Blackjack.
+
+Os retornos de Monte Carlo são aditivos: a soma e a contagem de retornos por
+par (estado, ação) de vários trabalhadores se fundem exatamente. Cada
+trabalhador joga mãos com o simulador vetorizado sob a política atual e
+acumula arrays locais de soma e contagem; o coordenador funde as estatísticas
+no agente e recalcula a política gulosa a cada intervalo de sincronização.
+
+Cada trabalhador tem o seu próprio gerador de números aleatórios, derivado de
+np.random.SeedSequence(seed).spawn, e o estado do gerador volta ao
+coordenador ao fim de cada rodada. Como train_parallel também sorteia a
+política inicial a partir da semente, o resultado é reproduzível para uma
+mesma semente e um mesmo número de trabalhadores
+(main.check_parallel_reproducibility confere isso).
+"""
+
+import multiprocessing as mp
+import numpy as np
+from vector_blackjack import VectorizedBlackjack
+
+def collect_returns(policy_table, num_episodes, gamma, rng_state, batch_size, q_shape, stick_values=None):
+    """
+    Joga num_episodes mãos com exploring starts sob a política e devolve as
+    estatísticas suficientes locais. Com stick_values, os episódios que terminam
+    em Stick usam o retorno esperado exato em vez do amostrado.
+
+    Returns:
+        (soma_dos_retornos, contagens, recompensas_finais, estado_do_gerador)
+    """
+    rng = np.random.Generator(np.random.PCG64())
+    rng.bit_generator.state = rng_state
+    simulator = VectorizedBlackjack(rng=rng)
+    size = int(np.prod(q_shape))
+    return_sums = np.zeros(size)
+    return_counts = np.zeros(size, dtype=np.int64)
+    final_rewards = []
+
+    remaining = num_episodes
+    while remaining > 0:
+        n = min(batch_size, remaining)
+        batch = simulator.play(policy_table, n, exploring_starts=True)
+        index = (batch.player_sums, batch.dealer_cards, batch.usable_aces.astype(np.intp), batch.actions)
+        flat_index = np.ravel_multi_index(index, q_shape)
+        final_rewards_used = batch.expected_final_rewards(stick_values) if stick_values is not None else None
+        return_sums += np.bincount(flat_index, weights=batch.returns(gamma, final_rewards_used), minlength=size)
+        return_counts += np.bincount(flat_index, minlength=size)
+        final_rewards.append(batch.final_rewards)
+        remaining -= n
+
+    return (return_sums.reshape(q_shape), return_counts.reshape(q_shape),
+            np.concatenate(final_rewards), rng.bit_generator.state)
+
+def _collect_returns_task(args):
+    return collect_returns(*args)
+
+def split_episodes(num_episodes, num_workers):
+    """Divide num_episodes entre os trabalhadores da forma mais uniforme possível."""
+    base, extra = divmod(num_episodes, num_workers)
+    return [base + (1 if i < extra else 0) for i in range(num_workers)]
+
+def worker_rng_states(seed, num_workers):
+    """Estados iniciais independentes (e reproduzíveis) dos geradores de cada trabalhador."""
+    return [np.random.Generator(np.random.PCG64(child)).bit_generator.state
+            for child in np.random.SeedSequence(seed).spawn(num_workers)]
+
+class ShardedMonteCarlo:
+    """
+    Coordenador do treinamento paralelo.
+
+    Atributos:
+        num_workers (int): Número de processos trabalhadores.
+        sync_interval (int): Episódios (somando todos os trabalhadores) entre
+                             duas fusões das estatísticas e atualizações da política.
+        batch_size (int): Mãos por chamada ao simulador dentro de cada trabalhador.
+    """
+    def __init__(self, num_workers=None, sync_interval=50000, batch_size=50000, seed=0):
+        self.num_workers = num_workers or mp.cpu_count()
+        self.sync_interval = sync_interval
+        self.batch_size = batch_size
+        self.rng_states = worker_rng_states(seed, self.num_workers)
+
+    def run(self, agent, num_episodes, on_sync=None):
+        """
+        Treina o agente (storage="dense") por num_episodes episódios.
+
+        Args:
+            agent: MonteCarloExploringStartsAgent com storage="dense".
+            num_episodes (int): Total de episódios somando todos os trabalhadores.
+            on_sync (callable): Chamado como on_sync(episodios_concluidos) após cada fusão.
+        """
+        if agent.storage != "dense":
+            raise ValueError("O treinamento paralelo exige storage='dense'.")
+
+        episodes_done = 0
+        with mp.Pool(self.num_workers) as pool:
+            while episodes_done < num_episodes:
+                round_episodes = min(self.sync_interval, num_episodes - episodes_done)
+                shares = split_episodes(round_episodes, self.num_workers)
+                tasks = [(agent.policy_table, share, agent.gamma, state, self.batch_size, agent.Q.shape,
+                          agent.stick_values)
+                         for share, state in zip(shares, self.rng_states)]
+                results = pool.map(_collect_returns_task, tasks)
+
+                # Fusão exata: somas e contagens de todos os shards
+                return_sums = sum(result[0] for result in results)
+                return_counts = sum(result[1] for result in results)
+                agent._merge_returns(return_sums, return_counts)
+                for result in results:
+                    agent.learning_progress_rewards.extend(result[2].tolist())
+                self.rng_states = [result[3] for result in results]
+
+                episodes_done += round_episodes
+                if on_sync is not None:
+                    on_sync(episodes_done)
+        return agent
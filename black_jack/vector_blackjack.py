@@ -0,0 +1,241 @@
+# Autor: Renan Saraiva dos Santos
+
+"""
+Simulador vetorizado de Blackjack, compatível com as regras do Blackjack-v1
+(gymnasium, natural=False, sab=False): baralho infinito, figuras valem 10,
+o ás vale 11 quando não estoura, o dealer compra até somar 17 ou mais (e para
+no 17 "soft"), estourar é derrota imediata (-1) e, ao parar, vence a maior
+soma (+1, 0 ou -1).
+
+Em vez de jogar uma carta por vez via env.step, o simulador joga um lote
+inteiro de mãos com arrays NumPy e devolve os episódios em formato colunar.
+Ele também aceita começar cada mão de um estado arbitrário
+(soma_do_jogador, carta_do_dealer, ás_utilizável) com uma primeira ação
+forçada, o que torna os "exploring starts" verdadeiros.
+"""
+
+import numpy as np
+
+# Baralho infinito: ás (1), 2-9 e quatro cartas de valor 10 (10, J, Q, K)
+DECK = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10], dtype=np.int64)
+
+# Dimensões das tabelas densas indexadas por (soma_do_jogador, carta_do_dealer, ás_utilizável)
+POLICY_SHAPE = (32, 11, 2)
+
+class EpisodeBatch:
+    """
+    Lote de episódios em layout colunar: uma linha por passo, com os passos de
+    cada episódio contíguos e em ordem.
+
+    Atributos:
+        player_sums, dealer_cards, usable_aces, actions (np.array): Estado e ação de cada passo.
+        rewards (np.array): Recompensa recebida em cada passo.
+        episode_starts (np.array): Deslocamentos (num_episodes + 1); os passos do
+                                   episódio i são [episode_starts[i], episode_starts[i + 1]).
+    """
+    def __init__(self, player_sums, dealer_cards, usable_aces, actions, rewards, episode_starts):
+        self.player_sums = player_sums
+        self.dealer_cards = dealer_cards
+        self.usable_aces = usable_aces
+        self.actions = actions
+        self.rewards = rewards
+        self.episode_starts = episode_starts
+
+    @property
+    def num_episodes(self) -> int:
+        return len(self.episode_starts) - 1
+
+    @property
+    def num_steps(self) -> int:
+        return len(self.actions)
+
+    @property
+    def episode_lengths(self) -> np.ndarray:
+        return np.diff(self.episode_starts)
+
+    @property
+    def episode_ids(self) -> np.ndarray:
+        """Índice do episódio de cada passo."""
+        return np.repeat(np.arange(self.num_episodes), self.episode_lengths)
+
+    @property
+    def final_rewards(self) -> np.ndarray:
+        """Recompensa do último passo de cada episódio (o resultado da mão)."""
+        return self.rewards[self.episode_starts[1:] - 1]
+
+    def returns(self, gamma: float = 1.0, final_rewards: np.ndarray = None) -> np.ndarray:
+        """
+        Retorno G_t de cada passo. No Blackjack só o último passo é recompensado,
+        então G_t = gamma^(T - 1 - t) * recompensa_final. final_rewards permite
+        substituir o resultado amostrado de cada episódio (por exemplo, pelo seu
+        valor esperado).
+        """
+        if final_rewards is None:
+            final_rewards = self.final_rewards
+        steps_to_end = np.repeat(self.episode_starts[1:], self.episode_lengths) - 1 - np.arange(self.num_steps)
+        return gamma ** steps_to_end * np.repeat(final_rewards, self.episode_lengths)
+
+    def expected_final_rewards(self, stick_values: np.ndarray) -> np.ndarray:
+        """
+        Resultado de cada episódio com os que terminam em Stick trocados pelo
+        valor esperado exato stick_values[soma, carta_do_dealer].
+        """
+        last = self.episode_starts[1:] - 1
+        final_rewards = self.final_rewards.copy()
+        stick = self.actions[last] == 0
+        final_rewards[stick] = stick_values[self.player_sums[last[stick]], self.dealer_cards[last[stick]]]
+        return final_rewards
+
+    def record(self, recorder):
+        """
+        Grava o lote em um TrajectoryRecorder criado com state_shape=(3,). O
+        próximo estado do último passo de cada episódio repete o estado atual.
+        """
+        states = np.stack([self.player_sums, self.dealer_cards, self.usable_aces.astype(np.int8)], axis=1)
+        dones = np.zeros(self.num_steps, dtype=bool)
+        dones[self.episode_starts[1:] - 1] = True
+        next_states = states.copy()
+        next_states[:-1][~dones[:-1]] = states[1:][~dones[:-1]]
+        recorder.record_batch(states, self.actions, self.rewards, next_states, dones, self.episode_starts)
+
+    def states(self):
+        """Itera sobre os passos como tuplas (estado, ação, recompensa), no formato do env.step."""
+        for p_sum, d_card, ace, action, reward in zip(self.player_sums.tolist(), self.dealer_cards.tolist(),
+                                                      self.usable_aces.tolist(), self.actions.tolist(),
+                                                      self.rewards.tolist()):
+            yield (p_sum, d_card, int(ace)), action, reward
+
+def hand_value(raw_sums: np.ndarray, has_ace: np.ndarray):
+    """Soma efetiva e ás utilizável de mãos dadas pela soma com ases valendo 1."""
+    usable = has_ace & (raw_sums + 10 <= 21)
+    return np.where(usable, raw_sums + 10, raw_sums), usable
+
+class VectorizedBlackjack:
+    """
+    Simulador de Blackjack que joga lotes de mãos de uma só vez.
+
+    A política pode ser uma tabela de ações inteiras com forma POLICY_SHAPE
+    (determinística) ou uma tabela de floats com a probabilidade de Hit em
+    cada estado (estocástica).
+    """
+    def __init__(self, rng: np.random.Generator = None, seed: int = None):
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+
+    def draw_cards(self, n: int) -> np.ndarray:
+        """Compra n cartas do baralho infinito."""
+        return DECK[self.rng.integers(0, len(DECK), n)]
+
+    def sample_exploring_starts(self, n: int):
+        """
+        Sorteia n inícios uniformes sobre soma 12-21, carta do dealer 1-10,
+        ás utilizável e primeira ação.
+        """
+        player_sums = self.rng.integers(12, 22, n)
+        dealer_cards = self.rng.integers(1, 11, n)
+        usable_aces = self.rng.integers(0, 2, n).astype(bool)
+        first_actions = self.rng.integers(0, 2, n)
+        return player_sums, dealer_cards, usable_aces, first_actions
+
+    def play(self, policy: np.ndarray, num_episodes: int, exploring_starts: bool = False) -> EpisodeBatch:
+        """
+        Joga num_episodes mãos seguindo a política.
+
+        Args:
+            policy (np.array): Tabela de ações (int) ou de probabilidades de Hit (float).
+            num_episodes (int): Número de mãos.
+            exploring_starts (bool): Se True, cada mão começa de um estado e ação
+                                     sorteados uniformemente (sample_exploring_starts).
+        """
+        if exploring_starts:
+            return self.play_from(*self.sample_exploring_starts(num_episodes), policy=policy)
+
+        # Distribuição inicial normal: duas cartas para o jogador
+        first, second = self.draw_cards(num_episodes), self.draw_cards(num_episodes)
+        raw_sums = first + second
+        has_ace = (first == 1) | (second == 1)
+        return self._play(raw_sums, has_ace, self.draw_cards(num_episodes), policy, first_actions=None)
+
+    def play_from(self, player_sums, dealer_cards, usable_aces, first_actions, policy: np.ndarray) -> EpisodeBatch:
+        """
+        Joga mãos que começam em estados arbitrários com uma primeira ação forçada.
+
+        Uma mão com ás utilizável e soma s equivale a soma s - 10 com o ás valendo 1;
+        sem ás utilizável, a mão de soma s evolui como uma mão sem ases.
+        """
+        player_sums = np.asarray(player_sums, dtype=np.int64)
+        usable_aces = np.asarray(usable_aces, dtype=bool)
+        raw_sums = np.where(usable_aces, player_sums - 10, player_sums)
+        return self._play(raw_sums, usable_aces.copy(), np.asarray(dealer_cards, dtype=np.int64), policy,
+                          first_actions=np.asarray(first_actions, dtype=np.int64))
+
+    def _dealer_scores(self, dealer_cards: np.ndarray) -> np.ndarray:
+        """Revela a carta oculta e joga o dealer; retorna a soma final (0 se estourar)."""
+        hidden = self.draw_cards(len(dealer_cards))
+        raw_sums = dealer_cards + hidden
+        has_ace = (dealer_cards == 1) | (hidden == 1)
+        totals, _ = hand_value(raw_sums, has_ace)
+        drawing = np.flatnonzero(totals < 17)
+        while drawing.size:
+            cards = self.draw_cards(drawing.size)
+            raw_sums[drawing] += cards
+            has_ace[drawing] |= cards == 1
+            totals[drawing], _ = hand_value(raw_sums[drawing], has_ace[drawing])
+            drawing = drawing[totals[drawing] < 17]
+        return np.where(totals > 21, 0, totals)
+
+    def _choose_actions(self, policy: np.ndarray, player_sums, dealer_cards, usable_aces) -> np.ndarray:
+        """Consulta a política para um lote de estados."""
+        values = policy[player_sums, dealer_cards, usable_aces.astype(np.intp)]
+        if np.issubdtype(policy.dtype, np.floating):
+            return (self.rng.random(len(values)) < values).astype(np.int64)
+        return values.astype(np.int64)
+
+    def _play(self, raw_sums, has_ace, dealer_cards, policy, first_actions) -> EpisodeBatch:
+        """Laço vetorizado: a cada rodada, todas as mãos ainda ativas agem juntas."""
+        num_episodes = len(raw_sums)
+        raw_sums = raw_sums.copy()
+        active = np.arange(num_episodes)
+        columns = []
+
+        while active.size:
+            player_sums, usable = hand_value(raw_sums[active], has_ace[active])
+            d_cards = dealer_cards[active]
+            if first_actions is not None and len(columns) == 0:
+                actions = first_actions
+            else:
+                actions = self._choose_actions(policy, player_sums, d_cards, usable)
+            rewards = np.zeros(active.size)
+            finished = np.zeros(active.size, dtype=bool)
+
+            # Hit: compra uma carta; estourar encerra com -1
+            hit = np.flatnonzero(actions == 1)
+            cards = self.draw_cards(hit.size)
+            raw_sums[active[hit]] += cards
+            has_ace[active[hit]] |= cards == 1
+            bust = raw_sums[active[hit]] > 21
+            rewards[hit[bust]] = -1.0
+            finished[hit[bust]] = True
+
+            # Stick: o dealer joga e as somas são comparadas
+            stick = np.flatnonzero(actions == 0)
+            if stick.size:
+                dealer_scores = self._dealer_scores(d_cards[stick])
+                rewards[stick] = np.sign(player_sums[stick] - dealer_scores)
+                finished[stick] = True
+
+            columns.append((active, player_sums, d_cards, usable, actions, rewards))
+            active = active[~finished]
+
+        episode_ids, player_sums, d_cards, usable, actions, rewards = (np.concatenate(c) for c in zip(*columns))
+        # Os passos foram gerados rodada a rodada; a ordenação estável agrupa por episódio
+        order = np.argsort(episode_ids, kind="stable")
+        episode_starts = np.zeros(num_episodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(episode_ids, minlength=num_episodes), out=episode_starts[1:])
+        return EpisodeBatch(
+            player_sums=player_sums[order].astype(np.int8),
+            dealer_cards=d_cards[order].astype(np.int8),
+            usable_aces=usable[order],
+            actions=actions[order].astype(np.int8),
+            rewards=rewards[order],
+            episode_starts=episode_starts,
+        )
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Este script implementa uma arquitetura ator-aprendiz (actor-learner) com
+coleta de experiência em vários processos para o ambiente GridWorld.
+
+- K processos atores rodam o seu próprio GridWorld com uma cópia local,
+  possivelmente desatualizada, da Tabela Q, e escrevem as transições em lotes
+  dentro de um conjunto de "slots" em memória compartilhada. Pelas filas só
+  trafegam os índices dos slots, nunca os dados.
+- Um único aprendiz (o processo principal) consome os lotes, aplica
+  atualizações Q-Learning vetorizadas e, periodicamente, publica a Tabela Q
+  atualizada para os atores.
+
+Isso separa a simulação do ambiente (lenta) do aprendizado, que é como se
+rodam simuladores caros de produção.
+"""
+
+import os
+import queue
+import time
+import multiprocessing as mp
+import numpy as np
+from grid_world.gridworld import GridWorld
+from grid_world.qlearning_agent import QLearningAgent
+from grid_world.shared_q_table import SharedArray
+
+# Colunas de cada transição no slot compartilhado
+_ROW, _COL, _ACTION, _REWARD, _NEXT_ROW, _NEXT_COL, _DONE = range(7)
+_NUM_FIELDS = 7
+
+# Layout do array de controle compartilhado
+_SEQUENCE = 0   # seqlock da política publicada (ímpar = escrita em andamento)
+_STOP = 1       # 1 quando os atores devem encerrar
+_HEADER = 2     # início dos contadores de passos por ator
+
+def _read_policy(policy, control, out):
+    """Copia a política publicada para `out` (seqlock) e retorna a versão lida."""
+    while True:
+        start = control[_SEQUENCE]
+        if start % 2 == 0:
+            np.copyto(out, policy)
+            if control[_SEQUENCE] == start:
+                return int(start // 2)
+        time.sleep(1e-5)
+
+def _actor_loop(actor_id, names, shapes, grid_size, epsilon, max_steps, seed,
+                free_slots, full_slots):
+    """Laço de um ator: gera transições com a política local e envia lotes ao aprendiz."""
+    np.random.seed(seed)
+    slots_shared = SharedArray.attach(names["slots"], shapes["slots"])
+    policy_shared = SharedArray.attach(names["policy"], shapes["policy"])
+    control_shared = SharedArray.attach(names["control"], shapes["control"], dtype=np.int64)
+    slots, control = slots_shared.array, control_shared.array
+    batch_size = slots.shape[1]
+    steps_index = _HEADER + actor_id
+
+    env = GridWorld(grid_size=grid_size)
+    agent = QLearningAgent(grid_size, env.num_actions, epsilon=epsilon)
+    version = _read_policy(policy_shared.array, control, agent.q_table)
+    total_steps = 0
+
+    def next_free_slot():
+        while not control[_STOP]:
+            try:
+                return free_slots.get(timeout=0.05)
+            except queue.Empty:
+                continue
+        return None
+
+    try:
+        slot = next_free_slot()
+        filled = 0
+        state, steps_in_episode = env.reset(), 0
+        while slot is not None:
+            action = agent.choose_action(state)
+            next_state, reward, done = env.step(action)
+            slots[slot, filled] = (state[0], state[1], action, reward, next_state[0], next_state[1], done)
+            filled += 1
+            total_steps += 1
+            steps_in_episode += 1
+
+            if done or steps_in_episode >= max_steps:
+                state, steps_in_episode = env.reset(), 0
+            else:
+                state = next_state
+
+            if filled == batch_size:
+                full_slots.put((slot, filled, actor_id, time.monotonic(), version))
+                control[steps_index] = total_steps
+                # Atualiza a cópia local apenas se houver uma versão mais nova
+                if control[_SEQUENCE] // 2 != version:
+                    version = _read_policy(policy_shared.array, control, agent.q_table)
+                slot = next_free_slot()
+                filled = 0
+    finally:
+        control[steps_index] = total_steps
+        slots_shared.close()
+        policy_shared.close()
+        control_shared.close()
+
+class ActorLearner:
+    """
+    Coordena K atores e um aprendiz Q-Learning em lotes.
+
+    Uso típico:
+        with ActorLearner(grid_size=(20, 20), num_actors=4) as system:
+            report = system.run(num_transitions=1_000_000)
+            q_table = system.q_table
+
+    Atributos:
+        grid_size (tuple): Dimensões da grade.
+        num_actors (int): Número de processos atores.
+        batch_size (int): Transições por lote enviado ao aprendiz.
+        broadcast_every (int): Lotes aplicados entre duas publicações da política.
+        q_table (np.array): Tabela Q do aprendiz (no processo principal).
+    """
+    def __init__(self, grid_size: tuple = (5, 5), num_actors: int = None, alpha: float = 0.1,
+                 gamma: float = 0.9, epsilon: float = 0.1, max_steps_per_episode: int = 100,
+                 batch_size: int = 256, num_slots: int = None, broadcast_every: int = 10, seed: int = 0):
+        self.grid_size = grid_size
+        self.num_actors = num_actors or os.cpu_count() or 1
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.max_steps_per_episode = max_steps_per_episode
+        self.batch_size = batch_size
+        self.num_slots = num_slots or 4 * self.num_actors
+        self.broadcast_every = broadcast_every
+        self.seed = seed
+
+        num_actions = GridWorld(grid_size=grid_size).num_actions
+        self.q_table = np.zeros(grid_size + (num_actions,))
+        self._slots = SharedArray((self.num_slots, batch_size, _NUM_FIELDS))
+        self._policy = SharedArray(self.q_table.shape)
+        self._control = SharedArray((_HEADER + self.num_actors,), dtype=np.int64)
+        self.policy_version = 0
+
+    def _publish_policy(self):
+        """Publica a Tabela Q do aprendiz para os atores (escrita protegida por seqlock)."""
+        control = self._control.array
+        control[_SEQUENCE] += 1
+        np.copyto(self._policy.array, self.q_table)
+        control[_SEQUENCE] += 1
+        self.policy_version = int(control[_SEQUENCE] // 2)
+
+    def _learn(self, batch: np.ndarray):
+        """Atualização Q-Learning vetorizada sobre um lote de transições."""
+        rows = batch[:, _ROW].astype(np.intp)
+        cols = batch[:, _COL].astype(np.intp)
+        actions = batch[:, _ACTION].astype(np.intp)
+        next_rows = batch[:, _NEXT_ROW].astype(np.intp)
+        next_cols = batch[:, _NEXT_COL].astype(np.intp)
+        not_done = 1.0 - batch[:, _DONE]
+
+        # Os alvos usam a tabela do início do lote. Pares (s, a) repetidos recebem a
+        # média dos seus erros TD, para que o passo efetivo continue sendo alpha
+        next_max = self.q_table[next_rows, next_cols].max(axis=1)
+        targets = batch[:, _REWARD] + self.gamma * next_max * not_done
+        flat_index = np.ravel_multi_index((rows, cols, actions), self.q_table.shape)
+        q_flat = self.q_table.reshape(-1)
+        td_errors = targets - q_flat[flat_index]
+        td_sums = np.bincount(flat_index, weights=td_errors, minlength=q_flat.size)
+        counts = np.bincount(flat_index, minlength=q_flat.size)
+        visited = counts > 0
+        q_flat[visited] += self.alpha * td_sums[visited] / counts[visited]
+
+    def run(self, num_transitions: int) -> dict:
+        """
+        Executa atores e aprendiz até o aprendiz consumir num_transitions transições.
+
+        Returns:
+            Um dicionário com passos/s dos atores, atualizações/s do aprendiz,
+            atraso médio e máximo dos lotes na fila (segundos) e defasagem média
+            da política usada pelos atores (em versões). Se o aprendiz não
+            chegar a consumir nenhum lote (ex.: num_transitions <= 0), os
+            atrasos são NaN.
+        """
+        free_slots, full_slots = mp.Queue(), mp.Queue()
+        for slot in range(self.num_slots):
+            free_slots.put(slot)
+        self._control.array.fill(0)
+        self._publish_policy()
+
+        names = {"slots": self._slots.name, "policy": self._policy.name, "control": self._control.name}
+        shapes = {"slots": self._slots.shape, "policy": self._policy.shape, "control": self._control.shape}
+        seeds = np.random.SeedSequence(self.seed).generate_state(self.num_actors)
+        actors = [
+            mp.Process(target=_actor_loop, daemon=True,
+                       args=(actor_id, names, shapes, self.grid_size, self.epsilon,
+                             self.max_steps_per_episode, int(seeds[actor_id]), free_slots, full_slots))
+            for actor_id in range(self.num_actors)
+        ]
+        start = time.monotonic()
+        for actor in actors:
+            actor.start()
+
+        consumed = batches = 0
+        queue_lags, policy_lags = [], []
+        learner_time = 0.0
+        slots = self._slots.array
+        try:
+            while consumed < num_transitions:
+                try:
+                    slot, count, _, produced_at, version = full_slots.get(timeout=1.0)
+                except queue.Empty:
+                    if not any(actor.is_alive() for actor in actors):
+                        raise RuntimeError("Todos os atores terminaram inesperadamente.")
+                    continue
+                queue_lags.append(time.monotonic() - produced_at)
+                policy_lags.append(self.policy_version - version)
+
+                learn_start = time.perf_counter()
+                self._learn(slots[slot, :count])
+                learner_time += time.perf_counter() - learn_start
+                free_slots.put(slot)
+
+                consumed += count
+                batches += 1
+                if batches % self.broadcast_every == 0:
+                    self._publish_policy()
+        finally:
+            self._control.array[_STOP] = 1
+            for actor in actors:
+                while actor.is_alive():
+                    # Esvazia a fila para que nenhum ator fique preso ao encerrar
+                    try:
+                        full_slots.get(timeout=0.05)
+                    except queue.Empty:
+                        pass
+                    actor.join(timeout=0.05)
+            free_slots.close()
+            full_slots.close()
+
+        elapsed = time.monotonic() - start
+        self._publish_policy()
+        if not queue_lags:
+            queue_lags = policy_lags = [np.nan]
+        actor_steps = int(self._control.array[_HEADER:].sum())
+        return {
+            "actor_steps": actor_steps,
+            "learner_updates": consumed,
+            "elapsed": elapsed,
+            "actor_steps_per_second": actor_steps / elapsed,
+            "learner_updates_per_second": consumed / elapsed,
+            "learner_busy_fraction": learner_time / elapsed,
+            "mean_queue_lag": float(np.mean(queue_lags)),
+            "max_queue_lag": float(np.max(queue_lags)),
+            "mean_policy_lag": float(np.mean(policy_lags)),
+        }
+
+    def close(self):
+        """Libera os blocos de memória compartilhada."""
+        for shared in (self._slots, self._policy, self._control):
+            shared.close()
+            shared.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+if __name__ == "__main__":
+    # --- Configurações ---
+    GRID_SIZE = (5, 5)
+    NUM_TRANSITIONS = 500_000
+
+    with ActorLearner(grid_size=GRID_SIZE, batch_size=512, broadcast_every=5) as system:
+        report = system.run(NUM_TRANSITIONS)
+        final_q = system.q_table.copy()
+
+    print("--- Relatório Ator-Aprendiz ---")
+    print(f"Atores: {report['actor_steps_per_second']:.0f} passos/s ({report['actor_steps']} passos)")
+    print(f"Aprendiz: {report['learner_updates_per_second']:.0f} atualizações/s "
+          f"(ocupado {100 * report['learner_busy_fraction']:.1f}% do tempo)")
+    print(f"Atraso na fila: médio {1000 * report['mean_queue_lag']:.2f} ms, máximo {1000 * report['max_queue_lag']:.2f} ms")
+    print(f"Defasagem média da política dos atores: {report['mean_policy_lag']:.2f} versões")
+
+    print("\nPolítica gulosa aprendida:")
+    print(np.argmax(final_q, axis=2))
@@ -11,10 +11,15 @@ Este script irá:
 5. Exibir os gráficos em janelas interativas.
 """
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from tqdm import tqdm
+
+# Permite importar o motor de treinamento compartilhado da raiz do repositório
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from trainer import Trainer, TqdmProgress
 
 # --- CLASSE DO AMBIENTE: GridWorld ---
 class GridWorld:
@@ -91,25 +96,9 @@ class QLearningAgent:
 
 # --- FUNÇÃO DE SIMULAÇÃO ---
 def run_simulation(agent, environment, num_episodes=1000):
-    total_rewards_per_episode = []
     print(f"Treinando {agent.__class__.__name__}...")
-    for _ in tqdm(range(num_episodes)):
-        state = environment.reset()
-        total_reward = 0
-        done = False
-        for _ in range(100):
-            action = agent.choose_action(state)
-            next_state, reward, done = environment.step(action)
-            if isinstance(agent, QLearningAgent):
-                agent.update(state, action, reward, next_state)
-            elif isinstance(agent, BanditAgent):
-                agent.update(state, action, reward)
-            state = next_state
-            total_reward += reward
-            if done:
-                break
-        total_rewards_per_episode.append(total_reward)
-    return total_rewards_per_episode
+    trainer = Trainer(agent, environment, max_steps_per_episode=100, callbacks=[TqdmProgress()])
+    return trainer.run(num_episodes).episode_returns
 
 # --- FUNÇÕES DE PLOTAGEM ---
 def plot_learning_curves(bandit_rewards, q_learning_rewards, filename="learning_curves.png"):
@@ -8,6 +8,7 @@ dessa abordagem em problemas sequenciais.
 """
 
 import numpy as np
+from grid_world.bandit_storage import DenseBanditStorage, HashedBanditStorage, grid_state_id
 
 class BanditAgent:
     """
@@ -24,15 +25,34 @@ class BanditAgent:
                               par (estado, ação).
         action_counts (dict): Dicionário para contar quantas vezes cada par
                               (estado, ação) foi escolhido.
+        storage (str): Estrutura de armazenamento: "dict" (padrão), "dense"
+                       (arrays do tamanho da grade) ou "hashed" (tabela hash
+                       sobre ids inteiros de estado).
     """
-    def __init__(self, grid_size: tuple, num_actions: int, epsilon: float = 0.1):
+    def __init__(self, grid_size: tuple, num_actions: int, epsilon: float = 0.1, storage: str = "dict"):
         self.grid_size = grid_size
         self.num_actions = num_actions
         self.epsilon = epsilon
+        self.storage = storage
         
         # Estrutura para armazenar Q(s, a) - o valor estimado da ação 'a' no estado 's'
-        self.action_values = {} # (estado, ação) -> valor
-        self.action_counts = {} # (estado, ação) -> contagem
+        if storage == "dict":
+            self.action_values = {} # (estado, ação) -> valor
+            self.action_counts = {} # (estado, ação) -> contagem
+        elif storage == "dense":
+            self._backend = DenseBanditStorage(grid_size, num_actions)
+            self.action_values = self._backend.action_values
+            self.action_counts = self._backend.action_counts
+        elif storage == "hashed":
+            self._backend = HashedBanditStorage(num_actions)
+        else:
+            raise ValueError("storage deve ser 'dict', 'dense' ou 'hashed'.")
+
+    def _backend_key(self, state):
+        """Converte o estado na chave usada pelo backend (id inteiro no modo hashed)."""
+        if self.storage == "hashed":
+            return int(state) if isinstance(state, (int, np.integer)) else grid_state_id(state)
+        return state
 
     def choose_action(self, state: tuple) -> int:
         """
@@ -47,6 +67,9 @@ class BanditAgent:
         if np.random.rand() < self.epsilon:
             # Exploração: escolhe uma ação aleatória
             return np.random.randint(self.num_actions)
+        elif self.storage != "dict":
+            # Explotação com argmax vetorizado sobre a linha de valores do estado
+            return self._backend.best_action(self._backend_key(state))
         else:
             # Explotação: escolhe a melhor ação conhecida para este estado
             best_action = -1
@@ -70,6 +93,10 @@ class BanditAgent:
             action (int): A ação que foi tomada.
             reward (float): A recompensa recebida.
         """
+        if self.storage != "dict":
+            self._backend.update(self._backend_key(state), action, reward)
+            return
+
         # Incrementa a contagem para o par (estado, ação)
         self.action_counts[(state, action)] = self.action_counts.get((state, action), 0) + 1
         count = self.action_counts[(state, action)]
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Este script define estruturas de armazenamento alternativas para os valores
+e contagens do Agente Bandit.
+
+O BanditAgent original guarda Q(s, a) e N(s, a) em dicionários com chaves
+(estado, ação), o que custa caro em memória e em tempo de acesso. Aqui são
+oferecidas duas alternativas com a mesma semântica de média incremental:
+
+1. DenseBanditStorage: arrays (linhas, colunas, ações) para grades limitadas,
+   com argmax vetorizado.
+2. HashedBanditStorage: tabela hash de endereçamento aberto sobre ids inteiros
+   de estado (dentro de int64), para espaços de estados enormes ou sem
+   tamanho conhecido de antemão.
+"""
+
+import numpy as np
+
+class DenseBanditStorage:
+    """
+    Armazenamento denso de Q(s, a) e N(s, a) em arrays NumPy.
+
+    Atributos:
+        action_values (np.array): Valores estimados. Dimensões: (linhas, colunas, ações).
+        action_counts (np.array): Contagem de escolhas. Mesmas dimensões.
+    """
+    def __init__(self, grid_size: tuple, num_actions: int):
+        self.action_values = np.zeros(grid_size + (num_actions,))
+        self.action_counts = np.zeros(grid_size + (num_actions,), dtype=np.int64)
+
+    def best_action(self, state: tuple) -> int:
+        """Retorna a ação de maior valor estimado no estado (primeira em caso de empate)."""
+        return int(np.argmax(self.action_values[state]))
+
+    def get_value(self, state: tuple, action: int) -> float:
+        """Retorna Q(s, a)."""
+        return self.action_values[state][action]
+
+    def update(self, state: tuple, action: int, reward: float):
+        """Aplica a média incremental a Q(s, a)."""
+        index = state + (action,)
+        self.action_counts[index] += 1
+        self.action_values[index] += (reward - self.action_values[index]) / self.action_counts[index]
+
+class HashedBanditStorage:
+    """
+    Tabela hash de endereçamento aberto (sondagem linear) sobre ids inteiros
+    de estado.
+
+    Cada posição ocupada guarda o id do estado e as linhas de valores e
+    contagens de todas as ações, em arrays contíguos. A capacidade é sempre
+    uma potência de 2 e dobra quando a taxa de ocupação passa de max_load.
+    Os ids são guardados como int64, então precisam estar em [-2^63, 2^63); ids
+    fora desse intervalo geram ValueError.
+
+    Atributos:
+        num_actions (int): Número de ações possíveis.
+        capacity (int): Número de posições da tabela.
+        size (int): Número de estados armazenados.
+    """
+    # Constante de Fibonacci (2^64 / φ) para espalhar ids consecutivos
+    _HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+    _MASK_64 = (1 << 64) - 1
+    _ID_LIMIT = 1 << 63
+
+    def __init__(self, num_actions: int, initial_capacity: int = 1024, max_load: float = 0.5):
+        if not 0.0 < max_load < 1.0:
+            raise ValueError("max_load deve estar entre 0 e 1.")
+        self.num_actions = num_actions
+        self.max_load = max_load
+        self.size = 0
+        self._allocate(max(8, 1 << (int(initial_capacity) - 1).bit_length()))
+
+    def _allocate(self, capacity: int):
+        """Aloca arrays vazios para a capacidade informada."""
+        self.capacity = capacity
+        self._shift = 64 - (capacity.bit_length() - 1)
+        self._keys = np.zeros(capacity, dtype=np.int64)
+        self._occupied = np.zeros(capacity, dtype=bool)
+        self._values = np.zeros((capacity, self.num_actions))
+        self._counts = np.zeros((capacity, self.num_actions), dtype=np.int64)
+
+    def _home_slot(self, state_id: int) -> int:
+        """Posição inicial de um id na tabela (hash multiplicativo)."""
+        # int(): com um np.integer, o produto estouraria em vez de crescer como int do Python
+        return ((int(state_id) * self._HASH_MULTIPLIER) & self._MASK_64) >> self._shift
+
+    def _find(self, state_id: int) -> int:
+        """Retorna a posição do id, ou a primeira posição livre da sua sequência de sondagem."""
+        if not -self._ID_LIMIT <= state_id < self._ID_LIMIT:
+            raise ValueError(f"O id de estado {state_id} não cabe em int64 (precisa estar em [-2^63, 2^63)).")
+        slot = self._home_slot(state_id)
+        mask = self.capacity - 1
+        while self._occupied[slot] and self._keys[slot] != state_id:
+            slot = (slot + 1) & mask
+        return slot
+
+    def _grow(self):
+        """Dobra a capacidade e reinsere todos os estados."""
+        keys = self._keys[self._occupied]
+        values = self._values[self._occupied]
+        counts = self._counts[self._occupied]
+        self._allocate(self.capacity * 2)
+        for state_id, value_row, count_row in zip(keys.tolist(), values, counts):
+            slot = self._find(state_id)
+            self._occupied[slot] = True
+            self._keys[slot] = state_id
+            self._values[slot] = value_row
+            self._counts[slot] = count_row
+
+    def best_action(self, state_id: int) -> int:
+        """Retorna a ação de maior valor no estado; estados nunca vistos valem 0 para todas as ações."""
+        slot = self._find(state_id)
+        if not self._occupied[slot]:
+            return 0
+        return int(np.argmax(self._values[slot]))
+
+    def get_value(self, state_id: int, action: int) -> float:
+        """Retorna Q(s, a), ou 0.0 se o par nunca foi atualizado."""
+        slot = self._find(state_id)
+        return self._values[slot, action] if self._occupied[slot] else 0.0
+
+    def update(self, state_id: int, action: int, reward: float):
+        """Aplica a média incremental a Q(s, a), inserindo o estado se necessário."""
+        slot = self._find(state_id)
+        if not self._occupied[slot]:
+            if (self.size + 1) > self.max_load * self.capacity:
+                self._grow()
+                slot = self._find(state_id)
+            self._occupied[slot] = True
+            self._keys[slot] = state_id
+            self.size += 1
+        self._counts[slot, action] += 1
+        self._values[slot, action] += (reward - self._values[slot, action]) / self._counts[slot, action]
+
+def grid_state_id(state: tuple) -> int:
+    """
+    Converte um estado (linha, coluna) em um id inteiro sem precisar conhecer
+    o tamanho da grade (emparelhamento de Cantor sobre inteiros mapeados para naturais).
+
+    O id cresce com o quadrado das coordenadas; com |linha| e |coluna| abaixo
+    de 10⁹ ele sempre fica abaixo de 2^63, o limite do HashedBanditStorage.
+    """
+    row, col = (2 * x if x >= 0 else -2 * x - 1 for x in state)
+    return (row + col) * (row + col + 1) // 2 + col
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Este script implementa agentes com traços de elegibilidade para o GridWorld:
+SARSA(λ) e Q(λ) de Watkins.
+
+No Q-Learning de um passo, a recompensa de uma cenoura distante só recua uma
+célula por episódio. Com traços, cada erro TD é aplicado de uma vez a todos os
+pares (estado, ação) visitados recentemente, com peso decaindo por γλ a cada
+passo, e a informação percorre o caminho inteiro em um único episódio.
+
+Os traços ficam em um dicionário esparso {índice do par: traço}. Traços
+abaixo de trace_cutoff são descartados, então cada atualização toca só as
+~log(trace_cutoff) / log(γλ) células mais recentes, e não a tabela inteira.
+"""
+
+from grid_world.qlearning_agent import QLearningAgent
+
+class EligibilityTraceAgent(QLearningAgent):
+    """
+    Base dos agentes com traços de elegibilidade (traços de substituição).
+
+    Como o alvo depende da próxima ação, update já escolhe a ação do passo
+    seguinte, e choose_action a devolve. O Trainer chama start_episode no
+    início de cada episódio para zerar os traços e essa ação pendente.
+
+    Atributos:
+        lam (float): Parâmetro λ do decaimento dos traços.
+        trace_cutoff (float): Traços menores que este valor são descartados.
+        traces (dict): Índice linear do par (estado, ação) na Tabela Q -> traço.
+    """
+    def __init__(self, grid_size: tuple, num_actions: int, alpha: float = 0.1, gamma: float = 0.9,
+                 epsilon: float = 0.1, lam: float = 0.8, trace_cutoff: float = 1e-3):
+        super().__init__(grid_size, num_actions, alpha=alpha, gamma=gamma, epsilon=epsilon)
+        if not 0.0 <= lam <= 1.0:
+            raise ValueError("lam deve estar entre 0 e 1.")
+        self.lam = lam
+        self.trace_cutoff = trace_cutoff
+        self.traces = {}
+        self._q_flat = self.q_table.reshape(-1)  # visão: escrever aqui altera q_table
+        self._num_cols = grid_size[1]
+        self._next_action = None
+
+    def _index(self, state: tuple, action: int) -> int:
+        return (state[0] * self._num_cols + state[1]) * self.num_actions + action
+
+    def start_episode(self):
+        """Zera os traços e a ação pendente (chamado pelo Trainer a cada reset)."""
+        self.traces.clear()
+        self._next_action = None
+
+    def _epsilon_greedy(self, state: tuple) -> int:
+        return super().choose_action(state)
+
+    def choose_action(self, state: tuple) -> int:
+        """Devolve a ação já escolhida em update ou, no início do episódio, uma ação Epsilon-Greedy."""
+        if self._next_action is not None:
+            action, self._next_action = self._next_action, None
+            return action
+        return self._epsilon_greedy(state)
+
+    def _apply(self, state: tuple, action: int, td_error: float, decay: float):
+        """
+        Marca (estado, ação) com traço 1, aplica o erro TD a todos os pares
+        ativos e decai os traços por `decay`, descartando os pequenos.
+        """
+        traces = self.traces
+        traces[self._index(state, action)] = 1.0
+        q, step, cutoff = self._q_flat, self.alpha * td_error, self.trace_cutoff
+        decayed = {}
+        for index, trace in traces.items():
+            q[index] += step * trace
+            trace *= decay
+            if trace >= cutoff:
+                decayed[index] = trace
+        self.traces = decayed
+
+class SarsaLambdaAgent(EligibilityTraceAgent):
+    """SARSA(λ): o alvo usa a ação que a política Epsilon-Greedy de fato executará."""
+    def update(self, state: tuple, action: int, reward: float, next_state: tuple, done: bool):
+        """
+        Atualiza a Tabela Q com SARSA(λ).
+
+        Args:
+            state (tuple): O estado de partida.
+            action (int): A ação tomada.
+            reward (float): A recompensa recebida.
+            next_state (tuple): O estado resultante.
+            done (bool): Se next_state é terminal (sem bootstrap).
+        """
+        if done:
+            td_error = reward - self.q_table[state][action]
+        else:
+            self._next_action = self._epsilon_greedy(next_state)
+            td_error = reward + self.gamma * self.q_table[next_state][self._next_action] - self.q_table[state][action]
+        self._apply(state, action, td_error, self.gamma * self.lam)
+
+class WatkinsQLambdaAgent(EligibilityTraceAgent):
+    """
+    Q(λ) de Watkins: o alvo usa o máximo do próximo estado (off-policy), e os
+    traços são cortados sempre que a próxima ação é exploratória, pois a partir
+    dela a trajetória deixa de seguir a política gulosa.
+    """
+    def update(self, state: tuple, action: int, reward: float, next_state: tuple, done: bool):
+        """
+        Atualiza a Tabela Q com Q(λ) de Watkins.
+
+        Args:
+            state (tuple): O estado de partida.
+            action (int): A ação tomada.
+            reward (float): A recompensa recebida.
+            next_state (tuple): O estado resultante.
+            done (bool): Se next_state é terminal (sem bootstrap).
+        """
+        if done:
+            self._apply(state, action, reward - self.q_table[state][action], 0.0)
+            return
+        next_values = self.q_table[next_state]
+        self._next_action = self._epsilon_greedy(next_state)
+        greedy = next_values[self._next_action] == next_values.max()
+        td_error = reward + self.gamma * next_values.max() - self.q_table[state][action]
+        self._apply(state, action, td_error, self.gamma * self.lam if greedy else 0.0)
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Este script implementa Q-Learning assíncrono sem travas (estilo Hogwild!)
+para o ambiente GridWorld.
+
+A Tabela Q fica em memória compartilhada e vários processos trabalhadores,
+cada um com o seu próprio GridWorld e a sua própria exploração
+Epsilon-Greedy, escrevem nela diretamente, sem locks. Como cada atualização
+toca uma única entrada da tabela, colisões são raras e o aprendizado segue
+convergindo, enquanto a vazão (passos/s) cresce com o número de núcleos.
+
+Para avaliar ou plotar a tabela de forma consistente, o coordenador pode
+pedir uma pausa: os trabalhadores param entre dois passos, a tabela é copiada
+e o treinamento continua.
+"""
+
+import os
+import time
+import multiprocessing as mp
+import numpy as np
+from grid_world.gridworld import GridWorld
+from grid_world.qlearning_agent import QLearningAgent
+from grid_world.shared_q_table import SharedArray
+
+# Layout do array de controle compartilhado
+_PAUSE = 0          # 1 enquanto o coordenador pede uma pausa
+_HEADER = 1         # início dos campos por trabalhador
+_RUNNING, _PARKED, _FINISHED = 0, 1, 2
+
+def _hogwild_worker(worker_id, q_name, q_shape, control_name, num_workers, grid_size, num_episodes,
+                    max_steps, alpha, gamma, epsilon, seed, report_every):
+    """Laço de um trabalhador: Q-Learning escrevendo direto na tabela compartilhada."""
+    np.random.seed(seed)
+    q_shared = SharedArray.attach(q_name, q_shape)
+    control_shared = SharedArray.attach(control_name, (_HEADER + 2 * num_workers,), dtype=np.int64)
+    control = control_shared.array
+    status_index = _HEADER + worker_id
+    steps_index = _HEADER + num_workers + worker_id
+
+    env = GridWorld(grid_size=grid_size)
+    agent = QLearningAgent(grid_size, env.num_actions, alpha=alpha, gamma=gamma, epsilon=epsilon)
+    agent.q_table = q_shared.array  # as atualizações vão direto para a memória compartilhada
+
+    total_steps = 0
+    try:
+        for _ in range(num_episodes):
+            state = env.reset()
+            for _ in range(max_steps):
+                # Ponto de parada seguro: nenhuma atualização em andamento. O laço
+                # externo confere a flag de novo depois de voltar a _RUNNING, para
+                # não agir se uma nova pausa começou nesse intervalo.
+                while control[_PAUSE]:
+                    control[steps_index] = total_steps
+                    control[status_index] = _PARKED
+                    while control[_PAUSE]:
+                        time.sleep(1e-4)
+                    control[status_index] = _RUNNING
+
+                action = agent.choose_action(state)
+                next_state, reward, done = env.step(action)
+                agent.update(state, action, reward, next_state)
+                state = next_state
+                total_steps += 1
+                if total_steps % report_every == 0:
+                    control[steps_index] = total_steps
+                if done:
+                    break
+    finally:
+        control[steps_index] = total_steps
+        control[status_index] = _FINISHED
+        agent.q_table = None
+        q_shared.close()
+        control_shared.close()
+
+class HogwildQLearning:
+    """
+    Coordena vários processos de Q-Learning que compartilham uma Tabela Q.
+
+    Uso típico:
+        with HogwildQLearning(grid_size=(50, 50), num_workers=4) as hogwild:
+            hogwild.start(episodes_per_worker=2000)
+            q_snapshot = hogwild.snapshot()   # cópia consistente durante o treino
+            stats = hogwild.join()
+
+    Atributos:
+        grid_size (tuple): Dimensões da grade de cada GridWorld.
+        num_workers (int): Número de processos trabalhadores.
+        q_table (np.array): Visão (sem cópia) da Tabela Q compartilhada.
+    """
+    def __init__(self, grid_size: tuple = (5, 5), num_workers: int = None, alpha: float = 0.1,
+                 gamma: float = 0.9, epsilon: float = 0.1, max_steps_per_episode: int = 100,
+                 seed: int = 0, report_every: int = 1000):
+        self.grid_size = grid_size
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.max_steps_per_episode = max_steps_per_episode
+        self.seed = seed
+        self.report_every = report_every
+
+        num_actions = GridWorld(grid_size=grid_size).num_actions
+        self._q = SharedArray(grid_size + (num_actions,))
+        self._control = SharedArray((_HEADER + 2 * self.num_workers,), dtype=np.int64)
+        self.q_table = self._q.array
+        self._processes = []
+        self._start_time = None
+
+    def start(self, episodes_per_worker: int):
+        """Dispara os trabalhadores, cada um com a sua semente."""
+        if self._processes:
+            raise RuntimeError("O treinamento já foi iniciado.")
+        self._control.array.fill(0)
+        seeds = np.random.SeedSequence(self.seed).generate_state(self.num_workers)
+        self._start_time = time.perf_counter()
+        for worker_id in range(self.num_workers):
+            process = mp.Process(
+                target=_hogwild_worker,
+                args=(worker_id, self._q.name, self._q.shape, self._control.name, self.num_workers,
+                      self.grid_size, episodes_per_worker, self.max_steps_per_episode, self.alpha,
+                      self.gamma, self.epsilon, int(seeds[worker_id]), self.report_every),
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+    def total_steps(self) -> int:
+        """Passos de ambiente reportados pelos trabalhadores até agora."""
+        return int(self._control.array[_HEADER + self.num_workers:].sum())
+
+    def snapshot(self) -> np.ndarray:
+        """
+        Retorna uma cópia consistente da Tabela Q: pausa todos os trabalhadores
+        entre dois passos, copia a tabela e libera o treinamento.
+        """
+        control = self._control.array
+        status = control[_HEADER:_HEADER + self.num_workers]
+        control[_PAUSE] = 1
+        try:
+            while np.any(status == _RUNNING):
+                if not any(p.is_alive() for p in self._processes):
+                    break
+                time.sleep(1e-4)
+            return self.q_table.copy()
+        finally:
+            control[_PAUSE] = 0
+
+    def join(self) -> dict:
+        """
+        Aguarda o fim de todos os trabalhadores.
+
+        Returns:
+            Um dicionário com passos totais, tempo decorrido e passos/s.
+        """
+        for process in self._processes:
+            process.join()
+        elapsed = time.perf_counter() - self._start_time
+        failed = [p.exitcode for p in self._processes if p.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"Trabalhadores terminaram com erro (códigos de saída: {failed}).")
+        steps = self.total_steps()
+        return {"total_steps": steps, "elapsed": elapsed, "steps_per_second": steps / elapsed}
+
+    def close(self):
+        """Encerra trabalhadores pendentes e libera a memória compartilhada."""
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.q_table = None
+        self._q.close()
+        self._q.unlink()
+        self._control.close()
+        self._control.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+if __name__ == "__main__":
+    # --- Configurações ---
+    GRID_SIZE = (50, 50)
+    EPISODES_PER_WORKER = 20000
+
+    # Vazão com 1 trabalhador versus todos os núcleos disponíveis
+    for num_workers in sorted({1, os.cpu_count() or 1}):
+        with HogwildQLearning(grid_size=GRID_SIZE, num_workers=num_workers) as hogwild:
+            hogwild.start(EPISODES_PER_WORKER)
+            stats = hogwild.join()
+            final_q = hogwild.snapshot()
+        print(f"{num_workers} trabalhador(es): {stats['total_steps']} passos em {stats['elapsed']:.2f}s "
+              f"({stats['steps_per_second']:.0f} passos/s)")
+
+    print("\nPolítica gulosa nas primeiras 5x5 células:")
+    print(np.argmax(final_q[:5, :5], axis=2))
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Este script implementa um Agente de Varredura Priorizada (Prioritized Sweeping)
+para o ambiente GridWorld.
+
+O agente aprende um modelo do ambiente a partir da experiência e usa esse modelo
+para planejar, concentrando as atualizações nos pares (estado, ação) cujos
+valores estão mudando mais. Assim, a informação das recompensas (as cenouras e
+o tigre) se propaga pela grade com muito menos episódios e atualizações.
+"""
+
+import heapq
+import itertools
+import numpy as np
+from grid_world.qlearning_agent import QLearningAgent
+
+class PrioritizedSweepingAgent(QLearningAgent):
+    """
+    Um agente Q-Learning com planejamento por varredura priorizada.
+
+    Além da Tabela Q, o agente mantém um modelo aprendido das transições, um
+    índice de predecessores e uma fila de prioridade (heap) com os pares
+    (estado, ação) ordenados pela magnitude do erro TD.
+
+    Atributos:
+        planning_steps (int): Número máximo de atualizações de planejamento
+                              feitas após cada passo real.
+        theta (float): Limiar mínimo de prioridade para entrar na fila.
+        model (dict): (estado, ação) -> {próximo_estado: [contagem, soma_recompensas]}.
+        model_counts (dict): (estado, ação) -> número de vezes observado.
+        predecessors (dict): estado -> conjunto de pares (estado, ação) que
+                             levaram a ele.
+    """
+    def __init__(self, grid_size: tuple, num_actions: int, alpha: float = 0.1, gamma: float = 0.9,
+                 epsilon: float = 0.1, planning_steps: int = 10, theta: float = 1e-4):
+        super().__init__(grid_size, num_actions, alpha=alpha, gamma=gamma, epsilon=epsilon)
+        self.planning_steps = planning_steps
+        self.theta = theta
+
+        # Modelo empírico: guarda contagens e somas de recompensas por sucessor,
+        # o que também funciona para transições estocásticas
+        self.model = {}
+        self.model_counts = {}
+        self.predecessors = {}
+
+        # Fila de prioridade com remoção preguiçosa: entradas obsoletas são
+        # descartadas ao sair do heap
+        self._queue = []
+        self._priorities = {}
+        self._tie_breaker = itertools.count()
+
+    def _expected_target(self, state: tuple, action: int) -> float:
+        """Calcula o alvo esperado de Bellman para (estado, ação) segundo o modelo."""
+        total = self.model_counts[(state, action)]
+        target = 0.0
+        for next_state, (count, reward_sum) in self.model[(state, action)].items():
+            target += (reward_sum + count * self.gamma * np.max(self.q_table[next_state])) / total
+        return target
+
+    def _push(self, state: tuple, action: int, priority: float):
+        """Insere (estado, ação) na fila se a prioridade superar a atual."""
+        if priority <= self.theta or priority <= self._priorities.get((state, action), 0.0):
+            return
+        self._priorities[(state, action)] = priority
+        heapq.heappush(self._queue, (-priority, next(self._tie_breaker), state, action))
+
+    def _pop(self):
+        """Retira o par de maior prioridade, ignorando entradas obsoletas."""
+        while self._queue:
+            neg_priority, _, state, action = heapq.heappop(self._queue)
+            if self._priorities.get((state, action)) == -neg_priority:
+                del self._priorities[(state, action)]
+                return state, action
+        return None
+
+    def update(self, state: tuple, action: int, reward: float, next_state: tuple):
+        """
+        Atualiza o modelo com a transição real e executa a varredura priorizada.
+
+        Args:
+            state (tuple): O estado de partida.
+            action (int): A ação tomada.
+            reward (float): A recompensa recebida.
+            next_state (tuple): O estado resultante.
+        """
+        # Atualiza o modelo aprendido e o índice de predecessores
+        successors = self.model.setdefault((state, action), {})
+        stats = successors.setdefault(next_state, [0, 0.0])
+        stats[0] += 1
+        stats[1] += reward
+        self.model_counts[(state, action)] = self.model_counts.get((state, action), 0) + 1
+        self.predecessors.setdefault(next_state, set()).add((state, action))
+
+        # A prioridade inicial é o erro TD da própria transição observada
+        td_error = reward + self.gamma * np.max(self.q_table[next_state]) - self.q_table[state][action]
+        self._push(state, action, abs(td_error))
+
+        # Planejamento: processa os pares mais "urgentes" primeiro
+        for _ in range(self.planning_steps):
+            item = self._pop()
+            if item is None:
+                break
+            s, a = item
+            self.q_table[s][a] += self.alpha * (self._expected_target(s, a) - self.q_table[s][a])
+
+            # Reinsere os predecessores cujo valor foi afetado pela mudança em s
+            for pred_state, pred_action in self.predecessors.get(s, ()):
+                priority = abs(self._expected_target(pred_state, pred_action) - self.q_table[pred_state][pred_action])
+                self._push(pred_state, pred_action, priority)
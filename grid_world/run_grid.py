@@ -10,6 +10,10 @@ as recompensas e imprime uma análise comparativa do desempenho.
 from grid_world.gridworld import GridWorld
 from grid_world.bandit_agent import BanditAgent
 from grid_world.qlearning_agent import QLearningAgent
+from grid_world.prioritized_sweeping_agent import PrioritizedSweepingAgent
+from grid_world.eligibility_trace_agents import SarsaLambdaAgent, WatkinsQLambdaAgent
+from grid_world.slippery_gridworld import SlipperyGridWorld
+from trainer import Trainer, ProgressPrinter
 import numpy as np
 
 def run_simulation(agent, environment, num_episodes=1000):
@@ -22,43 +26,21 @@ def run_simulation(agent, environment, num_episodes=1000):
         num_episodes (int): O número de episódios para treinar.
 
     Returns:
-        Uma lista com a recompensa total de cada episódio.
+        Um array com a recompensa total de cada episódio.
     """
-    total_rewards_per_episode = []
-    
-    for episode in range(num_episodes):
-        state = environment.reset()
-        total_reward = 0
-        done = False
-        
-        while not done:
-            action = agent.choose_action(state)
-            next_state, reward, done = environment.step(action)
-            
-            # A lógica de atualização difere entre os agentes
-            if isinstance(agent, QLearningAgent):
-                agent.update(state, action, reward, next_state)
-            elif isinstance(agent, BanditAgent):
-                agent.update(state, action, reward)
-            
-            state = next_state
-            total_reward += reward
-        
-        total_rewards_per_episode.append(total_reward)
-        
-        if (episode + 1) % 100 == 0:
-            print(f"Episódio {episode + 1}/{num_episodes} concluído.")
-            
-    return total_rewards_per_episode
+    # O Trainer resolve a assinatura de update (Bandit ou Q-Learning) uma única vez
+    trainer = Trainer(agent, environment, callbacks=[ProgressPrinter(every=100)])
+    return trainer.run(num_episodes).episode_returns
 
 
 if __name__ == "__main__":
     # --- Configurações da Simulação ---
     GRID_SIZE = (5, 5)
     NUM_EPISODES = 2000
+    SLIP_PROB = 0.0 # > 0 usa a dinâmica escorregadia (SlipperyGridWorld)
     
     # --- Inicialização do Ambiente e Agentes ---
-    env = GridWorld(grid_size=GRID_SIZE)
+    env = SlipperyGridWorld(grid_size=GRID_SIZE, slip_prob=SLIP_PROB) if SLIP_PROB > 0 else GridWorld(grid_size=GRID_SIZE)
     
     bandit_agent = BanditAgent(
         grid_size=GRID_SIZE, 
@@ -73,6 +55,34 @@ if __name__ == "__main__":
         gamma=0.9, 
         epsilon=0.1
     )
+
+    prioritized_sweeping_agent = PrioritizedSweepingAgent(
+        grid_size=GRID_SIZE,
+        num_actions=env.num_actions,
+        alpha=0.1,
+        gamma=0.9,
+        epsilon=0.1,
+        planning_steps=10
+    )
+
+    # Traços de elegibilidade: a recompensa recua pelo caminho inteiro a cada episódio
+    sarsa_lambda_agent = SarsaLambdaAgent(
+        grid_size=GRID_SIZE,
+        num_actions=env.num_actions,
+        alpha=0.1,
+        gamma=0.9,
+        epsilon=0.1,
+        lam=0.8
+    )
+
+    q_lambda_agent = WatkinsQLambdaAgent(
+        grid_size=GRID_SIZE,
+        num_actions=env.num_actions,
+        alpha=0.1,
+        gamma=0.9,
+        epsilon=0.1,
+        lam=0.8
+    )
     
     # --- Execução das Simulações ---
     print("--- Treinando o Agente Bandit ---")
@@ -81,14 +91,29 @@ if __name__ == "__main__":
     print("\n--- Treinando o Agente Q-Learning ---")
     q_learning_rewards = run_simulation(q_learning_agent, env, NUM_EPISODES)
 
+    print("\n--- Treinando o Agente de Varredura Priorizada ---")
+    prioritized_rewards = run_simulation(prioritized_sweeping_agent, env, NUM_EPISODES)
+
+    print("\n--- Treinando o Agente SARSA(λ) ---")
+    sarsa_lambda_rewards = run_simulation(sarsa_lambda_agent, env, NUM_EPISODES)
+
+    print("\n--- Treinando o Agente Q(λ) de Watkins ---")
+    q_lambda_rewards = run_simulation(q_lambda_agent, env, NUM_EPISODES)
+
     # --- Análise e Resultados ---
     print("\n\n--- ANÁLISE FINAL ---")
     
     avg_reward_bandit = np.mean(bandit_rewards[-100:])
     avg_reward_q_learning = np.mean(q_learning_rewards[-100:])
+    avg_reward_prioritized = np.mean(prioritized_rewards[-100:])
+    avg_reward_sarsa_lambda = np.mean(sarsa_lambda_rewards[-100:])
+    avg_reward_q_lambda = np.mean(q_lambda_rewards[-100:])
 
     print(f"\nRecompensa média (últimos 100 episódios) - Agente Bandit: {avg_reward_bandit:.2f}")
     print(f"Recompensa média (últimos 100 episódios) - Agente Q-Learning: {avg_reward_q_learning:.2f}")
+    print(f"Recompensa média (últimos 100 episódios) - Agente Varredura Priorizada: {avg_reward_prioritized:.2f}")
+    print(f"Recompensa média (últimos 100 episódios) - Agente SARSA(λ): {avg_reward_sarsa_lambda:.2f}")
+    print(f"Recompensa média (últimos 100 episódios) - Agente Q(λ) de Watkins: {avg_reward_q_lambda:.2f}")
 
     print("\nComportamento do Agente Bandit:")
     print("O Agente Bandit trata cada posição (estado) como um problema isolado. Ele pode aprender que, na posição (2,1), mover-se para a direita (para 2,2) resulta em uma recompensa imediata de -100. Ele aprenderá a evitar essa ação específica *a partir daquele estado*.")
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Este script define um array NumPy alocado em memória compartilhada
+(multiprocessing.shared_memory), usado para que vários processos leiam e
+escrevam a mesma Tabela Q sem cópias.
+"""
+
+import numpy as np
+from multiprocessing import shared_memory
+
+class SharedArray:
+    """
+    Um array NumPy cujo buffer vive em um bloco de memória compartilhada.
+
+    O processo que cria o bloco (create=True) é o dono e deve chamar unlink()
+    ao final; os demais processos apenas se conectam pelo nome e chamam close().
+
+    Atributos:
+        name (str): Nome do bloco de memória compartilhada.
+        shape (tuple): Dimensões do array.
+        dtype (np.dtype): Tipo dos elementos.
+        array (np.array): Visão NumPy sobre o bloco compartilhado.
+    """
+    def __init__(self, shape: tuple, dtype=np.float64, name: str = None, create: bool = True):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        nbytes = max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+        self._shm = shared_memory.SharedMemory(name=name, create=create, size=nbytes if create else 0)
+        self.name = self._shm.name
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+        if create:
+            self.array.fill(0)
+
+    @classmethod
+    def attach(cls, name: str, shape: tuple, dtype=np.float64) -> "SharedArray":
+        """Conecta-se a um bloco já existente, criado por outro processo."""
+        return cls(shape, dtype=dtype, name=name, create=False)
+
+    def close(self):
+        """Desconecta este processo do bloco (o array deixa de ser válido)."""
+        self.array = None
+        self._shm.close()
+
+    def unlink(self):
+        """Libera o bloco no sistema operacional (somente o dono deve chamar)."""
+        self._shm.unlink()
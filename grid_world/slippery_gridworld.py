@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Este script define uma variante estocástica ("escorregadia") do GridWorld.
+
+Com probabilidade 1 - slip_prob o agente se move na direção escolhida e, com
+slip_prob, escorrega para uma das duas direções perpendiculares. Opcionalmente,
+um vento por coluna empurra o agente uma célula para cima com certa
+probabilidade. Cada par (estado, ação) tem, portanto, uma distribuição
+categórica sobre os estados sucessores.
+
+As distribuições são pré-calculadas em tabelas alias de Walker
+(alias_sampling.py), então cada transição custa um sorteio uniforme e uma
+consulta, e step_batch move muitos agentes de uma só vez.
+"""
+
+import numpy as np
+from grid_world.gridworld import GridWorld
+from alias_sampling import AliasTable
+from gridworld_value_func_env import PERPENDICULAR
+
+class SlipperyGridWorld(GridWorld):
+    """
+    GridWorld com dinâmica estocástica, mesma interface (reset/step) e mesmas
+    recompensas e estados terminais do GridWorld determinístico.
+
+    Atributos:
+        slip_prob (float): Probabilidade de escorregar para uma direção perpendicular.
+        wind (dict): {coluna: probabilidade de ser empurrado uma célula para cima}.
+        successors (np.array): Forma (estados * ações, k); índice linear de cada sucessor possível.
+        transition_probs (np.array): Forma (estados * ações, k); probabilidade de cada sucessor.
+        table (AliasTable): Tabelas alias das linhas de transition_probs.
+    """
+    def __init__(self, grid_size=(5, 5), slip_prob: float = 0.2, wind: dict = None):
+        super().__init__(grid_size)
+        if not 0.0 <= slip_prob <= 1.0:
+            raise ValueError("slip_prob deve estar entre 0 e 1.")
+        self.slip_prob = slip_prob
+        self.wind = dict(wind) if wind else {}
+
+        # Recompensa e término de chegada em cada célula, para step_batch
+        self.reward_grid = np.full(grid_size, -0.1)
+        self.terminal_grid = np.zeros(grid_size, dtype=bool)
+        for pos, reward in self.rewards.items():
+            self.reward_grid[pos] = reward
+            self.terminal_grid[pos] = True
+
+        self.successors, self.transition_probs = self._build_transitions()
+        self.table = AliasTable(self.transition_probs)
+
+    def _move(self, pos: tuple, action: int) -> tuple:
+        """Movimento determinístico do GridWorld (parede = fica no lugar)."""
+        move = self.actions[action]
+        next_pos = (pos[0] + move[0], pos[1] + move[1])
+        if not (0 <= next_pos[0] < self.grid_size[0] and 0 <= next_pos[1] < self.grid_size[1]):
+            return pos
+        return next_pos
+
+    def _successor_distribution(self, pos: tuple, action: int) -> dict:
+        """{índice linear do sucessor: probabilidade} para o par (pos, action)."""
+        outcomes = [(action, 1.0 - self.slip_prob)]
+        outcomes += [(side, self.slip_prob / 2) for side in PERPENDICULAR[action]]
+        distribution = {}
+        for realized, p_move in outcomes:
+            if p_move == 0.0:
+                continue
+            landed = self._move(pos, realized)
+            p_wind = self.wind.get(landed[1], 0.0)
+            for final, p in ((landed, 1.0 - p_wind), (self._move(landed, 0), p_wind)):
+                if p > 0.0:
+                    index = final[0] * self.grid_size[1] + final[1]
+                    distribution[index] = distribution.get(index, 0.0) + p_move * p
+        return distribution
+
+    def _build_transitions(self):
+        """Tabelas compactas (sucessores, probabilidades) com uma linha por par (estado, ação)."""
+        rows = [self._successor_distribution((r, c), a)
+                for r in range(self.grid_size[0]) for c in range(self.grid_size[1])
+                for a in range(self.num_actions)]
+        width = max(len(row) for row in rows)
+        successors = np.zeros((len(rows), width), dtype=np.intp)
+        probs = np.zeros((len(rows), width))
+        for i, row in enumerate(rows):
+            successors[i, :len(row)] = list(row.keys())
+            probs[i, :len(row)] = list(row.values())
+        return successors, probs
+
+    def transition_row(self, rows, cols, actions):
+        """Linha das tabelas de transição de cada (estado, ação)."""
+        return (np.asarray(rows) * self.grid_size[1] + np.asarray(cols)) * self.num_actions + np.asarray(actions)
+
+    def step(self, action: int) -> tuple:
+        """
+        Executa uma ação com a dinâmica estocástica.
+
+        Returns:
+            Uma tupla contendo (próximo_estado, recompensa, terminado).
+        """
+        if action not in self.actions:
+            raise ValueError("Ação inválida.")
+        row = self.transition_row(self.current_pos[0], self.current_pos[1], action)
+        index = int(self.successors[row, self.table.sample_one(row)])
+        self.current_pos = divmod(index, self.grid_size[1])
+        reward = self.rewards.get(self.current_pos, -0.1)
+        done = self.current_pos in self.terminal_states
+        return self.current_pos, reward, done
+
+    def step_batch(self, rows, cols, actions, rng=None):
+        """
+        Move um lote de agentes independentes (não altera current_pos).
+
+        Args:
+            rows, cols, actions (np.array): Posições e ações de cada agente.
+            rng: np.random.Generator; None usa o gerador global do NumPy.
+
+        Returns:
+            (próximas_linhas, próximas_colunas, recompensas, terminados)
+        """
+        transition_rows = self.transition_row(rows, cols, actions)
+        index = self.successors[transition_rows, self.table.sample(transition_rows, rng)]
+        next_rows, next_cols = np.divmod(index, self.grid_size[1])
+        return next_rows, next_cols, self.reward_grid[next_rows, next_cols], self.terminal_grid[next_rows, next_cols]
@@ -7,14 +7,25 @@ de Funções de Valor.
 """
 
 import numpy as np
+from alias_sampling import AliasTable
+
+# Direções perpendiculares de cada ação (mesma numeração de self.actions:
+# 0: Cima, 1: Baixo, 2: Esquerda, 3: Direita), para a dinâmica escorregadia.
+# Também usado por grid_world/slippery_gridworld.py.
+PERPENDICULAR = {0: (2, 3), 1: (2, 3), 2: (0, 1), 3: (0, 1)}
 
 class GridWorldValueFuncEnv:
     """
     Representa o ambiente GridWorld do vídeo sobre Funções de Valor.
+
+    Com slip_prob > 0, a ação executada é a escolhida com probabilidade
+    1 - slip_prob e, com slip_prob, uma das duas perpendiculares. A ação
+    executada é sorteada por uma tabela alias (uma linha por ação escolhida).
     """
-    def __init__(self, grid_size=(5, 5), gamma=0.9):
+    def __init__(self, grid_size=(5, 5), gamma=0.9, slip_prob=0.0):
         self.grid_size = grid_size
         self.gamma = gamma
+        self.slip_prob = slip_prob
 
         # Posições dos estados especiais
         self.state_a_pos = (0, 1)
@@ -24,6 +35,16 @@ class GridWorldValueFuncEnv:
         
         # Mapeamento de ações: 0: Cima, 1: Baixo, 2: Esquerda, 3: Direita
         self.actions = {0: (-1, 0), 1: (1, 0), 2: (0, -1), 3: (0, 1)}
+        self._moves = np.array([self.actions[a] for a in range(len(self.actions))])
+
+        # realized_action_probs[a, b]: probabilidade de executar b ao escolher a
+        self.realized_action_probs = np.eye(len(self.actions))
+        self.slip_table = None
+        if slip_prob > 0:
+            for action, sides in PERPENDICULAR.items():
+                self.realized_action_probs[action, action] = 1.0 - slip_prob
+                self.realized_action_probs[action, list(sides)] = slip_prob / 2
+            self.slip_table = AliasTable(self.realized_action_probs)
 
     def step(self, state: tuple, action: int) -> tuple[tuple, float]:
         """
@@ -43,6 +64,10 @@ class GridWorldValueFuncEnv:
         if state == self.state_b_pos:
             return self.state_b_prime_pos, 5.0
 
+        # Na dinâmica escorregadia, a ação executada pode ser uma perpendicular
+        if self.slip_table is not None:
+            action = self.slip_table.sample_one(action)
+
         # Calcular o próximo estado
         move = self.actions[action]
         next_state = (state[0] + move[0], state[1] + move[1])
@@ -53,4 +78,46 @@ class GridWorldValueFuncEnv:
             return state, -1.0
         
         # Movimento normal, sem recompensa
-        return next_state, 0.0
\ No newline at end of file
+        return next_state, 0.0
+
+    def step_batch(self, rows: np.ndarray, cols: np.ndarray, actions: np.ndarray, rng=None) -> tuple:
+        """
+        Versão vetorizada de step para um lote de estados: as mesmas regras
+        (A -> A' com +10, B -> B' com +5, parede com -1) aplicadas com máscaras.
+
+        Args:
+            rows, cols, actions (np.array): Estados (linha, coluna) e ações do lote.
+            rng: np.random.Generator para a dinâmica escorregadia (None usa np.random).
+
+        Returns:
+            Uma tupla (próximas_linhas, próximas_colunas, recompensas).
+        """
+        actions = np.asarray(actions)
+        if self.slip_table is not None:
+            actions = self.slip_table.sample(actions, rng)
+        return self.move_batch(rows, cols, actions)
+
+    def move_batch(self, rows: np.ndarray, cols: np.ndarray, executed_actions: np.ndarray) -> tuple:
+        """Parte determinística de step_batch: aplica as ações exatamente como dadas (sem escorregão)."""
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        actions = np.asarray(executed_actions)
+
+        # Calcular o próximo estado
+        next_rows = rows + self._moves[actions, 0]
+        next_cols = cols + self._moves[actions, 1]
+        rewards = np.zeros(rows.shape)
+
+        # Checar se bateu na parede: fica no mesmo estado e recebe penalidade
+        wall = (next_rows < 0) | (next_rows >= self.grid_size[0]) | (next_cols < 0) | (next_cols >= self.grid_size[1])
+        next_rows = np.where(wall, rows, next_rows)
+        next_cols = np.where(wall, cols, next_cols)
+        rewards[wall] = -1.0
+
+        # Estados especiais: qualquer ação leva a A' (+10) ou B' (+5)
+        for special, target, reward in ((self.state_a_pos, self.state_a_prime_pos, 10.0),
+                                        (self.state_b_pos, self.state_b_prime_pos, 5.0)):
+            at_special = (rows == special[0]) & (cols == special[1])
+            next_rows[at_special], next_cols[at_special] = target
+            rewards[at_special] = reward
+        return next_rows, next_cols, rewards
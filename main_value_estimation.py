@@ -9,7 +9,8 @@ para o GridWorld do vídeo, usando uma política aleatória.
 import numpy as np
 from tqdm import tqdm
 from gridworld_value_func_env import GridWorldValueFuncEnv
-from value_function_estimator import estimate_state_value
+from value_function_estimator import (estimate_state_value, estimate_state_values_batched, estimate_state_values_adaptive,
+                                      estimate_state_values_trajectory)
 from plotting_utils import plot_value_function_grid # Supondo que a função foi adicionada
 
 if __name__ == "__main__":
@@ -21,6 +22,12 @@ if __name__ == "__main__":
     # Parâmetros da Simulação Monte Carlo
     NUM_EPISODES_PER_STATE = 1000 # Mais episódios = estimativa mais precisa
     MAX_STEPS_PER_EPISODE = 50   # Horizonte de tempo para a tarefa contínua
+    USAR_ESTIMADOR_VETORIZADO = True # Simula todos os estados iniciais de uma vez, como um único lote
+    # Modo adaptativo: cada estado para quando o erro padrão de V(s) fica abaixo do alvo
+    # (NUM_EPISODES_PER_STATE passa a ser o orçamento máximo). None = orçamento fixo
+    ERRO_PADRAO_ALVO = None
+    # Trajetórias longas: o retorno de cada passo é creditado ao estado visitado (toda visita)
+    USAR_TRAJETORIAS_LONGAS = False
 
     # --- Inicialização ---
     env = GridWorldValueFuncEnv(grid_size=GRID_SIZE, gamma=GAMMA)
@@ -35,18 +42,36 @@ if __name__ == "__main__":
     print("Estimando a Função de Valor de Estado V(s) para a política aleatória...")
 
     # --- Loop de Estimação ---
-    # Iteramos por cada estado da grade para calcular seu valor
-    for r in tqdm(range(GRID_SIZE[0])):
-        for c in range(GRID_SIZE[1]):
-            start_state = (r, c)
-            v_s = estimate_state_value(
-                env,
-                random_policy,
-                start_state,
-                NUM_EPISODES_PER_STATE,
-                MAX_STEPS_PER_EPISODE
-            )
-            state_value_function_v[start_state] = v_s
+    if USAR_TRAJETORIAS_LONGAS:
+        state_value_function_v, visit_counts = estimate_state_values_trajectory(
+            env, random_policy, num_steps=500, num_trajectories=500, horizon=MAX_STEPS_PER_EPISODE
+        )
+        print(f"Visitas creditadas: {visit_counts.sum()} (mínimo por estado: {visit_counts.min()})")
+    elif ERRO_PADRAO_ALVO is not None:
+        state_value_function_v, std_errors, episodes_used = estimate_state_values_adaptive(
+            env, random_policy, ERRO_PADRAO_ALVO, NUM_EPISODES_PER_STATE, MAX_STEPS_PER_EPISODE
+        )
+        print("Episódios usados por estado:")
+        print(episodes_used)
+        print(f"Total: {episodes_used.sum()} episódios (orçamento fixo: {NUM_EPISODES_PER_STATE * episodes_used.size}); "
+              f"maior erro padrão: {std_errors.max():.3f}")
+    elif USAR_ESTIMADOR_VETORIZADO:
+        state_value_function_v = estimate_state_values_batched(
+            env, random_policy, NUM_EPISODES_PER_STATE, MAX_STEPS_PER_EPISODE
+        )
+    else:
+        # Iteramos por cada estado da grade para calcular seu valor
+        for r in tqdm(range(GRID_SIZE[0])):
+            for c in range(GRID_SIZE[1]):
+                start_state = (r, c)
+                v_s = estimate_state_value(
+                    env,
+                    random_policy,
+                    start_state,
+                    NUM_EPISODES_PER_STATE,
+                    MAX_STEPS_PER_EPISODE
+                )
+                state_value_function_v[start_state] = v_s
     
     print("Estimação concluída.\n")
 
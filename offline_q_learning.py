@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+# offline_q_learning.py
+
+"""
+Q-Learning offline (em lote) a partir de um conjunto fixo de transições.
+
+Dado um conjunto de transições (s, a, r, s', terminado) gravado com o
+TrajectoryRecorder (ou arrays equivalentes), calcula a Tabela Q sem nunca
+chamar env.step. Há dois métodos:
+
+- "groupby": fitted Q-iteration tabular. A cada varredura, o conjunto inteiro
+  é percorrido em blocos; os alvos r + γ·max Q(s') são agrupados por par
+  (s, a) com np.bincount e o novo Q(s, a) é a média dos seus alvos. Só um
+  bloco fica na memória, então o conjunto pode ser maior que a RAM.
+- "model": uma única passada acumula o modelo empírico (contagens, somas de
+  recompensas e transições distintas (s, a) -> s'); as varreduras seguintes
+  são iteração de valor sobre esse modelo, com custo que não depende do
+  tamanho do conjunto.
+
+Os dois convergem para o mesmo ponto fixo. A saída é uma q_table no mesmo
+layout usado pelos agentes (ex.: (linhas, colunas, ações) no GridWorld).
+"""
+
+import numpy as np
+
+class OfflineQLearning:
+    """
+    Treinador Q-Learning offline tabular.
+
+    Atributos:
+        state_shape (tuple): Dimensões do espaço de estados (ex.: (5, 5) ou (2,)).
+        num_actions (int): Número de ações.
+        gamma (float): Fator de desconto.
+        method (str): "groupby" ou "model".
+        q_table (np.array): Tabela Q com forma state_shape + (num_actions,).
+        visited (np.array): True nos pares (s, a) presentes no conjunto de dados.
+        history (list): Maior variação absoluta de Q em cada varredura.
+    """
+    def __init__(self, state_shape: tuple, num_actions: int, gamma: float = 0.9, method: str = "model",
+                 tolerance: float = 1e-6, max_sweeps: int = 1000, unseen_value: float = 0.0):
+        if method not in ("groupby", "model"):
+            raise ValueError("method deve ser 'groupby' ou 'model'.")
+        self.state_shape = tuple(state_shape)
+        self.num_actions = num_actions
+        self.gamma = gamma
+        self.method = method
+        self.tolerance = tolerance
+        self.max_sweeps = max_sweeps
+        self.unseen_value = unseen_value
+        self.num_states = int(np.prod(self.state_shape))
+        self.q_table = np.full(self.state_shape + (num_actions,), unseen_value, dtype=float)
+        self.visited = np.zeros(self.state_shape + (num_actions,), dtype=bool)
+        self.history = []
+
+    def _flat_states(self, states: np.ndarray) -> np.ndarray:
+        """Índice linear dos estados (escalares ou vetores de coordenadas)."""
+        states = np.asarray(states)
+        if states.ndim == 1:
+            return states.astype(np.intp)
+        return np.ravel_multi_index(tuple(states.T.astype(np.intp)), self.state_shape)
+
+    def _chunks(self, dataset, chunk_size: int):
+        """
+        Blocos de transições como (s, a, r, s', terminado) com estados lineares.
+        Aceita um TrajectoryReader, um dicionário de arrays ou um iterável de dicionários.
+        """
+        if hasattr(dataset, "iter_chunks"):
+            chunks = dataset.iter_chunks(chunk_size)
+        elif isinstance(dataset, dict):
+            size = len(dataset["actions"])
+            chunks = ({name: values[start:start + chunk_size] for name, values in dataset.items()}
+                      for start in range(0, size, chunk_size))
+        else:
+            chunks = dataset
+        for chunk in chunks:
+            yield (self._flat_states(chunk["states"]), np.asarray(chunk["actions"], dtype=np.intp),
+                   np.asarray(chunk["rewards"], dtype=float), self._flat_states(chunk["next_states"]),
+                   np.asarray(chunk["dones"], dtype=bool))
+
+    def _state_values(self, q_flat: np.ndarray, visited_flat: np.ndarray) -> np.ndarray:
+        """max_a Q(s, a) apenas sobre as ações vistas; estados sem nenhuma ação vista valem 0."""
+        masked = np.where(visited_flat, q_flat, -np.inf)
+        values = masked.max(axis=1)
+        values[~visited_flat.any(axis=1)] = 0.0
+        return values
+
+    def fit(self, dataset, chunk_size: int = 1_000_000, on_sweep=None) -> np.ndarray:
+        """
+        Calcula Q a partir do conjunto de dados.
+
+        Args:
+            dataset: TrajectoryReader, dicionário com as colunas states, actions,
+                     rewards, next_states e dones, ou iterável de tais dicionários
+                     (no método "groupby", o iterável precisa poder ser percorrido
+                     várias vezes).
+            chunk_size (int): Transições por bloco lido.
+            on_sweep (callable): Chamado como on_sweep(varredura, variação_máxima).
+
+        Returns:
+            A q_table, com unseen_value nos pares (s, a) ausentes do conjunto.
+        """
+        fit = self._fit_groupby if self.method == "groupby" else self._fit_model
+        q_flat, visited_flat = fit(dataset, chunk_size, on_sweep)
+        self.visited = visited_flat.reshape(self.visited.shape)
+        self.q_table = np.where(visited_flat, q_flat, self.unseen_value).reshape(self.q_table.shape)
+        return self.q_table
+
+    def _sweep_until_converged(self, backup, q_flat, visited_flat, on_sweep):
+        """Aplica backup(q) até a variação máxima ficar abaixo da tolerância."""
+        self.history = []
+        for sweep in range(1, self.max_sweeps + 1):
+            new_q = backup(q_flat)
+            delta = float(np.max(np.abs(new_q - q_flat)[visited_flat], initial=0.0))
+            q_flat = new_q
+            self.history.append(delta)
+            if on_sweep is not None:
+                on_sweep(sweep, delta)
+            if delta < self.tolerance:
+                break
+        return q_flat
+
+    def _fit_groupby(self, dataset, chunk_size, on_sweep):
+        size = self.num_states * self.num_actions
+        counts = np.zeros(size)
+        for states, actions, _, _, _ in self._chunks(dataset, chunk_size):
+            counts += np.bincount(states * self.num_actions + actions, minlength=size)
+        visited_flat = (counts > 0).reshape(self.num_states, self.num_actions)
+        seen = counts > 0
+
+        def backup(q_flat):
+            values = self._state_values(q_flat, visited_flat)
+            target_sums = np.zeros(size)
+            for states, actions, rewards, next_states, dones in self._chunks(dataset, chunk_size):
+                targets = rewards + self.gamma * values[next_states] * ~dones
+                target_sums += np.bincount(states * self.num_actions + actions, weights=targets, minlength=size)
+            new_q = np.zeros(size)
+            new_q[seen] = target_sums[seen] / counts[seen]
+            return new_q.reshape(self.num_states, self.num_actions)
+
+        q_flat = np.zeros((self.num_states, self.num_actions))
+        return self._sweep_until_converged(backup, q_flat, visited_flat, on_sweep), visited_flat
+
+    def _fit_model(self, dataset, chunk_size, on_sweep):
+        size = self.num_states * self.num_actions
+        counts = np.zeros(size)
+        reward_sums = np.zeros(size)
+        # Transições não terminais distintas, chave (s, a) * num_states + s', com as suas contagens
+        keys, key_counts = np.empty(0, dtype=np.int64), np.empty(0)
+        for states, actions, rewards, next_states, dones in self._chunks(dataset, chunk_size):
+            pairs = states * self.num_actions + actions
+            counts += np.bincount(pairs, minlength=size)
+            reward_sums += np.bincount(pairs, weights=rewards, minlength=size)
+            chunk_keys, chunk_counts = np.unique(pairs[~dones].astype(np.int64) * self.num_states
+                                                 + next_states[~dones], return_counts=True)
+            keys, inverse = np.unique(np.concatenate([keys, chunk_keys]), return_inverse=True)
+            key_counts = np.bincount(inverse, weights=np.concatenate([key_counts, chunk_counts]))
+
+        seen = counts > 0
+        visited_flat = seen.reshape(self.num_states, self.num_actions)
+        mean_rewards = np.zeros(size)
+        mean_rewards[seen] = reward_sums[seen] / counts[seen]
+        pair_of_key, next_of_key = np.divmod(keys, self.num_states)
+        probabilities = key_counts / counts[pair_of_key]
+
+        def backup(q_flat):
+            values = self._state_values(q_flat, visited_flat)
+            expected_next = np.bincount(pair_of_key, weights=probabilities * values[next_of_key], minlength=size)
+            return (mean_rewards + self.gamma * expected_next).reshape(self.num_states, self.num_actions)
+
+        q_flat = np.zeros((self.num_states, self.num_actions))
+        return self._sweep_until_converged(backup, q_flat, visited_flat, on_sweep), visited_flat
+
+    def greedy_policy(self) -> np.ndarray:
+        """Ação gulosa de cada estado considerando só as ações vistas (-1 se nenhuma foi vista)."""
+        masked = np.where(self.visited, self.q_table, -np.inf)
+        policy = masked.argmax(axis=-1)
+        policy[~self.visited.any(axis=-1)] = -1
+        return policy
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    from grid_world.gridworld import GridWorld
+    from grid_world.qlearning_agent import QLearningAgent
+    from trainer import Trainer
+    from trajectory_recorder import TrajectoryRecorder, TrajectoryReader
+
+    # --- Coleta de um conjunto de dados com uma política de comportamento exploratória ---
+    GRID_SIZE = (5, 5)
+    np.random.seed(0)
+    env = GridWorld(grid_size=GRID_SIZE)
+    behavior = QLearningAgent(GRID_SIZE, env.num_actions, epsilon=0.5)
+    directory = os.path.join(tempfile.mkdtemp(), "gridworld")
+    with TrajectoryRecorder(directory, state_shape=(2,)) as recorder:
+        Trainer(behavior, env, max_steps_per_episode=100, recorder=recorder).run(2000)
+    dataset = TrajectoryReader(directory)
+    print(f"Conjunto de dados: {dataset.num_steps} transições em {dataset.num_episodes} episódios.")
+
+    # --- Treino offline pelos dois métodos ---
+    for method in ("groupby", "model"):
+        learner = OfflineQLearning(GRID_SIZE, env.num_actions, gamma=0.9, method=method)
+        learner.fit(dataset, chunk_size=10_000)
+        print(f"\nMétodo '{method}': {len(learner.history)} varreduras, variação final {learner.history[-1]:.2e}")
+        print("Política gulosa (-1 = estado sem dados):")
+        print(learner.greedy_policy())
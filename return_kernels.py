@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# return_kernels.py
+
+"""
+Kernels vetorizados para retornos descontados.
+
+- discounted_return / batch_discounted_returns: retorno escalar de uma ou de
+  muitas sequências de recompensas (preenchidas com zeros), como um produto
+  pela potência de γ pré-calculada.
+- discounted_returns: G_t para todo t de uma trajetória longa, com as
+  fronteiras dos episódios dadas por uma máscara `dones`.
+- n_step_returns e lambda_returns: as variantes com bootstrap.
+
+Todos se apoiam em linear_scan, que resolve a recorrência
+G_t = r_t + d_t * G_{t+1} de trás para frente. Em vez de um laço Python por
+passo, a trajetória é dividida em blocos: o laço percorre só as posições
+dentro de um bloco (vetorizado sobre todos os blocos) e a ligação entre os
+blocos é a mesma recorrência, resolvida recursivamente. Não há divisões por
+potências de γ, então o resultado é exato mesmo em trajetórias longas.
+"""
+
+import numpy as np
+
+def discount_powers(gamma: float, length: int) -> np.ndarray:
+    """Vetor [1, γ, γ², ..., γ^(length-1)]."""
+    return gamma ** np.arange(length)
+
+def discounted_return(rewards, gamma: float) -> float:
+    """Retorno descontado Σ γ^k r_k de uma sequência de recompensas."""
+    rewards = np.asarray(rewards, dtype=float)
+    return float(rewards @ discount_powers(gamma, len(rewards)))
+
+def batch_discounted_returns(rewards: np.ndarray, gamma: float, lengths: np.ndarray = None) -> np.ndarray:
+    """
+    Retorno descontado de cada linha de uma matriz (episódios, passos).
+
+    Args:
+        rewards (np.array): Recompensas preenchidas até o maior episódio.
+        lengths (np.array): Tamanho de cada episódio; se dado, as posições além
+                            dele são ignoradas mesmo que o preenchimento não seja zero.
+    """
+    rewards = np.asarray(rewards, dtype=float)
+    powers = discount_powers(gamma, rewards.shape[1])
+    if lengths is not None:
+        rewards = np.where(np.arange(rewards.shape[1]) < np.asarray(lengths)[:, None], rewards, 0.0)
+    return rewards @ powers
+
+def linear_scan(rewards: np.ndarray, discounts: np.ndarray, block_size: int = None) -> np.ndarray:
+    """
+    Resolve G_t = rewards[t] + discounts[t] * G_{t+1}, com G após o último passo igual a 0.
+
+    Args:
+        rewards (np.array): Termo independente de cada passo.
+        discounts (np.array): Fator que multiplica o retorno do passo seguinte
+                              (0 onde o episódio termina).
+        block_size (int): Tamanho dos blocos (padrão: ~raiz quadrada do tamanho).
+    """
+    rewards = np.asarray(rewards, dtype=float)
+    discounts = np.broadcast_to(np.asarray(discounts, dtype=float), rewards.shape)
+    n = len(rewards)
+    block = block_size or max(32, int(np.sqrt(n)))
+    if n <= block:
+        returns = np.empty(n)
+        g = 0.0
+        for t in range(n - 1, -1, -1):
+            g = rewards[t] + discounts[t] * g
+            returns[t] = g
+        return returns
+
+    # Preenche até um múltiplo do bloco; os passos extras têm recompensa e desconto zero
+    num_blocks = -(-n // block)
+    padded_r = np.zeros(num_blocks * block)
+    padded_d = np.zeros(num_blocks * block)
+    padded_r[:n], padded_d[:n] = rewards, discounts
+    r_blocks = padded_r.reshape(num_blocks, block)
+    d_blocks = padded_d.reshape(num_blocks, block)
+
+    # Dentro de cada bloco: retorno local (sem o que vem depois do bloco) e o fator
+    # que liga cada posição ao início do bloco seguinte
+    local = np.empty_like(r_blocks)
+    carry = np.empty_like(r_blocks)
+    g = np.zeros(num_blocks)
+    c = np.ones(num_blocks)
+    for j in range(block - 1, -1, -1):
+        g = r_blocks[:, j] + d_blocks[:, j] * g
+        c = d_blocks[:, j] * c
+        local[:, j] = g
+        carry[:, j] = c
+
+    # O retorno verdadeiro no início de cada bloco obedece à mesma recorrência
+    block_starts = linear_scan(local[:, 0], carry[:, 0], block_size)
+    next_starts = np.append(block_starts[1:], 0.0)
+    return (local + carry * next_starts[:, None]).reshape(-1)[:n]
+
+def discounted_returns(rewards, gamma: float, dones=None) -> np.ndarray:
+    """
+    G_t para todo t de uma trajetória. dones[t] = True indica que o episódio
+    termina no passo t: o retorno não atravessa essa fronteira.
+    """
+    rewards = np.asarray(rewards, dtype=float)
+    if dones is None:
+        return linear_scan(rewards, gamma)
+    return linear_scan(rewards, gamma * ~np.asarray(dones, dtype=bool))
+
+def _episode_ends(dones: np.ndarray, n: int) -> np.ndarray:
+    """Índice do último passo do episódio de cada passo (n - 1 se a trajetória acaba antes)."""
+    ends = np.where(dones, np.arange(n), n - 1)
+    return np.minimum.accumulate(ends[::-1])[::-1]
+
+def n_step_returns(rewards, next_values, gamma: float, n: int, dones=None) -> np.ndarray:
+    """
+    Retornos de n passos: G_t^(n) = Σ_{k<m} γ^k r_{t+k} + γ^m V(s_{t+m}), com
+    m = n truncado no fim do episódio (onde não há bootstrap) ou da trajetória.
+
+    Args:
+        next_values (np.array): V(s_{t+1}) de cada passo t.
+    """
+    rewards = np.asarray(rewards, dtype=float)
+    next_values = np.asarray(next_values, dtype=float)
+    size = len(rewards)
+    dones = np.zeros(size, dtype=bool) if dones is None else np.asarray(dones, dtype=bool)
+    full = discounted_returns(rewards, gamma, dones)
+
+    steps = np.arange(size)
+    last = np.minimum(steps + n - 1, _episode_ends(dones, size))
+    m = last - steps + 1
+    gamma_m = gamma ** m
+    # Soma parcial das m recompensas = G_t - γ^m G_{t+m} (zero se o episódio terminou em last)
+    after = np.append(full, 0.0)[last + 1]
+    partial = full - np.where(dones[last], 0.0, gamma_m * after)
+    return partial + np.where(dones[last], 0.0, gamma_m * next_values[last])
+
+def lambda_returns(rewards, next_values, gamma: float, lam: float, dones=None) -> np.ndarray:
+    """
+    Retornos λ: G_t^λ = r_t + γ[(1 - λ) V(s_{t+1}) + λ G_{t+1}^λ], sem bootstrap
+    após o fim de um episódio e com G^λ = V no fim de uma trajetória truncada.
+
+    Args:
+        next_values (np.array): V(s_{t+1}) de cada passo t.
+    """
+    rewards = np.asarray(rewards, dtype=float)
+    next_values = np.asarray(next_values, dtype=float)
+    continues = np.ones(len(rewards)) if dones is None else ~np.asarray(dones, dtype=bool)
+    mixed = rewards + gamma * (1.0 - lam) * continues * next_values
+    discounts = gamma * lam * continues
+    if len(rewards):
+        # Trajetória truncada: o último passo faz bootstrap completo em V(s_T)
+        mixed[-1] += discounts[-1] * next_values[-1]
+        discounts[-1] = 0.0
+    return linear_scan(mixed, discounts)
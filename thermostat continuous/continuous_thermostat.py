@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# continuous_thermostat.py
+
+"""
+Termostato com estado realmente contínuo (temperatura interna e hora do
+dia) e um agente Q-Learning linear sobre tile coding (tile_coding.py).
+
+Uma tabela densa seria impossível; aqui Q(s, a) é a soma dos pesos das
+num_tilings células ativas de s, e cada atualização toca apenas essas
+células. O custo por passo depende do número de grades, não do tamanho do
+espaço de estados.
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+from tile_coding import HashedTileCoder
+
+# --------------------------------------------------
+# Ambiente contínuo (Termostato)
+# --------------------------------------------------
+class ContinuousThermostatEnv:
+    """
+    Termostato com dinâmica térmica simples.
+
+    Estado:
+        [temperatura interna (°C), hora do dia em [0, 24)]
+
+    Ações:
+        0 = aquecedor off
+        1 = aquecedor on
+
+    Dinâmica (por intervalo de dt horas):
+        a temperatura interna tende à externa (senoide diária com máximo às
+        15h) com taxa `insulation`, o aquecedor soma `heater_power` °C/h e há
+        ruído gaussiano.
+
+    Recompensas:
+        -|temperatura - alvo| * dt nas horas ocupadas e -energy_cost * dt
+        quando o aquecedor está ligado
+    """
+    def __init__(self, target=21.0, outside_mean=10.0, outside_amplitude=5.0, heater_power=2.5,
+                 insulation=0.1, dt=0.25, noise_std=0.1, energy_cost=0.5, occupied_hours=(7, 23), seed=None):
+        self.target = target
+        self.outside_mean = outside_mean
+        self.outside_amplitude = outside_amplitude
+        self.heater_power = heater_power
+        self.insulation = insulation
+        self.dt = dt
+        self.noise_std = noise_std
+        self.energy_cost = energy_cost
+        self.occupied_hours = occupied_hours
+        self.rng = np.random.default_rng(seed)
+        self.temperature = outside_mean
+        self.hour = 0.0
+
+    def outside_temperature(self, hour):
+        return self.outside_mean + self.outside_amplitude * np.sin(2 * np.pi * (hour - 9.0) / 24.0)
+
+    def reset(self):
+        """Começa à meia-noite com a casa na temperatura média externa"""
+        self.temperature = self.outside_mean
+        self.hour = 0.0
+        return np.array([self.temperature, self.hour])
+
+    def step(self, action):
+        """
+        Executa uma ação no ambiente.
+
+        Args:
+            action (int): 0 = off, 1 = on
+
+        Returns:
+            state (np.array): [temperatura, hora]
+            reward (float): recompensa obtida
+            done (bool): flag de término (sempre False, ambiente contínuo)
+            info (dict): informações adicionais (vazio)
+        """
+        drift = self.insulation * (self.outside_temperature(self.hour) - self.temperature)
+        self.temperature += self.dt * (drift + action * self.heater_power) \
+            + self.noise_std * np.sqrt(self.dt) * self.rng.standard_normal()
+        self.hour = (self.hour + self.dt) % 24.0
+
+        start, end = self.occupied_hours
+        discomfort = abs(self.temperature - self.target) if start <= self.hour < end else 0.0
+        reward = -self.dt * (discomfort + self.energy_cost * action)
+        return np.array([self.temperature, self.hour]), reward, False, {}
+
+# --------------------------------------------------
+# Agente Q-Learning linear com tile coding
+# --------------------------------------------------
+class TileCodingQAgent:
+    def __init__(self, coder, n_actions, alpha=0.1, gamma=0.99, epsilon=0.1, seed=None):
+        """
+        Args:
+            coder (HashedTileCoder): codificador dos estados
+            n_actions (int): número de ações possíveis
+            alpha (float): taxa de aprendizado (dividida entre as grades)
+            gamma (float): fator de desconto
+            epsilon (float): taxa de exploração
+        """
+        self.coder = coder
+        self.w = np.zeros((coder.memory_size, n_actions))  # um peso por (célula, ação)
+        self.alpha = alpha / coder.num_tilings
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.n_actions = n_actions
+        self.rng = np.random.default_rng(seed)
+
+    def q_values(self, tiles):
+        """Q(s, ·) a partir dos índices ativos de s"""
+        return self.w[tiles].sum(axis=0)
+
+    def choose_action(self, tiles):
+        """Escolhe uma ação usando política ε-greedy"""
+        if self.rng.random() < self.epsilon:
+            return int(self.rng.integers(self.n_actions))  # explora
+        return int(np.argmax(self.q_values(tiles)))  # explora conhecimento
+
+    def learn(self, tiles, a, r, tiles_):
+        """Atualização Q-Learning que toca apenas as células ativas de s"""
+        predict = self.w[tiles, a].sum()
+        target = r + self.gamma * self.q_values(tiles_).max()
+        # add.at soma corretamente mesmo se duas grades colidirem no mesmo índice
+        np.add.at(self.w[:, a], tiles, self.alpha * (target - predict))
+
+def run_continuous_experiment(env, agent, steps):
+    """
+    Treina o agente na tarefa contínua.
+
+    Returns:
+        rewards (np.array): recompensa de cada passo
+    """
+    rewards = np.zeros(steps)
+    coder = agent.coder
+    tiles = coder.active_tiles(env.reset())
+    for t in range(steps):
+        a = agent.choose_action(tiles)
+        s_, r, _, _ = env.step(a)
+        tiles_ = coder.active_tiles(s_)
+        agent.learn(tiles, a, r, tiles_)
+        tiles = tiles_
+        rewards[t] = r
+    return rewards
+
+def run_fixed_policy(env, policy, steps):
+    """Recompensas de uma política fixa policy(estado) -> ação, para comparação"""
+    rewards = np.zeros(steps)
+    s = env.reset()
+    for t in range(steps):
+        s, rewards[t], _, _ = env.step(policy(s))
+    return rewards
+
+if __name__ == "__main__":
+    # --------------------------------------------------
+    # Treinamento
+    # --------------------------------------------------
+    steps_per_day = 96  # dt = 15 minutos
+    days = 1000
+    steps = steps_per_day * days
+    env = ContinuousThermostatEnv(seed=0)
+    coder = HashedTileCoder(low=[5.0, 0.0], high=[35.0, 24.0], tiles_per_dim=[12, 12], num_tilings=8,
+                            memory_size=4096, wrap=[False, True])
+    agent = TileCodingQAgent(coder, n_actions=2, alpha=0.1, gamma=0.95, epsilon=0.05, seed=0)
+    rewards = run_continuous_experiment(env, agent, steps)
+
+    # Referências: sempre desligado e liga/desliga simples em torno do alvo
+    baselines = {
+        "sempre off": run_fixed_policy(ContinuousThermostatEnv(seed=1), lambda s: 0, steps),
+        "liga abaixo do alvo": run_fixed_policy(ContinuousThermostatEnv(seed=1), lambda s: int(s[0] < env.target), steps),
+    }
+    print(f"Recompensa média por dia nos últimos 100 dias: {rewards[-100 * steps_per_day:].sum() / 100:.2f}")
+    for name, baseline in baselines.items():
+        print(f"  {name}: {baseline.sum() / days:.2f}")
+
+    # --------------------------------------------------
+    # Plot dos resultados
+    # --------------------------------------------------
+    daily = rewards.reshape(days, steps_per_day).sum(axis=1)
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    axes[0].plot(np.convolve(daily, np.ones(20) / 20, mode="valid"), label="tile coding")
+    for name, baseline in baselines.items():
+        axes[0].axhline(baseline.sum() / days, linestyle="--", color="gray")
+        axes[0].annotate(name, (0, baseline.sum() / days), fontsize=9)
+    axes[0].set_title("Recompensa por dia (média móvel de 20 dias)")
+    axes[0].set_xlabel("Dias")
+    axes[0].legend()
+
+    # Política gulosa aprendida sobre a grade temperatura x hora
+    temperatures = np.linspace(5, 35, 121)
+    hours = np.linspace(0, 24, 97)[:-1]
+    grid = np.stack(np.meshgrid(temperatures, hours, indexing="ij"), axis=-1).reshape(-1, 2)
+    q = agent.w[coder.active_tiles_batch(grid)].sum(axis=1)
+    policy = (q[:, 1] > q[:, 0]).reshape(len(temperatures), len(hours))
+    axes[1].imshow(policy, origin="lower", aspect="auto", extent=[0, 24, 5, 35], cmap="coolwarm")
+    axes[1].axhline(env.target, color="black", linestyle="--")
+    axes[1].set_title("Política aprendida (vermelho = aquecedor on)")
+    axes[1].set_xlabel("Hora do dia")
+    axes[1].set_ylabel("Temperatura (°C)")
+    for ax in axes:
+        ax.grid(True)
+    plt.tight_layout()
+    plt.show()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# hyperparameter_sweep.py
+
+"""
+Treina muitas configurações (γ, α, ε) do Q-Learning no termostato em uma
+única passada vetorizada.
+
+Em vez de um QLearningAgent por configuração, as C Tabelas Q 2x2 formam um
+tensor (C, 2, 2) e os hiperparâmetros são vetores de tamanho C. A cada passo,
+as C cópias do ambiente avançam juntas e todas as tabelas são atualizadas em
+uma única expressão, então varrer centenas de fatores de desconto custa
+quase o mesmo que treinar um.
+"""
+
+import numpy as np
+
+class VectorThermostatEnv:
+    """
+    C cópias independentes do ThermostatEnv (mesmas regras: com probabilidade
+    p_noise alguém reclama, o estado vira 1 e a recompensa é -1).
+    """
+    def __init__(self, num_envs, p_noise=0.2):
+        self.num_envs = num_envs
+        self.p = np.broadcast_to(np.asarray(p_noise, dtype=float), (num_envs,))
+        self.states = np.zeros(num_envs, dtype=np.int64)
+
+    def reset(self):
+        """Reseta todas as cópias para o estado confortável"""
+        self.states = np.zeros(self.num_envs, dtype=np.int64)
+        return self.states.copy()
+
+    def step(self, actions, noise):
+        """
+        Avança todas as cópias um passo.
+
+        Args:
+            actions (np.array): ação de cada cópia (o ruído não depende dela)
+            noise (np.array): números uniformes em [0, 1), um por cópia
+
+        Returns:
+            states (np.array): novos estados
+            rewards (np.array): recompensas
+        """
+        self.states = (noise < self.p).astype(np.int64)
+        return self.states.copy(), -self.states.astype(float)
+
+class QLearningSweep:
+    """
+    C agentes Q-Learning (as mesmas regras do QLearningAgent) treinados juntos.
+
+    Atributos:
+        Q (np.array): tensor (C, n_states, n_actions)
+        gammas, alphas, epsilons (np.array): hiperparâmetros de cada configuração
+    """
+    def __init__(self, gammas, alphas=0.1, epsilons=0.1, n_states=2, n_actions=2, seed=None):
+        gammas, alphas, epsilons = np.broadcast_arrays(np.asarray(gammas, dtype=float),
+                                                       np.asarray(alphas, dtype=float),
+                                                       np.asarray(epsilons, dtype=float))
+        self.gammas, self.alphas, self.epsilons = (x.ravel().copy() for x in (gammas, alphas, epsilons))
+        self.num_configs = len(self.gammas)
+        self.n_actions = n_actions
+        self.Q = np.zeros((self.num_configs, n_states, n_actions))
+        self.rng = np.random.default_rng(seed)
+
+    def run(self, env, steps, record_every=1, block_size=1000):
+        """
+        Treina todas as configurações por `steps` passos da tarefa contínua.
+
+        Args:
+            env (VectorThermostatEnv): ambiente com uma cópia por configuração
+            steps (int): número de passos
+            record_every (int): intervalo entre os pontos da curva de recompensa média
+            block_size (int): passos cujos números aleatórios são sorteados de uma vez
+
+        Returns:
+            recorded_steps (np.array): passos (a partir de 1) de cada ponto
+            avg_rewards (np.array): (pontos, C) recompensa média acumulada, como em run_experiment
+        """
+        if env.num_envs != self.num_configs:
+            raise ValueError("O ambiente deve ter uma cópia por configuração.")
+        C = self.num_configs
+        rows = np.arange(C)
+        Q, gammas, alphas = self.Q, self.gammas, self.alphas
+        recorded_steps = np.arange(record_every, steps + 1, record_every)
+        avg_rewards = np.empty((len(recorded_steps), C))
+        total_reward = np.zeros(C)
+        s = env.reset()
+        point = 0
+
+        for block_start in range(0, steps, block_size):
+            n = min(block_size, steps - block_start)
+            explore = self.rng.random((n, C)) < self.epsilons
+            random_actions = self.rng.integers(self.n_actions, size=(n, C))
+            noise = self.rng.random((n, C))
+            for i in range(n):
+                a = np.where(explore[i], random_actions[i], Q[rows, s].argmax(axis=1))
+                s_, r = env.step(a, noise[i])
+                # Uma única atualização Q-Learning para as C tabelas
+                Q[rows, s, a] += alphas * (r + gammas * Q[rows, s_].max(axis=1) - Q[rows, s, a])
+                s = s_
+                total_reward += r
+                if (block_start + i + 1) % record_every == 0:
+                    avg_rewards[point] = total_reward / (block_start + i + 1)
+                    point += 1
+        return recorded_steps, avg_rewards
+
+    def greedy_actions(self):
+        """(C, n_states) ação gulosa de cada configuração em cada estado"""
+        return self.Q.argmax(axis=2)
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    # --------------------------------------------------
+    # Varredura de 200 fatores de desconto em uma passada
+    # --------------------------------------------------
+    gammas = np.linspace(0.0, 0.99, 200)
+    steps = 5000
+    sweep = QLearningSweep(gammas, alphas=0.1, epsilons=0.1, seed=0)
+    env = VectorThermostatEnv(len(gammas), p_noise=0.2)
+    _, avg_rewards = sweep.run(env, steps, record_every=steps)
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    axes[0].plot(gammas, avg_rewards[-1])
+    axes[0].set_title(f"Recompensa média após {steps} passos")
+    axes[0].set_xlabel("γ")
+    axes[0].set_ylabel("Recompensa média")
+    for s, name in enumerate(["confortável", "desconfortável"]):
+        for a, action in enumerate(["off", "on"]):
+            axes[1].plot(gammas, sweep.Q[:, s, a], label=f"Q({name}, {action})")
+    axes[1].set_title("Tabela Q final por γ")
+    axes[1].set_xlabel("γ")
+    axes[1].legend()
+    for ax in axes:
+        ax.grid(True)
+    plt.tight_layout()
+    plt.show()
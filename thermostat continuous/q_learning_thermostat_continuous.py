@@ -1,3 +1,5 @@
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -53,6 +55,27 @@ class ThermostatEnv:
         done = False  # tarefa contínua
         return self.state, reward, done, {}
 
+    def sample_block(self, num_steps, rng=None):
+        """
+        Sorteia de uma vez os próximos num_steps passos.
+
+        Como o ruído não depende da ação, a sequência de estados e
+        recompensas pode ser gerada em bloco, antes de o agente agir.
+
+        Args:
+            num_steps (int): número de passos
+            rng (np.random.Generator): gerador; None usa np.random
+
+        Returns:
+            states (np.array): estado após cada passo
+            rewards (np.array): recompensa de cada passo
+        """
+        rng = np.random if rng is None else rng
+        states = (rng.random(num_steps) < self.p).astype(np.int64)
+        if num_steps > 0:
+            self.state = int(states[-1])
+        return states, -states.astype(float)
+
 # --------------------------------------------------
 # Agente Q-Learning
 # --------------------------------------------------
@@ -114,26 +137,50 @@ def run_experiment(gamma, env, episodes=5000):
         avg_rewards.append(total_reward / (ep+1))
     return avg_rewards
 
-# --------------------------------------------------
-# Executar experimentos
-# --------------------------------------------------
-env = ThermostatEnv(p_noise=0.2)
-episodes = 5000
-gammas = [0.3, 0.99]  # comparação de fator de desconto
-results = {}
-
-for g in gammas:
-    results[g] = run_experiment(g, env, episodes)
-
-# --------------------------------------------------
-# Plot dos resultados
-# --------------------------------------------------
-plt.figure(figsize=(10,5))
-for g in gammas:
-    plt.plot(results[g], label=f"γ = {g}")
-plt.title("Aprendizado Q-Learning no Termostato (tarefa contínua)")
-plt.xlabel("Episódios")
-plt.ylabel("Recompensa média")
-plt.legend()
-plt.grid(True)
-plt.show()
+if __name__ == "__main__":
+    # --------------------------------------------------
+    # Executar experimentos
+    # --------------------------------------------------
+    env = ThermostatEnv(p_noise=0.2)
+    episodes = 5000
+    gammas = [0.3, 0.99]  # comparação de fator de desconto
+    results = {}
+
+    # Modo streaming: horizonte longo com memória constante e checkpoints (streaming_trainer.py)
+    MODO_STREAMING = False
+    PASSOS_STREAMING = 10**7
+    # Modo vetorizado: todos os γ treinados juntos em um tensor Q (hyperparameter_sweep.py)
+    MODO_VETORIZADO = False
+
+    if MODO_STREAMING:
+        # streaming_trainer usa return_kernels.py, na raiz do repositório
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from streaming_trainer import StreamingTrainer
+        for g in gammas:
+            agent = QLearningAgent(n_states=2, n_actions=2, gamma=g, alpha=0.1, epsilon=0.1)
+            trainer = StreamingTrainer(agent, env, checkpoint_path=f"checkpoint_gamma_{g}.npz",
+                                       checkpoint_every=10**6)
+            log = trainer.run(PASSOS_STREAMING)
+            results[g] = (log.steps, log.averages)
+    elif MODO_VETORIZADO:
+        from hyperparameter_sweep import QLearningSweep, VectorThermostatEnv
+        sweep = QLearningSweep(gammas, alphas=0.1, epsilons=0.1)
+        steps, avg_rewards = sweep.run(VectorThermostatEnv(len(gammas), p_noise=0.2), episodes)
+        for c, g in enumerate(gammas):
+            results[g] = (steps, avg_rewards[:, c])
+    else:
+        for g in gammas:
+            results[g] = (np.arange(1, episodes + 1), run_experiment(g, env, episodes))
+
+    # --------------------------------------------------
+    # Plot dos resultados
+    # --------------------------------------------------
+    plt.figure(figsize=(10,5))
+    for g in gammas:
+        plt.plot(*results[g], label=f"γ = {g}")
+    plt.title("Aprendizado Q-Learning no Termostato (tarefa contínua)")
+    plt.xlabel("Episódios")
+    plt.ylabel("Recompensa média")
+    plt.legend()
+    plt.grid(True)
+    plt.show()
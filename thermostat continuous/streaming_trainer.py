@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+# streaming_trainer.py
+
+"""
+Treinamento de horizonte arbitrário da tarefa contínua do termostato com
+memória constante.
+
+run_experiment guarda a recompensa média de todos os passos em uma lista,
+o que inviabiliza execuções de 10⁹ passos. Aqui a tarefa avança em blocos de
+chunk_size passos:
+
+- a aleatoriedade de cada bloco (ruído do ambiente, sorteios de exploração e
+  ações aleatórias) é gerada de uma vez com um np.random.Generator;
+- só estatísticas resumidas das recompensas são guardadas, em um buffer de
+  tamanho fixo (RewardLog) que dobra o intervalo entre os pontos quando enche;
+- a Tabela Q (e todo o estado necessário para continuar) é salva em um
+  checkpoint a cada checkpoint_every passos.
+
+Usa return_kernels.py, na raiz do repositório: o script que importa este
+módulo deve pôr a raiz no sys.path (como faz q_learning_thermostat_continuous.py).
+"""
+
+import json
+import os
+import numpy as np
+from return_kernels import linear_scan
+
+class RewardLog:
+    """
+    Recompensa média acumulada e média móvel exponencial (EWMA) das
+    recompensas, amostradas a cada `decimation` passos em um buffer de no
+    máximo `capacity` pontos. Quando o buffer enche, metade dos pontos é
+    descartada e o intervalo dobra, então a curva cobre sempre toda a execução.
+
+    Atributos:
+        steps (np.array): Passo de cada ponto guardado.
+        averages (np.array): Recompensa média acumulada (a curva de run_experiment).
+        ewmas (np.array): EWMA das recompensas em cada ponto.
+        total_steps (int): Passos observados.
+        total_reward (float): Soma de todas as recompensas.
+        ewma (float): EWMA corrente (começa em 0).
+    """
+    def __init__(self, capacity: int = 2000, ewma_alpha: float = 1e-3):
+        if capacity < 2:
+            raise ValueError("capacity deve ser pelo menos 2.")
+        self.capacity = capacity
+        self.ewma_alpha = ewma_alpha
+        self.decimation = 1
+        self.size = 0
+        self._steps = np.zeros(capacity, dtype=np.int64)
+        self._averages = np.zeros(capacity)
+        self._ewmas = np.zeros(capacity)
+        self.total_steps = 0
+        self.total_reward = 0.0
+        self.ewma = 0.0
+
+    @property
+    def steps(self) -> np.ndarray:
+        return self._steps[:self.size]
+
+    @property
+    def averages(self) -> np.ndarray:
+        return self._averages[:self.size]
+
+    @property
+    def ewmas(self) -> np.ndarray:
+        return self._ewmas[:self.size]
+
+    def _ewma_path(self, rewards: np.ndarray) -> np.ndarray:
+        """EWMA após cada recompensa do bloco: e_t = a r_t + (1 - a) e_{t-1}."""
+        a = self.ewma_alpha
+        # A recorrência é a do retorno descontado com o tempo invertido
+        reversed_terms = a * rewards[::-1]
+        reversed_terms[-1] += (1.0 - a) * self.ewma
+        return linear_scan(reversed_terms, 1.0 - a)[::-1]
+
+    def _compact(self):
+        """Mantém só os pontos múltiplos do dobro do intervalo atual."""
+        self.decimation *= 2
+        keep = self.steps % self.decimation == 0
+        kept = int(keep.sum())
+        for column in (self._steps, self._averages, self._ewmas):
+            column[:kept] = column[:self.size][keep]
+        self.size = kept
+
+    def extend(self, rewards: np.ndarray):
+        """Incorpora as recompensas de um bloco de passos consecutivos."""
+        rewards = np.asarray(rewards, dtype=float)
+        n = len(rewards)
+        if n == 0:
+            return
+        ewma = self._ewma_path(rewards)
+        cumulative = self.total_reward + np.cumsum(rewards)
+        while True:
+            # Posições do bloco cujo número de passo (a partir de 1) é múltiplo do intervalo
+            first = self.decimation - 1 - self.total_steps % self.decimation
+            positions = np.arange(first, n, self.decimation)
+            if self.size + len(positions) <= self.capacity:
+                break
+            self._compact()
+        end = self.size + len(positions)
+        step_numbers = self.total_steps + 1 + positions
+        self._steps[self.size:end] = step_numbers
+        self._averages[self.size:end] = cumulative[positions] / step_numbers
+        self._ewmas[self.size:end] = ewma[positions]
+        self.size = end
+        self.total_steps += n
+        self.total_reward = float(cumulative[-1])
+        self.ewma = float(ewma[-1])
+
+    def state_dict(self) -> dict:
+        return {"log_steps": self.steps, "log_averages": self.averages, "log_ewmas": self.ewmas,
+                "log_scalars": np.array([self.decimation, self.total_steps]),
+                "log_floats": np.array([self.total_reward, self.ewma, self.ewma_alpha])}
+
+    def load_state_dict(self, data):
+        self.size = len(data["log_steps"])
+        if self.size > self.capacity:
+            raise ValueError(f"O checkpoint tem {self.size} pontos; a capacidade é {self.capacity}.")
+        self._steps[:self.size] = data["log_steps"]
+        self._averages[:self.size] = data["log_averages"]
+        self._ewmas[:self.size] = data["log_ewmas"]
+        self.decimation, self.total_steps = (int(x) for x in data["log_scalars"])
+        self.total_reward, self.ewma, self.ewma_alpha = (float(x) for x in data["log_floats"])
+
+class StreamingTrainer:
+    """
+    Treina um QLearningAgent no ThermostatEnv por um número arbitrário de
+    passos, com as mesmas regras de choose_action e learn, em blocos de
+    chunk_size passos.
+
+    Atributos:
+        agent (QLearningAgent): Agente treinado (agent.Q é atualizada ao fim de cada bloco).
+        env (ThermostatEnv): Ambiente; precisa de sample_block.
+        log (RewardLog): Estatísticas das recompensas.
+        steps (int): Passos já executados.
+        checkpoint_path (str | None): Arquivo .npz do checkpoint.
+        checkpoint_every (int | None): Intervalo, em passos, entre checkpoints
+                                       (arredondado para blocos inteiros).
+    """
+    def __init__(self, agent, env, chunk_size: int = 100_000, log_capacity: int = 2000, ewma_alpha: float = 1e-3,
+                 checkpoint_path: str = None, checkpoint_every: int = None, seed: int = None):
+        if checkpoint_every is not None and checkpoint_path is None:
+            raise ValueError("checkpoint_every exige checkpoint_path.")
+        self.agent = agent
+        self.env = env
+        self.chunk_size = chunk_size
+        self.log = RewardLog(log_capacity, ewma_alpha)
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.rng = np.random.default_rng(seed)
+        self.steps = 0
+        self.state = env.reset()
+        self._next_checkpoint = checkpoint_every
+
+    def _train_chunk(self, num_steps: int) -> np.ndarray:
+        """Executa num_steps passos com a aleatoriedade sorteada em bloco; devolve as recompensas."""
+        agent, rng = self.agent, self.rng
+        next_states, rewards = self.env.sample_block(num_steps, rng)
+        explore = (rng.random(num_steps) < agent.epsilon).tolist()
+        random_actions = rng.integers(agent.n_actions, size=num_steps).tolist()
+
+        # Laço sobre listas Python: a Tabela Q é minúscula e o custo é o de cada passo
+        q = agent.Q.tolist()
+        alpha, gamma = agent.alpha, agent.gamma
+        s = self.state
+        for explored, random_action, s_, r in zip(explore, random_actions, next_states.tolist(), rewards.tolist()):
+            row = q[s]
+            a = random_action if explored else row.index(max(row))
+            row[a] += alpha * (r + gamma * max(q[s_]) - row[a])
+            s = s_
+        agent.Q[:] = q
+        self.state = s
+        return rewards
+
+    def run(self, num_steps: int) -> RewardLog:
+        """Treina por mais num_steps passos (pode ser chamado de novo para continuar)."""
+        remaining = num_steps
+        while remaining > 0:
+            n = min(self.chunk_size, remaining)
+            self.log.extend(self._train_chunk(n))
+            self.steps += n
+            remaining -= n
+            if self._next_checkpoint is not None and self.steps >= self._next_checkpoint:
+                self.save_checkpoint()
+                self._next_checkpoint = self.steps + self.checkpoint_every
+        return self.log
+
+    def save_checkpoint(self, path: str = None):
+        """Salva Q, o estado do ambiente, o log e o gerador aleatório (escrita atômica)."""
+        path = path or self.checkpoint_path
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, Q=self.agent.Q, steps=self.steps, state=self.state,
+                     rng_state=json.dumps(self.rng.bit_generator.state), **self.log.state_dict())
+        os.replace(tmp_path, path)
+
+    def load_checkpoint(self, path: str = None):
+        """Restaura um checkpoint; run continua exatamente de onde ele parou."""
+        path = path or self.checkpoint_path
+        with np.load(path) as data:
+            self.agent.Q[:] = data["Q"]
+            self.steps = int(data["steps"])
+            self.state = int(data["state"])
+            self.env.state = self.state
+            self.rng.bit_generator.state = json.loads(str(data["rng_state"]))
+            self.log.load_state_dict(data)
+        if self.checkpoint_every is not None:
+            self._next_checkpoint = self.steps + self.checkpoint_every
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# tile_coding.py
+
+"""
+Tile coding com tabela de índices por hash e memória fixa.
+
+Cada uma das num_tilings grades cobre o espaço de estados deslocada por uma
+fração de célula (deslocamentos assimétricos 1, 3, 5, ... por dimensão). Um
+estado ativa exatamente uma célula por grade, e as coordenadas (grade,
+célula) são espalhadas por hash em uma tabela de memory_size posições. O
+tamanho da tabela, e não o do espaço de estados, define a memória; colisões
+apenas compartilham pesos.
+"""
+
+import numpy as np
+
+# Hash multiplicativo: chave = coordenadas * primos, depois
+# ((chave mod P) * A) mod P mod memory_size. Como chave mod P < 2³² e A < 2³¹,
+# o produto fica abaixo de 2⁶³ e nunca estoura em int64. A própria chave só
+# estouraria com coordenadas acima de ~10¹² células por dimensão.
+_COORD_PRIMES = np.array([10007, 100003, 1000003], dtype=np.int64)
+_HASH_MULTIPLIER = 2147483629
+_HASH_MODULUS = 4294967291
+
+class HashedTileCoder:
+    """
+    Atributos:
+        num_tilings (int): número de grades (= número de índices ativos por estado)
+        memory_size (int): tamanho da tabela de índices
+        low, high (np.array): limites de cada dimensão do estado
+        tiles_per_dim (np.array): células por dimensão em cada grade
+        wrap (np.array): dimensões circulares (ex.: hora do dia)
+    """
+    def __init__(self, low, high, tiles_per_dim, num_tilings=8, memory_size=4096, wrap=None):
+        self.low = np.asarray(low, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        self.dims = len(self.low)
+        self.tiles_per_dim = np.broadcast_to(np.asarray(tiles_per_dim, dtype=np.int64), (self.dims,))
+        self.wrap = np.zeros(self.dims, dtype=bool) if wrap is None else np.asarray(wrap, dtype=bool)
+        if np.any(self.high <= self.low):
+            raise ValueError("Cada dimensão precisa de high > low.")
+        self.num_tilings = num_tilings
+        self.memory_size = memory_size
+
+        self._scale = self.tiles_per_dim / (self.high - self.low)
+        # Deslocamento de cada grade, em frações de célula: (grade * (2k + 1) / num_tilings) mod 1
+        displacement = 2 * np.arange(self.dims) + 1
+        self._offsets = (np.arange(num_tilings)[:, None] * displacement / num_tilings) % 1.0
+        if self.dims > len(_COORD_PRIMES):
+            raise ValueError(f"No máximo {len(_COORD_PRIMES)} dimensões.")
+        self._primes = _COORD_PRIMES[:self.dims]
+        self._tiling_keys = np.arange(num_tilings, dtype=np.int64) * 7919
+
+    def _hash(self, coords):
+        """Índice na tabela para coordenadas inteiras (..., num_tilings, dims)."""
+        keys = (coords @ self._primes + self._tiling_keys) % _HASH_MODULUS
+        return (keys * _HASH_MULTIPLIER % _HASH_MODULUS % self.memory_size).astype(np.intp)
+
+    def active_tiles_batch(self, states):
+        """
+        Índices ativos de vários estados.
+
+        Args:
+            states (np.array): (N, dims)
+
+        Returns:
+            np.array (N, num_tilings) de inteiros
+        """
+        states = np.asarray(states, dtype=float)
+        scaled = (np.clip(states, self.low, self.high) - self.low) * self._scale
+        coords = np.floor(scaled[:, None, :] + self._offsets).astype(np.int64)
+        coords = np.where(self.wrap, coords % self.tiles_per_dim, coords)
+        return self._hash(coords)
+
+    def active_tiles(self, state):
+        """Índices ativos (num_tilings,) de um estado (caminho escalar, usado a cada passo)."""
+        scaled = (np.minimum(np.maximum(state, self.low), self.high) - self.low) * self._scale
+        coords = (scaled + self._offsets).astype(np.int64)  # valores >= 0: truncar = floor
+        coords[:, self.wrap] %= self.tiles_per_dim[self.wrap]
+        return self._hash(coords)
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+# trainer.py
+
+"""
+Motor de treinamento único para os agentes tabulares do repositório.
+
+Substitui os laços de simulação duplicados (grid_world/run_grid.py,
+grid_world/analise_mdp_vs_bandit.py e RecyclingRobotMDP/main_train.py).
+A assinatura do método update do agente é resolvida uma única vez, as
+recompensas por episódio são escritas em arrays pré-alocados e os efeitos
+colaterais (impressão, barra de progresso, snapshots) ficam em callbacks
+com limite de frequência.
+"""
+
+import inspect
+import time
+import numpy as np
+
+class Callback:
+    """
+    Classe base para callbacks do Trainer.
+
+    O Trainer só chama on_episode_end quando o callback está "vencido": a cada
+    `every` episódios e, se min_interval > 0, no máximo uma vez a cada
+    min_interval segundos.
+    """
+    def __init__(self, every: int = 1, min_interval: float = 0.0):
+        self.every = every
+        self.min_interval = min_interval
+
+    def on_train_begin(self, trainer, num_episodes: int):
+        pass
+
+    def on_episode_end(self, trainer, episode: int, history):
+        pass
+
+    def on_train_end(self, trainer, history):
+        pass
+
+class ProgressPrinter(Callback):
+    """Imprime uma linha de progresso a cada `every` episódios."""
+    def __init__(self, every: int = 100, min_interval: float = 0.0):
+        super().__init__(every, min_interval)
+        self._num_episodes = 0
+
+    def on_train_begin(self, trainer, num_episodes: int):
+        self._num_episodes = num_episodes
+
+    def on_episode_end(self, trainer, episode: int, history):
+        print(f"Episódio {episode + 1}/{self._num_episodes} concluído.")
+
+class TqdmProgress(Callback):
+    """Barra de progresso tqdm atualizada em blocos, e não a cada episódio."""
+    def __init__(self, every: int = 100, min_interval: float = 0.1):
+        super().__init__(every, min_interval)
+        self._bar = None
+        self._last_episode = 0
+
+    def on_train_begin(self, trainer, num_episodes: int):
+        from tqdm import tqdm
+        self._bar = tqdm(total=num_episodes)
+        self._last_episode = 0
+
+    def on_episode_end(self, trainer, episode: int, history):
+        self._bar.update(episode + 1 - self._last_episode)
+        self._last_episode = episode + 1
+
+    def on_train_end(self, trainer, history):
+        self._bar.update(history.num_episodes - self._last_episode)
+        self._bar.close()
+
+class QTableSnapshot(Callback):
+    """Guarda cópias da Tabela Q do agente a cada `every` episódios."""
+    def __init__(self, every: int, attribute: str = "q_table", include_initial: bool = True):
+        super().__init__(every)
+        self.attribute = attribute
+        self.include_initial = include_initial
+        self.snapshots = {}
+
+    def on_train_begin(self, trainer, num_episodes: int):
+        if self.include_initial:
+            self.snapshots[0] = getattr(trainer.agent, self.attribute).copy()
+
+    def on_episode_end(self, trainer, episode: int, history):
+        self.snapshots[episode + 1] = getattr(trainer.agent, self.attribute).copy()
+
+class TrainingHistory:
+    """
+    Resultado de Trainer.run.
+
+    Atributos:
+        episode_returns (np.array): Recompensa total de cada episódio concluído.
+        episode_lengths (np.array): Número de passos de cada episódio concluído.
+        total_steps (int): Passos executados no total.
+    """
+    def __init__(self, num_episodes: int):
+        self._returns = np.zeros(num_episodes)
+        self._lengths = np.zeros(num_episodes, dtype=np.int64)
+        self.num_episodes = 0
+        self.total_steps = 0
+
+    @property
+    def episode_returns(self) -> np.ndarray:
+        return self._returns[:self.num_episodes]
+
+    @property
+    def episode_lengths(self) -> np.ndarray:
+        return self._lengths[:self.num_episodes]
+
+def bind_update(agent):
+    """
+    Resolve uma única vez como chamar agent.update, devolvendo uma função com
+    a assinatura uniforme (estado, ação, recompensa, próximo_estado, terminado).
+
+    São aceitos os formatos update(s, a, r) (Bandit), update(s, a, r, s')
+    (Q-Learning) e update(s, a, r, s', done). O formato é escolhido pelo
+    número de parâmetros posicionais obrigatórios (parâmetros com valor padrão
+    não são preenchidos); com *args, usa-se o formato de 5 argumentos.
+    """
+    update = agent.update
+    params = inspect.signature(update).parameters.values()
+    if any(p.kind == inspect.Parameter.VAR_POSITIONAL for p in params):
+        return update
+    num_params = sum(1 for p in params
+                     if p.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+                     and p.default is inspect.Parameter.empty)
+    if num_params == 3:
+        return lambda s, a, r, s_next, done: update(s, a, r)
+    if num_params == 4:
+        return lambda s, a, r, s_next, done: update(s, a, r, s_next)
+    if num_params == 5:
+        return update
+    raise TypeError(f"Assinatura de update não suportada para {agent.__class__.__name__}.")
+
+class Trainer:
+    """
+    Executa o laço agente-ambiente para ambientes com interface
+    reset() -> estado e step(ação) -> (próximo_estado, recompensa, terminado).
+    Se o agente tiver um método start_episode(), ele é chamado após cada reset
+    (ex.: para zerar traços de elegibilidade).
+
+    Atributos:
+        agent: Agente com choose_action(estado) e update(...).
+        env: Ambiente do episódio.
+        max_steps_per_episode (int | None): Limite de passos por episódio
+                                            (None = até o estado terminal).
+        callbacks (list): Callbacks chamados ao fim dos episódios.
+        recorder (TrajectoryRecorder | None): Se dado, grava cada transição
+                                              (ver trajectory_recorder.py).
+    """
+    def __init__(self, agent, env, max_steps_per_episode: int = None, callbacks: list = None,
+                 recorder=None):
+        self.agent = agent
+        self.env = env
+        self.max_steps_per_episode = max_steps_per_episode
+        self.callbacks = list(callbacks) if callbacks else []
+        self.recorder = recorder
+        self._update = bind_update(agent)
+
+    def run(self, num_episodes: int, max_total_steps: int = None) -> TrainingHistory:
+        """
+        Treina o agente por até num_episodes episódios ou max_total_steps passos,
+        o que ocorrer primeiro.
+
+        Returns:
+            Um TrainingHistory com as recompensas e durações por episódio.
+        """
+        history = TrainingHistory(num_episodes)
+        returns, lengths = history._returns, history._lengths
+        choose_action, update = self.agent.choose_action, self._update
+        reset, step = self.env.reset, self.env.step
+        start_episode = getattr(self.agent, "start_episode", None)
+        recorder = self.recorder
+        if recorder is not None:
+            # A gravação entra na função de update já resolvida, sem custo quando desligada
+            record, agent_update = recorder.record, update
+            def update(s, a, r, s_next, done):
+                record(s, a, r, s_next, done)
+                agent_update(s, a, r, s_next, done)
+        max_steps = self.max_steps_per_episode if self.max_steps_per_episode is not None else np.inf
+        steps_left = max_total_steps if max_total_steps is not None else np.inf
+
+        for callback in self.callbacks:
+            callback.on_train_begin(self, num_episodes)
+        next_due = [callback.every for callback in self.callbacks]
+        last_call = [-np.inf] * len(self.callbacks)
+        next_check = min(next_due, default=np.inf)
+
+        episode = 0
+        while episode < num_episodes and steps_left > 0:
+            state = reset()
+            if start_episode is not None:
+                start_episode()
+            total_reward = 0.0
+            steps = 0
+            done = False
+            while not done and steps < max_steps and steps < steps_left:
+                action = choose_action(state)
+                next_state, reward, done = step(action)
+                update(state, action, reward, next_state, done)
+                state = next_state
+                total_reward += reward
+                steps += 1
+
+            if recorder is not None:
+                recorder.end_episode()
+            returns[episode] = total_reward
+            lengths[episode] = steps
+            steps_left -= steps
+            episode += 1
+            history.num_episodes = episode
+            history.total_steps += steps
+
+            if episode >= next_check:
+                now = time.perf_counter()
+                for i, callback in enumerate(self.callbacks):
+                    if episode >= next_due[i]:
+                        next_due[i] = episode + callback.every
+                        if now - last_call[i] >= callback.min_interval:
+                            last_call[i] = now
+                            callback.on_episode_end(self, episode - 1, history)
+                next_check = min(next_due)
+
+        if recorder is not None:
+            recorder.flush()
+        for callback in self.callbacks:
+            callback.on_train_end(self, history)
+        return history
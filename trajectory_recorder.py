@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+# trajectory_recorder.py
+
+"""
+Gravador de trajetórias em colunas mapeadas em memória (np.memmap).
+
+Cada campo das transições (estados, ações, recompensas, próximos estados e
+flags de término) vive em um arquivo binário próprio, só com acréscimos, que
+cresce em blocos de chunk_size linhas. Um arquivo de deslocamentos guarda
+onde cada episódio começa, e um meta.json descreve tipos, formas e tamanhos.
+
+Como os dados ficam no disco e são lidos por mapeamento de memória, é possível
+guardar bilhões de transições para replay, auditoria e treino offline sem
+ocupá-las na RAM, e o leitor devolve qualquer intervalo de episódios como
+visões (sem cópia) das colunas.
+"""
+
+import json
+import os
+import numpy as np
+
+META_FILE = "meta.json"
+OFFSETS_FILE = "episode_offsets.bin"
+TRANSITION_FIELDS = ("states", "actions", "rewards", "next_states", "dones")
+
+class MemmapColumn:
+    """
+    Arquivo binário de uma coluna, mapeado em memória e ampliado em blocos.
+
+    Também usado por outros gravadores em disco (ex.: RecyclingRobotMDP/q_history.py).
+    """
+    def __init__(self, path: str, dtype, row_shape: tuple, length: int, chunk_size: int):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.row_shape = tuple(row_shape)
+        self.row_bytes = self.dtype.itemsize * int(np.prod(self.row_shape, dtype=np.int64))
+        self.length = length
+        self.chunk_size = chunk_size
+        if not os.path.exists(path):
+            open(path, "wb").close()
+        self.capacity = os.path.getsize(path) // self.row_bytes
+        self.map = None
+        self._remap()
+
+    def _remap(self):
+        self.map = (np.memmap(self.path, dtype=self.dtype, mode="r+", shape=(self.capacity,) + self.row_shape)
+                    if self.capacity > 0 else None)
+
+    def _resize(self, capacity: int):
+        if self.map is not None:
+            self.map.flush()
+            self.map = None
+        with open(self.path, "r+b") as f:
+            f.truncate(capacity * self.row_bytes)
+        self.capacity = capacity
+        self._remap()
+
+    def reserve(self, extra: int):
+        """Garante espaço para mais `extra` linhas, crescendo em múltiplos de chunk_size."""
+        needed = self.length + extra
+        if needed > self.capacity:
+            chunks = -(-needed // self.chunk_size)
+            self._resize(chunks * self.chunk_size)
+
+    def append(self, values):
+        self.reserve(1)
+        self.map[self.length] = values
+        self.length += 1
+
+    def extend(self, values: np.ndarray):
+        values = np.asarray(values)
+        self.reserve(len(values))
+        self.map[self.length:self.length + len(values)] = values
+        self.length += len(values)
+
+    def flush(self):
+        if self.map is not None:
+            self.map.flush()
+
+    def close(self):
+        """Descarta a capacidade excedente e libera o mapeamento."""
+        self._resize(self.length)
+        self.map = None
+
+class TrajectoryRecorder:
+    """
+    Grava transições (s, a, r, s', terminado) em colunas no disco.
+
+    Se o diretório já contiver uma gravação, os novos dados são acrescentados
+    ao final dela (os tipos e formas precisam coincidir).
+
+    Uso típico:
+        with TrajectoryRecorder("dados/gridworld", state_shape=(2,)) as recorder:
+            recorder.record(state, action, reward, next_state, done)
+            ...
+            recorder.end_episode()
+
+    Atributos:
+        directory (str): Diretório da gravação.
+        num_steps (int): Transições gravadas.
+        num_episodes (int): Episódios encerrados com end_episode().
+    """
+    def __init__(self, directory: str, state_shape: tuple = (), state_dtype=np.int64,
+                 action_dtype=np.int64, reward_dtype=np.float64, chunk_size: int = 1_000_000):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        state_shape = tuple(state_shape)
+        schema = {
+            "states": (np.dtype(state_dtype).str, list(state_shape)),
+            "actions": (np.dtype(action_dtype).str, []),
+            "rewards": (np.dtype(reward_dtype).str, []),
+            "next_states": (np.dtype(state_dtype).str, list(state_shape)),
+            "dones": (np.dtype(bool).str, []),
+        }
+
+        num_steps = num_episodes = 0
+        meta_path = os.path.join(directory, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            existing = {name: (spec["dtype"], spec["shape"]) for name, spec in meta["columns"].items()}
+            if existing != schema:
+                raise ValueError(f"A gravação em '{directory}' tem outro formato de colunas: {existing}.")
+            num_steps, num_episodes = meta["num_steps"], meta["num_episodes"]
+
+        self._schema = schema
+        self._columns = {
+            name: MemmapColumn(os.path.join(directory, f"{name}.bin"), dtype, shape, num_steps, chunk_size)
+            for name, (dtype, shape) in schema.items()
+        }
+        self._offsets = MemmapColumn(os.path.join(directory, OFFSETS_FILE), np.int64, (), num_episodes + 1,
+                                max(1, chunk_size // 16))
+        if num_episodes == 0 and num_steps == 0:
+            self._offsets.length = 0
+            self._offsets.append(0)
+        self._episode_start = int(self._offsets.map[num_episodes])
+        self._write_meta()
+
+    @property
+    def num_steps(self) -> int:
+        return self._columns["actions"].length
+
+    @property
+    def num_episodes(self) -> int:
+        return self._offsets.length - 1
+
+    def record(self, state, action, reward, next_state, done):
+        """Grava uma transição do episódio corrente."""
+        columns = self._columns
+        columns["states"].append(state)
+        columns["actions"].append(action)
+        columns["rewards"].append(reward)
+        columns["next_states"].append(next_state)
+        columns["dones"].append(done)
+
+    def record_batch(self, states, actions, rewards, next_states, dones, episode_starts=None):
+        """
+        Grava um lote de transições em colunas.
+
+        Args:
+            episode_starts (np.array): Deslocamentos (num_episodes + 1), relativos ao
+                lote, dos episódios completos nele contidos. Se None, as transições
+                entram no episódio corrente, que continua aberto.
+        """
+        base, size = self.num_steps, len(actions)
+        if episode_starts is not None:
+            if len(episode_starts) == 0 or episode_starts[0] != 0 or episode_starts[-1] != size:
+                raise ValueError("episode_starts deve começar em 0 e terminar no tamanho do lote.")
+            if self._episode_start != base:
+                raise ValueError("Há um episódio aberto; chame end_episode() antes de gravar episódios completos.")
+        for name, values in zip(TRANSITION_FIELDS, (states, actions, rewards, next_states, dones)):
+            self._columns[name].extend(values)
+        if episode_starts is not None:
+            self._offsets.extend(base + np.asarray(episode_starts[1:], dtype=np.int64))
+            self._episode_start = self.num_steps
+
+    def end_episode(self):
+        """Encerra o episódio corrente (episódios vazios são ignorados)."""
+        if self.num_steps > self._episode_start:
+            self._offsets.append(self.num_steps)
+            self._episode_start = self.num_steps
+
+    def _write_meta(self):
+        meta = {
+            "num_steps": self.num_steps,
+            "num_episodes": self.num_episodes,
+            "columns": {name: {"dtype": dtype, "shape": shape} for name, (dtype, shape) in self._schema.items()},
+        }
+        # Escrita atômica: um leitor nunca vê um meta.json pela metade
+        tmp_path = os.path.join(self.directory, META_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(self.directory, META_FILE))
+
+    def flush(self):
+        """Descarrega as colunas no disco e publica os novos tamanhos no meta.json."""
+        for column in self._columns.values():
+            column.flush()
+        self._offsets.flush()
+        self._write_meta()
+
+    def close(self):
+        """Grava tudo e ajusta os arquivos ao tamanho usado."""
+        self.flush()
+        for column in self._columns.values():
+            column.close()
+        self._offsets.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class TrajectoryReader:
+    """
+    Leitura somente-leitura de uma gravação do TrajectoryRecorder.
+
+    Todos os métodos devolvem dicionários {campo: array} cujos arrays são
+    visões sobre os arquivos mapeados (nenhum dado é copiado para a RAM até
+    ser de fato acessado). Só entra o que estava publicado no meta.json quando
+    o leitor foi aberto.
+
+    Atributos:
+        num_steps (int): Transições disponíveis.
+        num_episodes (int): Episódios completos disponíveis.
+        episode_offsets (np.array): Deslocamentos (num_episodes + 1) dos episódios.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        self.num_steps = meta["num_steps"]
+        self.num_episodes = meta["num_episodes"]
+        self.columns = {}
+        for name, spec in meta["columns"].items():
+            shape = (self.num_steps,) + tuple(spec["shape"])
+            path = os.path.join(directory, f"{name}.bin")
+            self.columns[name] = (np.memmap(path, dtype=spec["dtype"], mode="r", shape=shape)
+                                  if self.num_steps > 0 else np.empty(shape, dtype=spec["dtype"]))
+        self.episode_offsets = np.memmap(os.path.join(directory, OFFSETS_FILE), dtype=np.int64, mode="r",
+                                         shape=(self.num_episodes + 1,))
+
+    @property
+    def episode_lengths(self) -> np.ndarray:
+        return np.diff(self.episode_offsets)
+
+    def transitions(self, start: int = 0, stop: int = None) -> dict:
+        """Transições [start, stop) como visões das colunas."""
+        stop = self.num_steps if stop is None else stop
+        return {name: column[start:stop] for name, column in self.columns.items()}
+
+    def episodes(self, start: int, stop: int = None) -> dict:
+        """
+        Transições dos episódios [start, stop). Como os passos de episódios
+        consecutivos são contíguos no disco, o resultado continua sendo uma visão.
+        """
+        stop = start + 1 if stop is None else stop
+        if not 0 <= start < stop <= self.num_episodes:
+            raise IndexError(f"Intervalo de episódios inválido: [{start}, {stop}) de {self.num_episodes}.")
+        return self.transitions(int(self.episode_offsets[start]), int(self.episode_offsets[stop]))
+
+    def iter_chunks(self, chunk_size: int = 1_000_000):
+        """Percorre todas as transições em blocos de até chunk_size (para dados maiores que a RAM)."""
+        for start in range(0, self.num_steps, chunk_size):
+            yield self.transitions(start, min(start + chunk_size, self.num_steps))
@@ -7,6 +7,7 @@ Funções para estimar V(s) e Q(s,a) usando simulação Monte Carlo.
 
 import numpy as np
 from gridworld_value_func_env import GridWorldValueFuncEnv
+from return_kernels import discounted_returns
 
 def calculate_discounted_return(rewards: list, gamma: float) -> float:
     """Calcula o retorno descontado para uma lista de recompensas."""
@@ -37,4 +38,223 @@ def estimate_state_value(env: GridWorldValueFuncEnv, policy: np.ndarray, start_s
         episode_returns.append(calculate_discounted_return(episode_rewards, env.gamma))
         
     # V(s) é a média de todos os retornos obtidos
-    return np.mean(episode_returns)
\ No newline at end of file
+    return np.mean(episode_returns)
+
+def estimate_state_values_batched(env: GridWorldValueFuncEnv, policy: np.ndarray, num_episodes: int, max_steps: int, seed: int = None) -> np.ndarray:
+    """
+    Estima V(s) para todos os estados de uma vez: os episódios de todos os
+    estados iniciais são simulados juntos como um único lote de posições.
+
+    As ações são sorteadas por busca na probabilidade acumulada da política e
+    os retornos descontados são acumulados no próprio lote, passo a passo.
+
+    Returns:
+        Uma matriz com a forma da grade contendo V(s) estimado.
+    """
+    rng = np.random.default_rng(seed)
+    num_rows, num_cols = env.grid_size
+    # Um episódio por linha: estado inicial repetido num_episodes vezes
+    rows = np.repeat(np.arange(num_rows), num_cols * num_episodes)
+    cols = np.tile(np.repeat(np.arange(num_cols), num_episodes), num_rows)
+    returns = _simulate_returns(env, policy, rows, cols, max_steps, rng)
+    return returns.reshape(num_rows, num_cols, num_episodes).mean(axis=2)
+
+def _cumulative_policy(policy: np.ndarray) -> np.ndarray:
+    """Probabilidades acumuladas das ações em cada estado."""
+    cumulative_policy = np.cumsum(policy, axis=-1)
+    cumulative_policy[..., -1] = 1.0 # evita que erros de arredondamento deixem u acima da soma
+    return cumulative_policy
+
+def _sample_actions(cumulative_policy: np.ndarray, rows: np.ndarray, cols: np.ndarray, rng) -> np.ndarray:
+    """Sorteia uma ação por posição buscando um uniforme na probabilidade acumulada."""
+    u = rng.random(len(rows))
+    return (u[:, None] >= cumulative_policy[rows, cols]).sum(axis=1)
+
+def _simulate_returns(env: GridWorldValueFuncEnv, policy: np.ndarray, rows: np.ndarray, cols: np.ndarray, max_steps: int, rng) -> np.ndarray:
+    """Retorno descontado de um episódio a partir de cada posição do lote."""
+    cumulative_policy = _cumulative_policy(policy)
+    returns = np.zeros(len(rows))
+    discount = 1.0
+    for _ in range(max_steps):
+        actions = _sample_actions(cumulative_policy, rows, cols, rng)
+        rows, cols, rewards = env.step_batch(rows, cols, actions, rng)
+        returns += discount * rewards
+        discount *= env.gamma
+    return returns
+
+class RunningStats:
+    """
+    Média e variância acumuladas pelo algoritmo de Welford (e, para lotes, pela
+    fusão de Chan et al.), sem guardar as amostras.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # soma dos quadrados dos desvios em relação à média
+
+    def update(self, value: float):
+        """Incorpora uma amostra."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else np.inf
+
+    @property
+    def std_error(self) -> float:
+        return np.sqrt(self.variance / self.count) if self.count > 1 else np.inf
+
+def estimate_state_value_adaptive(env: GridWorldValueFuncEnv, policy: np.ndarray, start_state: tuple, target_std_error: float,
+                                  max_episodes: int, max_steps: int, min_episodes: int = 30) -> tuple:
+    """
+    Como estimate_state_value, mas para assim que o erro padrão da média dos
+    retornos fica abaixo de target_std_error (após min_episodes) ou quando
+    max_episodes episódios foram simulados.
+
+    Returns:
+        Uma tupla (V(s), erro_padrão, episódios_usados).
+    """
+    stats = RunningStats()
+    while stats.count < max_episodes:
+        current_state = start_state
+        episode_rewards = []
+        for _ in range(max_steps):
+            action_probabilities = policy[current_state[0], current_state[1]]
+            action = np.random.choice(len(action_probabilities), p=action_probabilities)
+            current_state, reward = env.step(current_state, action)
+            episode_rewards.append(reward)
+        stats.update(calculate_discounted_return(episode_rewards, env.gamma))
+        if stats.count >= min_episodes and stats.std_error < target_std_error:
+            break
+    return stats.mean, stats.std_error, stats.count
+
+def _std_errors(m2: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Erro padrão da média a partir de (m2, contagem); infinito com menos de 2 amostras."""
+    std_errors = np.full(len(counts), np.inf)
+    enough = counts > 1
+    std_errors[enough] = np.sqrt(m2[enough] / (counts[enough] - 1) / counts[enough])
+    return std_errors
+
+def estimate_state_values_adaptive(env: GridWorldValueFuncEnv, policy: np.ndarray, target_std_error: float, max_episodes: int,
+                                   max_steps: int, batch_size: int = 100, min_episodes: int = 30, seed: int = None) -> tuple:
+    """
+    Versão em lote e adaptativa para todos os estados: a cada rodada, apenas os
+    estados cujo erro padrão ainda está acima do alvo (ou que ainda não somam
+    min_episodes episódios) simulam mais batch_size episódios (juntos, como um
+    único lote). Média e variância de cada estado são fundidas rodada a rodada
+    (Welford/Chan), sem guardar os retornos. Como em RunningStats, o erro padrão
+    de um estado com menos de 2 episódios é infinito.
+
+    Returns:
+        Uma tupla de matrizes com a forma da grade: (V(s), erro_padrão, episódios_usados).
+    """
+    rng = np.random.default_rng(seed)
+    num_states = env.grid_size[0] * env.grid_size[1]
+    counts = np.zeros(num_states, dtype=np.int64)
+    means = np.zeros(num_states)
+    m2 = np.zeros(num_states)
+    active = np.arange(num_states)
+
+    while active.size:
+        n = np.minimum(batch_size, max_episodes - counts[active])
+        states = np.repeat(active, n)
+        returns = _simulate_returns(env, policy, states // env.grid_size[1], states % env.grid_size[1], max_steps, rng)
+
+        # Estatísticas do lote de cada estado e fusão com as acumuladas
+        batch_means = np.bincount(states, weights=returns, minlength=num_states)[active] / n
+        batch_m2 = np.bincount(states, weights=(returns - np.repeat(batch_means, n)) ** 2, minlength=num_states)[active]
+        total = counts[active] + n
+        delta = batch_means - means[active]
+        means[active] += delta * n / total
+        m2[active] += batch_m2 + delta ** 2 * counts[active] * n / total
+        counts[active] = total
+
+        std_errors = _std_errors(m2[active], total)
+        keep = (std_errors >= target_std_error) | (total < min_episodes)
+        active = active[keep & (total < max_episodes)]
+
+    std_errors = _std_errors(m2, counts)
+    shape = env.grid_size
+    return means.reshape(shape), std_errors.reshape(shape), counts.reshape(shape)
+
+def estimate_state_values_trajectory(env: GridWorldValueFuncEnv, policy: np.ndarray, num_steps: int, num_trajectories: int = 1,
+                                     first_visit: bool = False, horizon: int = 50, seed: int = None) -> tuple:
+    """
+    Estima V(s) para toda a grade reaproveitando trajetórias longas: o retorno
+    descontado de cada passo é creditado ao estado visitado naquele passo.
+
+    As trajetórias (num_trajectories, simuladas juntas, cada uma partindo de um
+    estado uniforme) têm num_steps passos. Os retornos G_t saem de uma única
+    varredura reversa (return_kernels) e as somas e contagens por estado são
+    acumuladas com np.add.at. Só são creditados os passos com pelo menos
+    `horizon` passos à frente, para que o retorno truncado no fim da trajetória
+    não subestime V.
+
+    Args:
+        first_visit (bool): True credita apenas a primeira visita de cada estado em
+                            cada trajetória; False credita todas as visitas.
+
+    Returns:
+        Uma tupla de matrizes com a forma da grade: (V(s), visitas_creditadas).
+    """
+    if num_steps <= horizon:
+        raise ValueError("num_steps deve ser maior que horizon.")
+    rng = np.random.default_rng(seed)
+    num_rows, num_cols = env.grid_size
+    rows = rng.integers(0, num_rows, num_trajectories)
+    cols = rng.integers(0, num_cols, num_trajectories)
+
+    cumulative_policy = _cumulative_policy(policy)
+    states = np.empty((num_trajectories, num_steps), dtype=np.intp)
+    rewards = np.empty((num_trajectories, num_steps))
+    for t in range(num_steps):
+        states[:, t] = rows * num_cols + cols
+        actions = _sample_actions(cumulative_policy, rows, cols, rng)
+        rows, cols, rewards[:, t] = env.step_batch(rows, cols, actions, rng)
+
+    # Uma varredura reversa sobre todas as trajetórias concatenadas; o fim de cada
+    # uma é marcado como fronteira para que os retornos não se misturem
+    boundaries = np.zeros((num_trajectories, num_steps), dtype=bool)
+    boundaries[:, -1] = True
+    returns = discounted_returns(rewards.reshape(-1), env.gamma, boundaries.reshape(-1))
+
+    credited = np.zeros((num_trajectories, num_steps), dtype=bool)
+    credited[:, :num_steps - horizon] = True
+    credited = credited.reshape(-1)
+    if first_visit:
+        # Primeira ocorrência de cada (trajetória, estado) entre os passos creditados
+        keys = (np.repeat(np.arange(num_trajectories), num_steps) * num_rows * num_cols + states.reshape(-1))[credited]
+        _, first = np.unique(keys, return_index=True)
+        steps = np.flatnonzero(credited)[first]
+    else:
+        steps = np.flatnonzero(credited)
+
+    value_sums = np.zeros(num_rows * num_cols)
+    visit_counts = np.zeros(num_rows * num_cols, dtype=np.int64)
+    np.add.at(value_sums, states.reshape(-1)[steps], returns[steps])
+    np.add.at(visit_counts, states.reshape(-1)[steps], 1)
+    values = np.divide(value_sums, visit_counts, out=np.zeros_like(value_sums), where=visit_counts > 0)
+    return values.reshape(num_rows, num_cols), visit_counts.reshape(num_rows, num_cols)
+
+def exact_state_values(env: GridWorldValueFuncEnv, policy: np.ndarray) -> np.ndarray:
+    """
+    V(s) exato da política (horizonte infinito), resolvendo V = R + γ P V. O
+    modelo sai de uma única chamada a env.move_batch com todos os pares
+    (estado, ação executada); serve de referência para os estimadores Monte Carlo.
+    """
+    num_rows, num_cols = env.grid_size
+    num_states, num_actions = num_rows * num_cols, len(env.actions)
+    states, executed = np.divmod(np.arange(num_states * num_actions), num_actions)
+    next_rows, next_cols, rewards = env.move_batch(states // num_cols, states % num_cols, executed)
+
+    # Probabilidade de executar cada ação: política combinada com o escorregão
+    executed_probs = policy.reshape(num_states, num_actions) @ env.realized_action_probs
+    weights = executed_probs.reshape(-1)
+    transitions = np.zeros((num_states, num_states))
+    np.add.at(transitions, (states, next_rows * num_cols + next_cols), weights)
+    expected_rewards = np.bincount(states, weights=weights * rewards, minlength=num_states)
+    values = np.linalg.solve(np.eye(num_states) - env.gamma * transitions, expected_rewards)
+    return values.reshape(num_rows, num_cols)